@@ -59,6 +59,29 @@ _get_config() {
     (cd "$repo_root" && uv run get-config "$@")
 }
 
+# Load the merged config into the BUREAU_CONFIG associative array (once per shell)
+# > Keys are dot-paths (e.g. port_for.qdrant_db), plus derived agent_enabled.<name> booleans
+# > Saves spawning a separate get-config process for every value read
+# Usage: load_bureau_config
+# Returns: 0 if loaded (or already loaded), 1 if config could not be read
+load_bureau_config() {
+    if declare -p BUREAU_CONFIG >/dev/null 2>&1; then
+        return 0
+    fi
+
+    # only stdout is eval'd: stderr (e.g. uv build output, Python warnings) is kept aside for errors
+    local exported errors_file
+    errors_file="$(mktemp)"
+    if ! exported="$(_get_config --export 2>"$errors_file")"; then
+        log_error "Failed to read config: $(cat "$errors_file")"
+        rm -f "$errors_file"
+        return 1
+    fi
+    rm -f "$errors_file"
+
+    eval "$exported"
+}
+
 declare -A AGENT_MAP=(
   ["Claude Code"]="claude"
   ["Gemini CLI"]="gemini"
@@ -96,7 +119,8 @@ agent_enabled() {
         return 1
     fi
 
-    _get_config --check agent "$config_name"
+    load_bureau_config || return 1
+    [[ "${BUREAU_CONFIG[agent_enabled.$config_name]:-false}" == true ]]
 }
 
 # Load list of enabled agents into AGENTS array
@@ -107,11 +131,9 @@ agent_enabled() {
 discover_agents() {
     AGENTS=()
 
-    local enabled_list
-    if ! enabled_list="$(_get_config --list agents 2>&1)"; then
-        log_error "Failed to read config: $enabled_list"
-        exit 1
-    fi
+    load_bureau_config || exit 1
+
+    local enabled_list="${BUREAU_CONFIG[agents]:-}"
 
     if [[ -z "$enabled_list" ]]; then
         log_error "No agents enabled in directives.yml!"
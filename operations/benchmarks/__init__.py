@@ -0,0 +1,4 @@
+"""Microbenchmarks for Bureau's config and cleanup tooling.
+
+Run a benchmark via `uv run python -m operations.benchmarks.<name>` from the repo root.
+"""
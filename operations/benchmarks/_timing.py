@@ -0,0 +1,25 @@
+"""Timing and reporting helpers shared by the benchmarks."""
+import statistics
+import time
+from typing import Callable
+
+
+def time_runs(fn: Callable[[], object], runs: int, setup: Callable[[], object] | None = None) -> list[float]:
+    """Return wall times (seconds) of fn() over runs, calling setup() (untimed) before each run."""
+    timings = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, timings: list[float], width: int, unit: str = "s", note: str = "") -> None:
+    """Print the median and min of timings (in seconds) as seconds or milliseconds (unit "s"/"ms"),
+    after the label (padded to width) and followed by note."""
+    scale = 1000 if unit == "ms" else 1
+    median, fastest = statistics.median(timings) * scale, min(timings) * scale
+    line = f"  {label:<{width}} median {median:8.3f} {unit}   min {fastest:8.3f} {unit}"
+    print(f"{line}   {note}" if note else line)
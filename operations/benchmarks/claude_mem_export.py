@@ -0,0 +1,131 @@
+"""Benchmark exporting stale claude-mem rows to trash: materialized vs. streamed.
+
+Generates a claude-mem-like SQLite database of stale observations, then exports them all to a
+trash file three ways:
+
+- materialized: `SELECT *` + `fetchall()` into one dict per row, then a single indented JSON dump
+  (how the handler used to export)
+- streamed (SQL JSON): batches of ids, each batch's rows built as JSON by SQLite (JSON1) and
+  streamed into the trash file via `fetchmany()`
+- streamed (Python JSON): the same, serializing rows in Python (the fallback for builds without JSON1)
+
+Reports wall time, and peak Python memory measured in a separate (traced) run.
+
+Usage:
+    uv run python -m operations.benchmarks.claude_mem_export [--rows N] [--runs N]
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
+
+from ..cleanup.handlers.claude_mem import ClaudeMemHandler
+from ..cleanup.trash import TrashWriter
+from ._timing import report, time_runs
+
+_STALE_TS = "2024-01-01T00:00:00.000Z"
+_CUTOFF = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+class _PythonJsonHandler(ClaudeMemHandler):
+    """Handler behaving as on SQLite builds without JSON1."""
+
+    def _iter_rows_as_json_sql(self, *args, **kwargs):
+        raise sqlite3.OperationalError("no such function: json_object")
+
+
+def _create_db(path: Path, rows: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE observations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sdk_session_id TEXT NOT NULL,
+            project TEXT NOT NULL,
+            type TEXT NOT NULL,
+            title TEXT,
+            text TEXT,
+            concepts TEXT,
+            files_touched TEXT,
+            created_at TEXT NOT NULL,
+            created_at_epoch INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE TABLE session_summaries (id INTEGER PRIMARY KEY, created_at TEXT NOT NULL, summary TEXT)")
+    conn.executemany(
+        "INSERT INTO observations (sdk_session_id, project, type, title, text, concepts, files_touched, "
+        "created_at, created_at_epoch) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (f"session-{i // 50}", "bureau", "discovery", f"Observation {i}",
+             "Found that the cleanup handler re-reads the whole table before exporting it. " * 3,
+             '["cleanup", "sqlite"]', '["operations/cleanup/handlers/claude_mem.py"]', _STALE_TS, 1704067200)
+            for i in range(rows)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+
+def _export_materialized(handler: ClaudeMemHandler, trash_dir: Path) -> None:
+    items = handler.get_stale_items(_CUTOFF)
+    export = {
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "sessions": [item["data"] for item in items if item["type"] == "session"],
+        "observations": [item["data"] for item in items if item["type"] == "observation"],
+    }
+    with open(trash_dir / "materialized.json", "w") as f:
+        json.dump(export, f, indent=2, default=str)
+
+
+def _export_streamed(handler: ClaudeMemHandler, trash_dir: Path) -> None:
+    with TrashWriter(handler.name, "30d") as writer:
+        for batch in handler.iter_stale_batches(_CUTOFF, 1000):
+            handler.export_batch_to_trash(batch, writer)
+
+
+def _measure(export: Callable[[], None], runs: int) -> tuple[list[float], float]:
+    """Return wall times (seconds) over runs, and peak traced memory (MiB) of one more run."""
+    timings = time_runs(export, runs)
+
+    tracemalloc.start()
+    export()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings, peak / (1 << 20)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Stale observations (default: 1000000)")
+    parser.add_argument("--runs", type=int, default=1, help="Timed runs per measurement (default: 1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, trash_dir = Path(tmp) / "claude-mem.db", Path(tmp) / "trash"
+        trash_dir.mkdir()
+        print(f"Generating {args.rows} stale observations...")
+        _create_db(db_path, args.rows)
+
+        handler = ClaudeMemHandler()
+
+        with patch("operations.cleanup.handlers.claude_mem.get_storage", lambda _: db_path), \
+             patch("operations.cleanup.trash.get_base_trash_dir", lambda: trash_dir):
+            print(f"Exporting {args.rows} rows ({args.runs} run(s) each):")
+            exports: list[tuple[str, Callable[[], None]]] = [
+                ("materialized", lambda: _export_materialized(handler, trash_dir)),
+                ("streamed (SQL JSON)", lambda: _export_streamed(handler, trash_dir)),
+                ("streamed (Python JSON)", lambda: _export_streamed(_PythonJsonHandler(), trash_dir)),
+            ]
+            for label, export in exports:
+                timings, peak_mib = _measure(export, args.runs)
+                report(label, timings, 24, note=f"peak memory {peak_mib:8.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
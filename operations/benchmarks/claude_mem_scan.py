@@ -0,0 +1,113 @@
+"""Benchmark scanning a claude-mem database for stale rows, without and with a created_at index.
+
+Generates a claude-mem-like SQLite database of observations (oldest first, a small fraction of them
+stale), then pages through the stale rows the way cleanup does (iter_stale_batches()):
+
+- without an index on created_at: paged by id, which reads every row of the table
+- with the (created_at, id) index cleanup creates when `claude_mem.create_indexes` is set: paged in
+  (created_at, id) order, reading only the stale range
+
+Reports each scan's query plan and wall time, and the time taken to create the index.
+
+Usage:
+    uv run python -m operations.benchmarks.claude_mem_scan [--rows N] [--stale-percent P] [--runs N]
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from ..cleanup.handlers.claude_mem import ClaudeMemHandler
+from ._timing import report, time_runs
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_BATCH_SIZE = 1000
+
+
+def _create_db(path: Path, rows: int) -> None:
+    """Create a database of observations one minute apart, oldest first."""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE observations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sdk_session_id TEXT NOT NULL,
+            project TEXT NOT NULL,
+            type TEXT NOT NULL,
+            title TEXT,
+            text TEXT,
+            created_at TEXT NOT NULL,
+            created_at_epoch INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE TABLE session_summaries (id INTEGER PRIMARY KEY, created_at TEXT NOT NULL, summary TEXT)")
+    conn.executemany(
+        "INSERT INTO observations (sdk_session_id, project, type, title, text, created_at, created_at_epoch) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (f"session-{i // 50}", "bureau", "discovery", f"Observation {i}",
+             "Found that the stale-row scan reads the whole table when created_at isn't indexed. " * 3,
+             (_START + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+             int((_START + timedelta(minutes=i)).timestamp()))
+            for i in range(rows)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+
+def _scan(handler: ClaudeMemHandler, cutoff: datetime) -> int:
+    return sum(len(batch) for batch in handler.iter_stale_batches(cutoff, _BATCH_SIZE))
+
+
+def _measure(handler: ClaudeMemHandler, cutoff: datetime, runs: int) -> tuple[list[float], int]:
+    """Return wall times (seconds) of full scans over runs, and the number of stale rows found."""
+    found: list[int] = []
+    timings = time_runs(lambda: found.append(_scan(handler, cutoff)), runs)
+    return timings, found[-1]
+
+
+def _print_plans(handler: ClaudeMemHandler) -> None:
+    for entry in handler._check_created_at_indexes(create=False):
+        print(f"    plan ({entry['table']}): {entry['plan']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Observations (default: 1000000)")
+    parser.add_argument("--stale-percent", type=float, default=1.0,
+                        help="Percentage of observations that are stale (default: 1)")
+    parser.add_argument("--runs", type=int, default=3, help="Timed scans per measurement (default: 3)")
+    args = parser.parse_args()
+
+    cutoff = _START + timedelta(minutes=int(args.rows * args.stale_percent / 100))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "claude-mem.db"
+        print(f"Generating {args.rows} observations ({args.stale_percent:g}% stale)...")
+        _create_db(db_path, args.rows)
+
+        handler = ClaudeMemHandler()
+
+        with patch("operations.cleanup.handlers.claude_mem.get_storage", lambda _: db_path), \
+             patch("operations.cleanup.handlers.claude_mem.get_claude_mem_create_indexes", lambda: True):
+            print(f"Scanning for stale rows ({args.runs} run(s) each, batches of {_BATCH_SIZE}):")
+            _print_plans(handler)
+            timings, found = _measure(handler, cutoff, args.runs)
+            report("without index", timings, 20, note=f"({found} stale rows)")
+
+            start = time.perf_counter()
+            handler._check_created_at_indexes(create=True)
+            print(f"  created (created_at, id) index in {time.perf_counter() - start:.2f} s")
+
+            _print_plans(handler)
+            timings, found = _measure(handler, cutoff, args.runs)
+            report("with index", timings, 20, note=f"({found} stale rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
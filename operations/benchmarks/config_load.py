@@ -0,0 +1,57 @@
+"""Benchmark cold vs. warm config load latency (with/without the compiled config snapshot).
+
+- cold: no `.archives/config.cache`, so YAML files are parsed, merged and validated
+- warm: snapshot is fresh, so it's loaded instead
+
+Measures both in-process `get_config()` latency and end-to-end latency of a new Python
+process loading the config (i.e. what each `get-config`/`sweep` invocation pays).
+
+Usage:
+    uv run python -m operations.benchmarks.config_load [--runs N]
+"""
+import argparse
+import subprocess
+import sys
+
+from ..config_loader import CONFIG_SNAPSHOT_PATH, clear_config_cache, find_repo_root, get_config
+from ._timing import report, time_runs
+
+_LOAD_IN_NEW_PROCESS = "from operations.config_loader import get_config; get_config()"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Runs per measurement (default: 20)")
+    args = parser.parse_args()
+
+    repo_root = find_repo_root()
+    snapshot_path = repo_root / CONFIG_SNAPSHOT_PATH
+    had_archives_dir = snapshot_path.parent.exists()
+    had_snapshot = snapshot_path.exists()
+
+    def drop_snapshot() -> None:
+        clear_config_cache()
+        snapshot_path.unlink(missing_ok=True)
+
+    def load_in_new_process() -> None:
+        subprocess.run([sys.executable, "-c", _LOAD_IN_NEW_PROCESS], cwd=repo_root, check=True)
+
+    try:
+        print(f"In-process get_config() ({args.runs} runs):")
+        report("cold", time_runs(get_config, args.runs, setup=drop_snapshot), 8, "ms")
+        report("warm", time_runs(get_config, args.runs, setup=clear_config_cache), 8, "ms")
+
+        print(f"New process loading config ({args.runs} runs):")
+        report("cold", time_runs(load_in_new_process, args.runs, setup=drop_snapshot), 8, "ms")
+        report("warm", time_runs(load_in_new_process, args.runs), 8, "ms")
+    finally:
+        if not had_snapshot:
+            snapshot_path.unlink(missing_ok=True)
+        if not had_archives_dir:
+            snapshot_path.parent.rmdir()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Benchmark Memory MCP cleanup: read-filter-rewrite vs. a single streaming pass.
+
+Generates a Memory MCP-like JSONL file (a share of its entities stale), then cleans it up two ways:
+
+- legacy: parse the whole file into a list to find the stale entities, export them, parse the whole
+  file again, and rewrite it in place with `open(..., "w")` (how the handler used to clean up)
+- single pass: MemoryMcpHandler.cleanup() (with memory_mcp.compact off, like the legacy path),
+  streaming each line either to the trash file or to a temp file that then atomically replaces
+  the original
+
+Reports wall time, bytes read and written (from /proc/self/io, Linux only), and peak Python memory
+measured in a separate (traced) run. The file is regenerated (untimed) before every run.
+
+Usage:
+    uv run python -m operations.benchmarks.memory_mcp_cleanup [--entities N] [--stale-share F] [--runs N]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
+
+from ..cleanup.handlers.memory_mcp import MemoryMcpHandler
+from ._timing import report, time_runs
+
+_STALE_TS = "2024-01-01T00:00:00.000Z"
+_VALID_TS = "2024-09-01T00:00:00.000Z"
+_CUTOFF = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _create_file(path: Path, entities: int, stale_share: float) -> None:
+    stale_every = max(1, round(1 / stale_share)) if stale_share > 0 else 0
+    with open(path, "w") as f:
+        for i in range(entities):
+            stale = stale_every and i % stale_every == 0
+            f.write(json.dumps({
+                "type": "entity",
+                "name": f"entity_{i}",
+                "entityType": "concept",
+                "observations": [f"Observation {j} about entity {i}, recorded during a session." for j in range(5)],
+                "created_at": _STALE_TS if stale else _VALID_TS,
+            }) + "\n")
+
+
+def _cleanup_legacy(handler: MemoryMcpHandler, path: Path) -> None:
+    items = [entity for entity in handler._read_entities() if handler._is_stale(entity, _CUTOFF)]
+    handler.export_items_to_trash(items, "365d")
+
+    stale_names = {item["name"] for item in items}
+    entities = handler._read_entities()
+    with open(path, "w") as f:
+        for entity in entities:
+            if entity["name"] not in stale_names:
+                f.write(json.dumps(entity) + "\n")
+
+
+def _io_counters() -> tuple[int, int] | None:
+    """Bytes read and written by this process so far (rchar, wchar), or None if unavailable."""
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(":") for line in f)
+        return int(counters["rchar"]), int(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _measure(
+    cleanup: Callable[[], object], reset: Callable[[], None], runs: int
+) -> tuple[list[float], tuple[int, int] | None, float]:
+    """Return wall times (seconds) over runs, bytes read/written in the last run, and peak traced
+    memory (MiB) of one more run."""
+    counters: list[tuple[int, int] | None] = []
+
+    def reset_and_count() -> None:
+        reset()
+        counters.append(_io_counters())
+
+    def cleanup_and_count() -> None:
+        cleanup()
+        counters.append(_io_counters())
+
+    timings = time_runs(cleanup_and_count, runs, setup=reset_and_count)
+    before, after = counters[-2:]
+    io = (after[0] - before[0], after[1] - before[1]) if before is not None and after is not None else None
+
+    reset()
+    tracemalloc.start()
+    cleanup()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings, io, peak / (1 << 20)
+
+
+def _report(label: str, timings: list[float], io: tuple[int, int] | None, peak_mib: float) -> None:
+    io_text = "read/written n/a" if io is None else f"read {io[0] / (1 << 20):7.1f} MiB   written {io[1] / (1 << 20):7.1f} MiB"
+    report(label, timings, 12, note=f"{io_text}   peak memory {peak_mib:7.1f} MiB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=200_000, help="Entities in the file (default: 200000)")
+    parser.add_argument("--stale-share", type=float, default=0.1, help="Share of stale entities (default: 0.1)")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per measurement (default: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, trash_dir = Path(tmp) / "memory.jsonl", Path(tmp) / "trash"
+
+        def reset() -> None:
+            _create_file(path, args.entities, args.stale_share)
+
+        reset()
+        print(f"{args.entities} entities ({path.stat().st_size / (1 << 20):.1f} MiB), "
+              f"{args.stale_share:.0%} stale ({args.runs} run(s) each):")
+
+        handler = MemoryMcpHandler()
+        with patch("operations.cleanup.handlers.memory_mcp.get_storage", lambda _: path), \
+             patch("operations.cleanup.trash.get_base_trash_dir", lambda: trash_dir), \
+             patch("operations.cleanup.handlers.memory_mcp.get_memory_mcp_compact", lambda: False), \
+             patch.object(MemoryMcpHandler, "get_cutoff", lambda self, retention: _CUTOFF):
+            _report("legacy", *_measure(lambda: _cleanup_legacy(handler, path), reset, args.runs))
+            _report("single pass", *_measure(lambda: handler.cleanup("365d"), reset, args.runs))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
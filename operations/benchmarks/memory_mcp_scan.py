@@ -0,0 +1,117 @@
+"""Benchmark finding stale Memory MCP entities: decoding every line vs. a byte pattern scan.
+
+Generates a Memory MCP-like JSONL file (mostly recent entities, plus relations without a
+created_at), then runs two steps each way:
+
+- listing: finding the stale entities (as dry runs do)
+- cleanup: moving the stale lines to trash and rewriting the file without them
+
+Either by reading the file line by line and decoding every line with json.loads (how the handler
+used to), or by memory-mapping it and searching its raw bytes for created_at values, decoding only
+lines that are stale or ambiguous, and copying the bytes between them unchanged (see
+MemoryMcpHandler._iter_stale_lines()). Cleanup is also timed with memory_mcp.compact on (cascading
+removed entities' relations and deduping observations, which decodes every line); the other runs
+have it off.
+
+Usage:
+    uv run python -m operations.benchmarks.memory_mcp_scan [--entities N] [--stale-share F] [--runs N]
+"""
+import argparse
+import json
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+from unittest.mock import patch
+
+from ..cleanup.handlers.memory_mcp import MemoryMcpHandler
+from ..cleanup.trash import TrashWriter
+from ._timing import report, time_runs
+
+_STALE_TS = "2024-01-01T00:00:00.000Z"
+_VALID_TS = "2024-09-01T00:00:00.000Z"
+_CUTOFF = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _create_file(path: Path, entities: int, stale_share: float) -> None:
+    stale_every = max(1, round(1 / stale_share)) if stale_share > 0 else 0
+    with open(path, "w") as f:
+        for i in range(entities):
+            stale = stale_every and i % stale_every == 0
+            f.write(json.dumps({
+                "type": "entity",
+                "name": f"entity_{i}",
+                "entityType": "concept",
+                "observations": [f"Observation {j} about entity {i}, recorded during a session." for j in range(5)],
+                "created_at": _STALE_TS if stale else _VALID_TS,
+            }) + "\n")
+            if i % 4 == 0:
+                f.write(json.dumps({
+                    "type": "relation", "from": f"entity_{i}", "to": f"entity_{i + 1}", "relationType": "relates_to",
+                }) + "\n")
+
+
+def _list_decoding(handler: MemoryMcpHandler) -> int:
+    return sum(1 for _, entity in handler._iter_lines()
+               if entity is not None and handler._is_stale(entity, _CUTOFF))
+
+
+def _list_scanning(handler: MemoryMcpHandler) -> int:
+    return len(handler.get_stale_items(_CUTOFF))
+
+
+def _cleanup_decoding(handler: MemoryMcpHandler) -> None:
+    with TrashWriter(handler.name, "365d") as writer:
+        def kept_lines() -> Iterator[bytes]:
+            for line, entity in handler._iter_lines():
+                if entity is not None and handler._is_stale(entity, _CUTOFF):
+                    writer.write_json_lines([line.decode().strip()])
+                else:
+                    yield line
+
+        handler._replace_file(kept_lines())
+
+
+def _cleanup_scanning(handler: MemoryMcpHandler) -> None:
+    handler.cleanup("365d")
+
+
+def _cleanup_compacting(handler: MemoryMcpHandler) -> None:
+    with patch("operations.cleanup.handlers.memory_mcp.get_memory_mcp_compact", lambda: True):
+        handler.cleanup("365d")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=500_000, help="Entities in the file (default: 500000)")
+    parser.add_argument("--stale-share", type=float, default=0.01, help="Share of stale entities (default: 0.01)")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per measurement (default: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, trash_dir = Path(tmp) / "memory.jsonl", Path(tmp) / "trash"
+
+        def reset() -> None:
+            _create_file(path, args.entities, args.stale_share)
+
+        reset()
+        print(f"{args.entities} entities ({path.stat().st_size / (1 << 20):.1f} MiB), "
+              f"{args.stale_share:.0%} stale ({args.runs} run(s) each):")
+
+        handler = MemoryMcpHandler()
+        with patch("operations.cleanup.handlers.memory_mcp.get_storage", lambda _: path), \
+             patch("operations.cleanup.trash.get_base_trash_dir", lambda: trash_dir), \
+             patch("operations.cleanup.handlers.memory_mcp.get_memory_mcp_compact", lambda: False), \
+             patch.object(MemoryMcpHandler, "get_cutoff", lambda self, retention: _CUTOFF):
+            assert _list_decoding(handler) == _list_scanning(handler)
+            report("listing (decoding)", time_runs(lambda: _list_decoding(handler), args.runs), 21)
+            report("listing (scanning)", time_runs(lambda: _list_scanning(handler), args.runs), 21)
+            report("cleanup (decoding)", time_runs(lambda: _cleanup_decoding(handler), args.runs, setup=reset), 21)
+            report("cleanup (scanning)", time_runs(lambda: _cleanup_scanning(handler), args.runs, setup=reset), 21)
+            report("cleanup (compacting)", time_runs(lambda: _cleanup_compacting(handler), args.runs, setup=reset), 21)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
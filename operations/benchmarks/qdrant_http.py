@@ -0,0 +1,67 @@
+"""Benchmark Qdrant scroll throughput: pooled keep-alive connections vs. a new connection per request.
+
+Runs a full stale-point scan (collection lookup, index check and every scroll page) against a
+local stand-in Qdrant server, once with QdrantHandler's connection pool and once opening a new
+connection for every request (as urllib's urlopen does).
+
+Usage:
+    uv run python -m operations.benchmarks.qdrant_http [--runs N] [--points N]
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from ..cleanup.handlers.qdrant import QdrantHandler
+from ..cleanup.http_pool import HTTPConnectionPool
+from ..testing.qdrant_stub import QdrantStubServer
+
+
+class _OneShotConnectionPool(HTTPConnectionPool):
+    """Pool that never keeps connections, i.e. one TCP connection per request."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_idle = 0
+
+
+def _scan(points: list[dict], pool_cls: type[HTTPConnectionPool]) -> tuple[float, int, int]:
+    """Run one full stale-point scan, returning (seconds, requests sent, connections opened)."""
+    with QdrantStubServer(points) as server, \
+         patch("operations.cleanup.handlers.qdrant.get_qdrant_url", lambda: server.url), \
+         patch("operations.cleanup.handlers.qdrant.HTTPConnectionPool", pool_cls):
+        handler = QdrantHandler()
+        start = time.perf_counter()
+        handler.get_stale_items(datetime.now(timezone.utc))
+        elapsed = time.perf_counter() - start
+        handler._end_run()
+        return elapsed, server.requests, server.connections
+
+
+def _report(label: str, runs: list[tuple[float, int, int]]) -> None:
+    rates = [requests / elapsed for elapsed, requests, _ in runs]
+    print(f"  {label:<22} median {statistics.median(rates):8.0f} req/s   "
+          f"max {max(rates):8.0f} req/s   ({runs[0][1]} requests over {runs[0][2]} connection(s))")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement (default: 5)")
+    parser.add_argument("--points", type=int, default=10_000, help="Points in the collection (default: 10000)")
+    args = parser.parse_args()
+
+    points = [
+        {"id": i, "payload": {"metadata": {"created_at": "2024-01-01T00:00:00.000Z"}}}
+        for i in range(1, args.points + 1)
+    ]
+
+    print(f"Full scroll of {args.points} points ({args.runs} runs):")
+    _report("keep-alive pool", [_scan(points, HTTPConnectionPool) for _ in range(args.runs)])
+    _report("connection per request", [_scan(points, _OneShotConnectionPool) for _ in range(args.runs)])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
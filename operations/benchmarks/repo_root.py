@@ -0,0 +1,77 @@
+"""Benchmark main repo root resolution: pure-Python git metadata reads vs. the git CLI.
+
+Measures:
+- in-process resolution latency of each resolver (unmemoized)
+- end-to-end latency of `get-config agents` in a new process with no config snapshot
+  (i.e. the cold path that has to resolve `path_to.mcp_clones`), with each resolver
+
+Usage:
+    uv run python -m operations.benchmarks.repo_root [--runs N]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+from ..config_loader import (
+    CONFIG_SNAPSHOT_PATH,
+    _git_common_dir_via_cli,
+    _resolve_git_common_dir,
+    find_repo_root,
+)
+from ._timing import report, time_runs
+
+# run `get-config agents` in a new process, optionally forcing the git CLI fallback
+_GET_CONFIG_AGENTS = """
+import sys
+import operations.config_loader as config_loader
+if {force_cli}:
+    config_loader._resolve_git_common_dir = lambda start_dir: None
+from operations.config_cli import main
+sys.argv = ["get-config", "agents"]
+sys.exit(main())
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Runs per measurement (default: 20)")
+    args = parser.parse_args()
+
+    cwd = Path.cwd().resolve()
+    if _resolve_git_common_dir(cwd) is None:
+        print("Not in a standard git checkout/worktree; nothing to compare.", file=sys.stderr)
+        return 1
+
+    repo_root = find_repo_root()
+    snapshot_path = repo_root / CONFIG_SNAPSHOT_PATH
+    saved_snapshot = snapshot_path.read_bytes() if snapshot_path.exists() else None
+
+    def drop_snapshot() -> None:
+        snapshot_path.unlink(missing_ok=True)
+
+    def get_config_agents(force_cli: bool):
+        script = _GET_CONFIG_AGENTS.format(force_cli=force_cli)
+        return lambda: subprocess.run(
+            [sys.executable, "-c", script], cwd=cwd, check=True, stdout=subprocess.DEVNULL
+        )
+
+    try:
+        print(f"Resolve git common dir in-process ({args.runs} runs):")
+        report("pure-python", time_runs(lambda: _resolve_git_common_dir(cwd), args.runs), 12, "ms")
+        report("git CLI", time_runs(lambda: _git_common_dir_via_cli(cwd), args.runs), 12, "ms")
+
+        print(f"`get-config agents` in a new process, no config snapshot ({args.runs} runs):")
+        report("pure-python", time_runs(get_config_agents(False), args.runs, setup=drop_snapshot), 12, "ms")
+        report("git CLI", time_runs(get_config_agents(True), args.runs, setup=drop_snapshot), 12, "ms")
+    finally:
+        if saved_snapshot is not None:
+            snapshot_path.write_bytes(saved_snapshot)
+        else:
+            drop_snapshot()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
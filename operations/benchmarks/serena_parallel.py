@@ -0,0 +1,160 @@
+"""Benchmark Serena cleanup on a slow (network/FUSE-like) filesystem: serial vs. a thread pool.
+
+Generates a workspace of projects, each with a .serena/memories directory of stale memory files,
+then runs the Serena handler's cleanup steps on it with latency injected into every filesystem call
+it makes (os.scandir, os.lstat, os.stat, DirEntry.stat, shutil.move), as on a network or FUSE mount:
+
+- discovery: a full rescan for memories directories (see SerenaHandler._find_serena_dirs())
+- listing: finding the stale memory files (stat'ing each one)
+- trash: moving them all to trash (one manifest entry)
+
+each with serena.jobs = 1 (serial) and with the thread pool (--jobs).
+
+Usage:
+    uv run python -m operations.benchmarks.serena_parallel [--projects N] [--files N] [--latency-ms MS] [--jobs N]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from unittest.mock import patch
+
+from ..cleanup.handlers.serena import SerenaHandler
+
+_STALE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+_CUTOFF = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _create_workspace(root: Path, projects: int, files: int) -> None:
+    for p in range(projects):
+        project = root / f"project_{p:03d}"
+        for sub in ("src/app", "docs", "tests"):
+            (project / sub).mkdir(parents=True)
+        memories_dir = project / ".serena" / "memories"
+        memories_dir.mkdir(parents=True)
+        for f in range(files):
+            memory_file = memories_dir / f"memory_{f:03d}.md"
+            memory_file.write_text(f"# Memory {f}\n\nNotes on project {p}.\n")
+            os.utime(memory_file, (_STALE_TIME, _STALE_TIME))
+
+
+class _SlowDirEntry:
+    """DirEntry wrapper whose stat() calls (which may reach the filesystem) pay the latency."""
+
+    def __init__(self, entry: os.DirEntry, delay: Callable[[], None]):
+        self._entry = entry
+        self._delay = delay
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._entry, name)
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        self._delay()
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+class _SlowScandir:
+    def __init__(self, scandir: Callable, delay: Callable[[], None]):
+        self._scandir = scandir
+        self._delay = delay
+
+    def __call__(self, path: Any = ".") -> "_SlowScandirIterator":
+        self._delay()
+        return _SlowScandirIterator(self._scandir(path), self._delay)
+
+
+class _SlowScandirIterator:
+    def __init__(self, entries: Any, delay: Callable[[], None]):
+        self._entries = entries
+        self._delay = delay
+
+    def __iter__(self) -> Iterator[_SlowDirEntry]:
+        return (_SlowDirEntry(entry, self._delay) for entry in self._entries)
+
+    def __enter__(self) -> "_SlowScandirIterator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._entries.close()
+
+
+def _slow(fn: Callable, delay: Callable[[], None]) -> Callable:
+    def slow_fn(*args: Any, **kwargs: Any) -> Any:
+        delay()
+        return fn(*args, **kwargs)
+    return slow_fn
+
+
+def _latency_injected(stack: ExitStack, latency: float) -> None:
+    """Make every filesystem call the handler makes sleep for latency seconds first."""
+    def delay() -> None:
+        time.sleep(latency)
+
+    stack.enter_context(patch("os.scandir", _SlowScandir(os.scandir, delay)))
+    stack.enter_context(patch("os.lstat", _slow(os.lstat, delay)))
+    stack.enter_context(patch("os.stat", _slow(os.stat, delay)))
+    stack.enter_context(patch("shutil.move", _slow(shutil.move, delay)))
+
+
+def _run(root: Path, trash_dir: Path, jobs: int, latency: float) -> dict[str, float]:
+    """Time each cleanup step with serena.jobs = jobs, returning seconds per step."""
+    timings = {}
+    handler = SerenaHandler()
+    with ExitStack() as stack:
+        stack.enter_context(patch("operations.cleanup.handlers.serena.get_path", lambda _: root))
+        stack.enter_context(patch("operations.cleanup.handlers.serena.get_serena_jobs", lambda: jobs))
+        stack.enter_context(patch("operations.cleanup.handlers.serena.get_serena_index_path",
+                                  lambda: root.parent / "serena-index.json"))
+        stack.enter_context(patch("operations.cleanup.serena_inventory.get_serena_inventory_path",
+                                  lambda: root.parent / "serena-inventory.json"))
+        stack.enter_context(patch("operations.cleanup.trash.get_base_trash_dir", lambda: trash_dir))
+        _latency_injected(stack, latency)
+
+        start = time.perf_counter()
+        handler._find_serena_dirs(rescan=True)
+        timings["discovery"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        items = handler.get_stale_items(_CUTOFF)
+        timings["listing"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        handler.export_items_to_trash(items, "90d")
+        timings["trash"] = time.perf_counter() - start
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=50, help="Projects in the workspace (default: 50)")
+    parser.add_argument("--files", type=int, default=20, help="Stale memory files per project (default: 20)")
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="Latency added to each filesystem call, in ms (default: 2)")
+    parser.add_argument("--jobs", type=int, default=8, help="Threads for the parallel run (default: 8)")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    results = {}
+    for jobs in (1, args.jobs):
+        # a fresh workspace per run (the previous run moved its memories to trash)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "workspace"
+            _create_workspace(root, args.projects, args.files)
+            results[jobs] = _run(root, Path(tmp) / "trash", jobs, latency)
+
+    print(f"{args.projects} projects x {args.files} stale memories, {args.latency_ms:g} ms per filesystem call:")
+    for step in ("discovery", "listing", "trash"):
+        serial, parallel = results[1][step], results[args.jobs][step]
+        print(f"  {step:<10} serial {serial:7.3f} s   {args.jobs} threads {parallel:7.3f} s   "
+              f"({serial / parallel:4.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Benchmark scanning a workspace for Serena memories directories: rglob vs. a pruning scandir walk.
+
+Generates a synthetic workspace of about 200k directories: projects with source trees, plus the
+dependency and VCS directories real checkouts are mostly made of (node_modules, .git, target), half
+of the projects having .serena/memories. Then finds every memories directory three ways:
+
+- rglob: `Path.rglob(".serena")`, then an is_symlink() check on every path component of each hit
+  (how the handler used to scan)
+- scandir: the handler's os.scandir() walk, without pruning (serena.ignore empty)
+- scandir + ignore: the same, pruning the default serena.ignore directories
+
+Reports each scan's wall time (warm filesystem cache) and the memories directories found.
+
+Usage:
+    uv run python -m operations.benchmarks.serena_scan [--projects N] [--dirs-per-project N] [--runs N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
+
+from ..cleanup.handlers.serena import SerenaHandler
+from ._timing import report, time_runs
+
+_DEFAULT_IGNORE = ["node_modules", ".git", ".venv", "target", "build"]
+_MAX_DEPTH = 8
+
+
+def _create_tree(root: Path, projects: int, dirs_per_project: int) -> int:
+    """Create the synthetic workspace, returning the number of directories created."""
+    created = 0
+    # most of a checkout's directories are dependencies and VCS objects
+    shares = {"src": 0.15, "node_modules": 0.6, ".git": 0.15, "target": 0.1}
+    for p in range(projects):
+        project = root / f"project_{p:04d}"
+        for top, share in shares.items():
+            count = max(1, int(dirs_per_project * share))
+            # two levels of fan-out, e.g. node_modules/pkg_N/lib_M
+            fan_out = max(1, int(count ** 0.5))
+            for i in range(count):
+                os.makedirs(project / top / f"d{i // fan_out}" / f"d{i % fan_out}", exist_ok=True)
+            created += count + fan_out
+        if p % 2 == 0:
+            memories = project / ".serena" / "memories"
+            memories.mkdir(parents=True)
+            (memories / "overview.md").write_text("# Overview\n")
+            created += 2
+    return created
+
+
+def _rglob_scan(root: Path) -> list[Path]:
+    """Find memories directories as the handler used to (rglob, then symlink checks per component)."""
+    found = []
+    for serena_dir in root.rglob(".serena"):
+        if serena_dir.is_symlink():
+            continue
+        current = root
+        followed_symlink = False
+        for part in serena_dir.relative_to(root).parts:
+            current = current / part
+            if current.is_symlink():
+                followed_symlink = True
+                break
+        if followed_symlink:
+            continue
+        memories_dir = serena_dir / "memories"
+        if memories_dir.exists() and memories_dir.is_dir():
+            found.append(memories_dir)
+    return found
+
+
+def _walker_scan(root: Path, ignore: list[str]) -> list[Path]:
+    with patch("operations.cleanup.handlers.serena.get_serena_ignore", lambda: ignore), \
+         patch("operations.cleanup.handlers.serena.get_serena_max_depth", lambda: _MAX_DEPTH):
+        return SerenaHandler()._scan_for_serena_dirs(root, root)
+
+
+def _measure(scan: Callable[[], list[Path]], runs: int) -> tuple[list[float], int]:
+    """Return wall times (seconds) of scans over runs, and the number of memories directories found."""
+    found: list[int] = []
+    timings = time_runs(lambda: found.append(len(scan())), runs)
+    return timings, found[-1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=200, help="Projects in the workspace (default: 200)")
+    parser.add_argument("--dirs-per-project", type=int, default=1000,
+                        help="Directories in each project (default: 1000)")
+    parser.add_argument("--runs", type=int, default=3, help="Timed scans per method (default: 3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "workspace"
+        print(f"Generating {args.projects} projects...")
+        created = _create_tree(root, args.projects, args.dirs_per_project)
+        print(f"Scanning ~{created} directories ({args.runs} run(s) each):")
+
+        scans: list[tuple[str, Callable[[], list[Path]]]] = [
+            ("rglob", lambda: _rglob_scan(root)),
+            ("scandir", lambda: _walker_scan(root, [])),
+            ("scandir + ignore", lambda: _walker_scan(root, _DEFAULT_IGNORE)),
+        ]
+        for label, scan in scans:
+            timings, found = _measure(scan, args.runs)
+            report(label, timings, 18, note=f"({found} memories dirs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
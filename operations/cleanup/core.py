@@ -2,24 +2,78 @@
 """Cleanup CLI entrypoint"""
 import argparse
 import logging
+import signal
 import sys
+import threading
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
 
 from ..config_loader import (
-    get_config,
+    get_config_errors,
+    get_cleanup_handler_timeout,
+    get_cleanup_jobs,
     get_retention,
     get_cleanup_interval,
     get_trash_grace_period,
     parse_duration,
 )
-from ..validate_config import full_validate
 from .state import load_state, save_state, did_recently_run, now_as_iso, State
 from .trash import empty_expired_trash, empty_all_trash
-from .handlers import HANDLERS
+from .handlers import HANDLER_REGISTRY, get_handler_class, normalize_storage_name
+from .parallel import TaskOutcome, run_with_deadlines, wait_for_abandoned
 
-# compute config-derived values once at module load
-_config = get_config()
-_min_interval = parse_duration(get_cleanup_interval())
-_interval_hours = int(_min_interval.total_seconds() / 3600)
+
+# how long run_cleanup() and wipe_memory_backends() wait for cancelled (timed-out) handlers to stop
+#   before giving up on them
+_ABANDONED_HANDLER_WAIT_SECONDS = 30.0
+
+
+def _get_interval_hours() -> int:
+    """Minimum number of hours between cleanup runs (from `cleanup.min_interval`)."""
+    min_interval = parse_duration(get_cleanup_interval())
+    return int(min_interval.total_seconds() / 3600)
+
+
+def _outcome_to_result(outcome: TaskOutcome) -> dict:
+    """Convert a handler task's outcome into its result dict (or an error dict if it failed)."""
+    if outcome.timed_out:
+        return {
+            "storage": outcome.name,
+            "error": f"timed out after {get_cleanup_handler_timeout()}s",
+        }
+    if outcome.error is not None:
+        return {
+            "storage": outcome.name,
+            "error": str(outcome.error),
+        }
+    return outcome.result
+
+
+def _print_delete_chunks(result: dict) -> None:
+    """Print the latency of each delete request a handler reported (if any)."""
+    chunks = result.get("delete_chunks") or []
+    for index, chunk in enumerate(chunks, start=1):
+        print(f"  Delete chunk {index}/{len(chunks)}: {chunk['points']} items in {chunk['ms']:.1f} ms")
+
+
+def _print_query_plans(result: dict) -> None:
+    """Print the stale-row query plan of each table a handler reported (if any)."""
+    for entry in result.get("query_plans") or []:
+        created = " (index created)" if entry["index_created"] else ""
+        print(f"  Query plan ({entry['table']}){created}: {entry['plan']}")
+
+
+def _print_compaction(result: dict) -> None:
+    """Print what a handler's rewrite reclaimed beyond the stale items themselves (if it reported it)."""
+    if result.get("would_cascade") or result.get("would_dedupe"):
+        print(f"  Would also trash {result['would_cascade']} orphaned relations and drop "
+              f"{result['would_dedupe']} duplicate observations")
+    if result.get("cascaded") or result.get("deduped"):
+        print(f"  Also trashed {result['cascaded']} orphaned relations and dropped "
+              f"{result['deduped']} duplicate observations")
+    if result.get("bytes_reclaimed"):
+        print(f"  Reclaimed: {result['bytes_reclaimed']} bytes")
 
 
 def run_cleanup(
@@ -27,10 +81,17 @@ def run_cleanup(
     dry_run: bool = False,
     memory_backends: list[str] | None = None,
     verbose: bool = False,
+    jobs: int | None = None,
 ) -> dict:
-    """Run cleanup for all or specific storage."""
+    """Run cleanup for all or specific storage.
+
+    Handlers run concurrently on up to `jobs` threads (default: `cleanup.jobs`), each
+    given `cleanup.handler_timeout` seconds before it's reported as timed out and cancelled
+    (see CleanupHandler.cancel()). Expired trash is only emptied, and the run only recorded,
+    once every cancelled handler has stopped.
+    """
     # Validate configuration before running cleanup
-    validation_errors = full_validate(_config)
+    validation_errors = get_config_errors()
     if validation_errors:
         return {
             "error": "Configuration validation failed",
@@ -42,7 +103,7 @@ def run_cleanup(
     errors: list[dict] = []
 
     # check if we ran recently (unless forced)
-    if not force and did_recently_run(state, N=_interval_hours):
+    if not force and did_recently_run(state, N=_get_interval_hours()):
         return {
             "skipped": True,
             "reason": f"Last run was <{get_cleanup_interval()} ago, skipping (override with --force/-f)",
@@ -52,53 +113,69 @@ def run_cleanup(
     results = []
 
     # filter handlers if requested to clear specific storage only
-    handlers_to_run = HANDLERS
+    handlers_to_run = list(HANDLER_REGISTRY)
     if memory_backends:
-        requested = {s.replace("-", "_") for s in memory_backends}
-        handlers_to_run = tuple(h for h in HANDLERS if h.name.replace("-", "_") in requested)  # type: ignore[assignment]
+        requested = {normalize_storage_name(s) for s in memory_backends}
+        handlers_to_run = [name for name in HANDLER_REGISTRY if name in requested]
         if not handlers_to_run:
             return {"error": f"Unknown storage: {', '.join(memory_backends)}", "errors": errors}
 
     # run cleanup for each handler in the list (i.e. each memory backend selected)
-    for handler_class in handlers_to_run:
-        handler = handler_class()
-        retention = get_retention(handler.name)
+    #   (handler modules are only imported here, for the backends actually being cleaned)
+    handlers = [get_handler_class(name)() for name in handlers_to_run]
+    retentions = {handler.name: get_retention(handler.name) for handler in handlers}
+
+    outcomes = run_with_deadlines(
+        [
+            (handler.name, partial(handler.cleanup, retentions[handler.name], dry_run=dry_run))
+            for handler in handlers
+        ],
+        jobs=jobs if jobs is not None else get_cleanup_jobs(),
+        timeout=get_cleanup_handler_timeout(),
+        on_timeout=lambda index: handlers[index].cancel(),
+    )
 
+    for outcome in outcomes:
         if verbose:
-            print(f"Cleaning {handler.name} (retention: {retention})...")
+            print(f"Cleaning {outcome.name} (retention: {retentions[outcome.name]})...")
 
-        try:
-            result = handler.cleanup(retention, dry_run=dry_run)
-            results.append(result)
+        result = _outcome_to_result(outcome)
+        results.append(result)
 
-            if result.get("error"):
-                errors.append({
-                    "storage": handler.name,
-                    "error": result.get("error"),
-                })
-
-            if verbose:
-                if result.get("skipped"):
-                    print(f"  Skipped: {result.get('reason')}")
-                elif result.get("dry_run"):
-                    print(f"  Would delete: {result.get('would_delete')} items")
-                else:
-                    print(f"  Deleted: {result.get('deleted')} items")
-        except Exception as e:
-            results.append({
-                "storage": handler.name,
-                "error": str(e),
-            })
+        if result.get("error"):
             errors.append({
-                "storage": handler.name,
-                "error": str(e),
+                "storage": outcome.name,
+                "error": result.get("error"),
             })
-            if verbose:
-                print(f"  Error: {e}")
+
+        if verbose:
+            if result.get("error"):
+                print(f"  Error: {result['error']}")
+            elif result.get("skipped"):
+                print(f"  Skipped: {result.get('reason')}")
+            elif result.get("dry_run"):
+                print(f"  Would delete: {result.get('would_delete')} items")
+            else:
+                print(f"  Deleted: {result.get('deleted')} items")
+            _print_delete_chunks(result)
+            _print_query_plans(result)
+            _print_compaction(result)
+            print(f"  Elapsed: {outcome.elapsed:.2f}s")
+
+    # timed-out handlers are cancelled, but only stop between batches: until they have, they may
+    #   still be writing to the trash (and the run isn't over), so trash and state are left alone
+    still_running = wait_for_abandoned(outcomes, _ABANDONED_HANDLER_WAIT_SECONDS) if not dry_run else []
+    if still_running:
+        errors.append({
+            "storage": "trash",
+            "error": f"not emptied, and last run not recorded: {', '.join(still_running)} still running",
+        })
+        if verbose:
+            print(f"Skipped emptying trash: {', '.join(still_running)} still running after timing out")
 
     # empty expired trash (unless doing a dry run)
     trash_result = {"trash_emptied": 0}
-    if not dry_run:
+    if not dry_run and not still_running:
         grace_period = get_trash_grace_period()
         deleted_count = empty_expired_trash(grace_period)
         trash_result = {"trash_emptied": deleted_count}
@@ -124,21 +201,24 @@ def wipe_memory_backends(
     memory_backends: list[str],
     backup: bool = True,
     verbose: bool = False,
+    jobs: int | None = None,
+    fast: bool = False,
 ) -> dict:
     """Completely erase *all* data from the specified memory backend(s).
 
     Args:
         memory_backends: List of memory backends to wipe (e.g., ["claude-mem", "qdrant"])
         backup: If True, backup data to trash before wiping
+        fast: If True, replace each backend's storage wholesale (in near-constant time) instead
+            of deleting items one by one
         verbose: If True, print progress
+        jobs: Max backends to wipe concurrently (default: `cleanup.jobs`)
 
     Returns:
         Dict with results per storage
     """
-    config = get_config()
-
     # Validate configuration before wiping
-    validation_errors = full_validate(config)
+    validation_errors = get_config_errors()
     if validation_errors:
         return {
             "error": "Configuration validation failed",
@@ -146,49 +226,164 @@ def wipe_memory_backends(
             "results": [{"storage": "config", "error": e} for e in validation_errors],
         }
 
-    results = []
-
-    # map storage names to handlers
-    handler_map = {h.name.replace("-", "_"): h for h in HANDLERS}
+    results: list[dict | None] = []
+    tasks = []
+    handlers = []
 
     for storage in memory_backends:
-        storage_normalized = storage.replace("-", "_")
-        handler_class = handler_map.get(storage_normalized)
-
-        if not handler_class:
+        if normalize_storage_name(storage) not in HANDLER_REGISTRY:
             results.append({
                 "storage": storage,
                 "error": f"Unknown storage: {storage}",
             })
             continue
 
-        handler = handler_class()
+        handler = get_handler_class(storage)()
+        handlers.append(handler)
+        tasks.append((handler.name, partial(handler.wipe, backup=backup, fast=fast)))
+        results.append(None)  # filled in below, preserving the requested order
 
-        if verbose:
-            print(f"Wiping {handler.name}...")
+    outcomes = run_with_deadlines(
+        tasks,
+        jobs=jobs if jobs is not None else get_cleanup_jobs(),
+        timeout=get_cleanup_handler_timeout(),
+        on_timeout=lambda index: handlers[index].cancel(),
+    )
+    pending = iter(outcomes)
 
-        try:
-            result = handler.wipe(backup=backup)
-            results.append(result)
-
-            if verbose:
-                if result.get("wiped", 0) > 0:
-                    print(f"  Wiped: {result['wiped']} items")
-                    if result.get("backup_path"):
-                        print(f"  Backup: {result['backup_path']}")
-                else:
-                    print(f"  {result.get('message', 'Nothing to wipe')}")
-        except Exception as e:
-            results.append({
-                "storage": handler.name,
-                "error": str(e),
-            })
-            if verbose:
-                print(f"  Error: {e}")
+    for index, slot in enumerate(results):
+        if slot is not None:
+            continue
+
+        outcome = next(pending)
+        result = _outcome_to_result(outcome)
+        results[index] = result
+
+        if verbose:
+            print(f"Wiping {outcome.name}...")
+            if result.get("error"):
+                print(f"  Error: {result['error']}")
+            elif result.get("wiped", 0) > 0:
+                print(f"  Wiped: {result['wiped']} items")
+                if result.get("backup_path"):
+                    print(f"  Backup: {result['backup_path']}")
+            else:
+                print(f"  {result.get('message', 'Nothing to wipe')}")
+            _print_delete_chunks(result)
+            print(f"  Elapsed: {outcome.elapsed:.2f}s")
+
+    # timed-out wipes are cancelled, but only stop once their backup is taken: don't return while
+    #   they may still be deleting
+    still_running = wait_for_abandoned(outcomes, _ABANDONED_HANDLER_WAIT_SECONDS)
+    if still_running:
+        results.append({
+            "storage": "wipe",
+            "error": f"{', '.join(still_running)} still running after timing out",
+        })
+        if verbose:
+            print(f"Still running after timing out: {', '.join(still_running)}")
 
     return {"results": results}
 
 
+def restore_qdrant(snapshot_path: Path | None = None) -> dict:
+    """Restore the Qdrant collection from a snapshot saved to trash by `--wipe qdrant`.
+
+    Args:
+        snapshot_path: Snapshot file to restore (default: the latest one in trash)
+
+    Returns:
+        Dict with the restored snapshot's path, or an error
+    """
+    validation_errors = get_config_errors()
+    if validation_errors:
+        return {"storage": "config", "error": "Configuration validation failed"}
+
+    # imported here so other commands don't pay for loading the Qdrant handler
+    from .handlers.qdrant import QdrantHandler
+
+    return QdrantHandler().restore_snapshot(snapshot_path)
+
+
+def restore_claude_mem(since: datetime | None = None) -> dict:
+    """Restore claude-mem rows from the archive database kept in trash by `claude_mem.trash_format: archive`.
+
+    Args:
+        since: Only restore rows trashed at or after this time (default: all archived rows)
+
+    Returns:
+        Dict with the count of restored rows, or an error
+    """
+    validation_errors = get_config_errors()
+    if validation_errors:
+        return {"storage": "config", "error": "Configuration validation failed"}
+
+    from .handlers.claude_mem import ClaudeMemHandler
+
+    return ClaudeMemHandler().restore_archive(since)
+
+
+def restore_claude_mem_backup(backup_path: Path | None = None) -> dict:
+    """Restore the claude-mem database from a backup saved to trash by `--wipe claude-mem`.
+
+    Args:
+        backup_path: Backup file to restore (default: the latest one in trash)
+
+    Returns:
+        Dict with the restored backup's path, or an error
+    """
+    validation_errors = get_config_errors()
+    if validation_errors:
+        return {"storage": "config", "error": "Configuration validation failed"}
+
+    from .handlers.claude_mem import ClaudeMemHandler
+
+    return ClaudeMemHandler().restore_backup(backup_path)
+
+
+def rescan_serena() -> dict:
+    """Rescan the whole Serena memories root, rebuilding the index of memories directories.
+
+    Returns:
+        Dict with the count of memories directories found, or an error
+    """
+    validation_errors = get_config_errors()
+    if validation_errors:
+        return {"storage": "config", "error": "Configuration validation failed"}
+
+    from .handlers.serena import SerenaHandler
+
+    return SerenaHandler().rescan_index()
+
+
+def watch_serena(stop: threading.Event | None = None) -> dict:
+    """Watch Serena memories directories until stopped (or interrupted), keeping the inventory of
+    memory files that cleanup looks stale memories up in.
+
+    Returns:
+        Dict with the counts of memories directories watched and polled when it stopped, or an error
+    """
+    validation_errors = get_config_errors()
+    if validation_errors:
+        return {"storage": "config", "error": "Configuration validation failed"}
+
+    from .serena_watch import SerenaWatcher
+
+    watcher = SerenaWatcher()
+    try:
+        watcher.run(stop)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        return {"storage": "serena", "error": f"Failed to watch Serena memories: {e}"}
+    return {
+        "storage": "serena",
+        "watched": len(watcher.watched),
+        "polled": len(watcher.polled),
+        "memory_files": len(watcher.table),
+    }
+
+
 # Entrypoint for cleanup CLI: called via `uv run sweep [args]`
 def main():
     # Configure logging to stderr 
@@ -213,6 +408,14 @@ def main():
             raise argparse.ArgumentTypeError(f"Invalid storage letter(s): {', '.join(invalid)} (use any of q/c/s/m)")
         return [STORAGE_MAP[ch] for ch in letters]
 
+    def parse_timestamp(value: str) -> datetime:
+        try:
+            timestamp = datetime.fromisoformat(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid ISO timestamp: {value}")
+        # assume UTC for naive timestamps
+        return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
     parser = argparse.ArgumentParser(
         description="Bureau cleanup: remove old memories based on retention settings"
     )
@@ -258,6 +461,53 @@ def main():
         action="store_true",
         help="Skip backup when wiping (DANGEROUS - data will be permanently lost)"
     )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Wipe by replacing storage wholesale (dropping the collection, swapping in an empty database, ...) "
+             "instead of deleting items one by one"
+    )
+    parser.add_argument(
+        "--restore-qdrant",
+        nargs="?",
+        const="",
+        metavar="SNAPSHOT",
+        help="Restore the Qdrant collection from a wipe's snapshot backup (default: the latest one in trash)"
+    )
+    parser.add_argument(
+        "--restore-claude-mem",
+        nargs="?",
+        const=datetime.min.replace(tzinfo=timezone.utc),
+        type=parse_timestamp,
+        metavar="SINCE",
+        help="Move claude-mem rows from the trash's archive database back (default: all of them; "
+             "with an ISO timestamp, only rows trashed since then)"
+    )
+    parser.add_argument(
+        "--restore-claude-mem-backup",
+        nargs="?",
+        const="",
+        metavar="BACKUP",
+        help="Replace the claude-mem database with a wipe's backup (default: the latest one in trash)"
+    )
+    parser.add_argument(
+        "--rescan-serena",
+        action="store_true",
+        help="Rescan the whole Serena memories root for memories directories (otherwise done every "
+             "serena.rescan_interval) and exit"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch Serena memories directories (Linux inotify) until interrupted, so cleanup can look up "
+             "stale memories instead of scanning for them"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        metavar="N",
+        help="Clean/wipe up to N storage backends concurrently (default: cleanup.jobs config setting)"
+    )
     parser.add_argument(
         "--validate",
         action="store_true",
@@ -265,11 +515,12 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.fast and not args.wipe:
+        parser.error("--fast only applies to --wipe")
 
     # if CLI arg set, validate config and exit
     if args.validate:
-        config = get_config()
-        errors = full_validate(config)
+        errors = get_config_errors()
         if errors:
             print("Configuration validation failed:", file=sys.stderr)
             for error in errors:
@@ -285,12 +536,71 @@ def main():
             print(f"Emptied {result['emptied']} items from trash")
         return 0
 
+    # if CLI arg set, restore Qdrant from a snapshot taken by a previous wipe
+    if args.restore_qdrant is not None:
+        result = restore_qdrant(Path(args.restore_qdrant) if args.restore_qdrant else None)
+        if result.get("error"):
+            print(f"Error (qdrant): {result['error']}", file=sys.stderr)
+            return 1
+        if not args.quiet:
+            print(f"Restored qdrant from {result['restored']}")
+        return 0
+
+    # if CLI arg set, rebuild the index of Serena memories directories
+    if args.rescan_serena:
+        result = rescan_serena()
+        if result.get("error"):
+            print(f"Error (serena): {result['error']}", file=sys.stderr)
+            return 1
+        if not args.quiet:
+            print(f"Found {result['memories_dirs']} Serena memories directories")
+        return 0
+
+    # if CLI arg set, keep the inventory of Serena memory files up to date until interrupted
+    if args.watch:
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        if not args.quiet:
+            print("Watching Serena memories directories (Ctrl-C to stop)...")
+        result = watch_serena(stop)
+        if result.get("error"):
+            print(f"Error (serena): {result['error']}", file=sys.stderr)
+            return 1
+        if not args.quiet:
+            print(f"Stopped watching {result['watched']} Serena memories directories "
+                  f"({result['polled']} polled, {result['memory_files']} memory files)")
+        return 0
+
+    # if CLI arg set, restore claude-mem rows archived by previous cleanups
+    if args.restore_claude_mem is not None:
+        result = restore_claude_mem(args.restore_claude_mem)
+        if result.get("error"):
+            print(f"Error (claude-mem): {result['error']}", file=sys.stderr)
+            return 1
+        if not args.quiet:
+            print(f"Restored {result['restored']} claude-mem rows")
+        return 0
+
+    # if CLI arg set, restore the claude-mem database from a previous wipe's backup
+    if args.restore_claude_mem_backup is not None:
+        result = restore_claude_mem_backup(
+            Path(args.restore_claude_mem_backup) if args.restore_claude_mem_backup else None
+        )
+        if result.get("error"):
+            print(f"Error (claude-mem): {result['error']}", file=sys.stderr)
+            return 1
+        if not args.quiet:
+            print(f"Restored claude-mem from {result['restored']}")
+        return 0
+
     # if CLI arg set, wipe all data from specified storage(s)
     if args.wipe:
         result = wipe_memory_backends(
             memory_backends=args.wipe,
             backup=not args.no_backup,
-            verbose=args.verbose and not args.quiet
+            verbose=args.verbose and not args.quiet,
+            jobs=args.jobs,
+            fast=args.fast,
         )
 
         if not args.quiet:
@@ -318,6 +628,7 @@ def main():
         dry_run=args.dry_run,
         memory_backends=args.storage,
         verbose=args.verbose and not args.quiet,
+        jobs=args.jobs,
     )
 
     # top-level error (e.g., unknown storage)
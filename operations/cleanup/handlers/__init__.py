@@ -1,18 +1,53 @@
-"""Cleanup handlers specific to each memory backend."""
+"""Cleanup handlers specific to each memory backend.
+
+Handler modules are imported on demand (via get_handler_class()) so that running
+a subset of handlers (or none, e.g. `sweep --validate`) doesn't pay for importing
+every backend's dependencies (sqlite3, urllib, ...).
+"""
+from importlib import import_module
+from typing import Any
+
 from .base import CleanupHandler, CleanupError
-from .qdrant import QdrantHandler
-from .claude_mem import ClaudeMemHandler
-from .serena import SerenaHandler
-from .memory_mcp import MemoryMcpHandler
 
 
-# register memory backends' handler classes
-HANDLERS = (
-    ClaudeMemHandler,
-    SerenaHandler,
-    QdrantHandler,
-    MemoryMcpHandler,
-)
+# register memory backends' handler classes: storage name -> (module, class name)
+HANDLER_REGISTRY: dict[str, tuple[str, str]] = {
+    "claude-mem": ("claude_mem", "ClaudeMemHandler"),
+    "serena": ("serena", "SerenaHandler"),
+    "qdrant": ("qdrant", "QdrantHandler"),
+    "memory-mcp": ("memory_mcp", "MemoryMcpHandler"),
+}
+
+# handler class name -> storage name (for lazy attribute access below)
+_CLASS_TO_STORAGE = {class_name: name for name, (_, class_name) in HANDLER_REGISTRY.items()}
+
+
+def normalize_storage_name(name: str) -> str:
+    """Normalize a storage name to its registry form (e.g. claude_mem -> claude-mem)."""
+    return name.replace("_", "-")
+
+
+def get_handler_class(name: str) -> type[CleanupHandler]:
+    """Import and return the handler class registered for a storage name.
+
+    Args:
+        name: Storage name (e.g. "claude-mem" or "claude_mem").
+
+    Raises:
+        KeyError: If no handler is registered for the storage name.
+    """
+    module_name, class_name = HANDLER_REGISTRY[normalize_storage_name(name)]
+    module = import_module(f".{module_name}", __name__)
+    return getattr(module, class_name)
+
+
+def __getattr__(attr: str) -> Any:
+    """Lazily resolve handler classes and HANDLERS on first access."""
+    if attr in _CLASS_TO_STORAGE:
+        return get_handler_class(_CLASS_TO_STORAGE[attr])
+    if attr == "HANDLERS":
+        return tuple(get_handler_class(name) for name in HANDLER_REGISTRY)
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
 
 __all__ = [
@@ -23,4 +58,7 @@ __all__ = [
     "SerenaHandler",
     "MemoryMcpHandler",
     "HANDLERS",
+    "HANDLER_REGISTRY",
+    "get_handler_class",
+    "normalize_storage_name",
 ]
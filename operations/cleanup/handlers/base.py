@@ -2,9 +2,15 @@
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Iterator
 
-from ...config_loader import parse_duration, get_retention
+from ..trash import TrashWriter
+from ...config_loader import (
+    get_cleanup_batch_size,
+    get_retention,
+    get_trash_grace_period,
+    parse_duration,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,14 +28,39 @@ class CleanupError(Exception):
 
 
 class CleanupHandler(ABC):
-    """Abstract base class for storage backend-specific cleanup handlers."""
+    """Abstract base class for storage backend-specific cleanup handlers.
+
+    Handlers implement either:
+      - the list API: get_stale_items() + export_items_to_trash() + delete_items_from_storage(),
+        run over the full stale set at once, or
+      - the streaming API (additionally): iter_stale_batches(), with each batch exported via
+        export_batch_to_trash() then deleted via delete_batch_from_storage() before the next
+        one is fetched, so peak memory is O(batch) rather than O(stale set)
+
+    cleanup() uses the streaming API whenever a handler overrides iter_stale_batches().
+    """
 
     name: str  # e.g. "qdrant", "claude-mem"
+    # set by cancel(), from another thread
+    _cancelled: bool = False
 
     def _return_error_dict(self, e: CleanupError, action: str) -> dict[str, str]: 
         logger.error("%s %s failed: %s", self.name, action, e)
         return {"storage": self.name, "error": str(e)}
 
+    def cancel(self) -> None:
+        """Ask a running cleanup() to stop before its next batch (e.g. once it has timed out).
+
+        Batches already moved to trash stay there; the cleanup returns an error dict. A running
+        wipe() stops once its backup is taken, before it deletes anything.
+        """
+        self._cancelled = True
+
+    def _check_cancelled(self) -> None:
+        """Raise CleanupError if cancel() was called; checked between batches, and before wipes delete."""
+        if self._cancelled:
+            raise CleanupError("cancelled after missing its deadline")
+
     @abstractmethod
     def get_stale_items(self, cutoff: datetime) -> list[dict[str, Any]]:
         """Return items older than cutoff with id/path and metadata."""
@@ -45,6 +76,34 @@ class CleanupHandler(ABC):
         """Delete items from storage, return count of deleted items."""
         pass
 
+    def iter_stale_batches(self, cutoff: datetime, batch_size: int) -> Iterator[list[dict[str, Any]]]:
+        """Yield items older than cutoff in batches of at most batch_size.
+
+        Streaming handlers override this; implementations must tolerate each yielded batch being
+        deleted from storage before the next one is requested.
+
+        The default adapts the list API, yielding all of get_stale_items() as a single batch.
+        """
+        items = self.get_stale_items(cutoff)
+        if items:
+            yield items
+
+    def export_batch_to_trash(self, batch: list[dict[str, Any]], writer: TrashWriter) -> None:
+        """Export one batch of stale items to the run's trash file (one JSON line per item)."""
+        writer.write(batch)
+
+    def delete_batch_from_storage(self, batch: list[dict[str, Any]]) -> int:
+        """Delete one batch of items from storage, return count of deleted items."""
+        return self.delete_items_from_storage(batch)
+
+    def finish_batch_deletes(self) -> None:
+        """Hook run once after the last batch is deleted (e.g. to compact storage)."""
+        pass
+
+    def _is_streaming(self) -> bool:
+        """Whether this handler implements the streaming API (see class docstring)."""
+        return type(self).iter_stale_batches is not CleanupHandler.iter_stale_batches
+
     @abstractmethod
     def _wipe(self, backup: bool) -> dict[str, Any]:
         """
@@ -61,18 +120,38 @@ class CleanupHandler(ABC):
         """
         pass
 
-    def wipe(self, backup: bool = True) -> dict[str, Any]:
+    def _wipe_fast(self, backup: bool) -> dict[str, Any]:
+        """
+        Internal fast wipe: reach the same end state as _wipe() in (near-)constant time, by replacing
+        storage wholesale rather than deleting items one by one, with backups taken the cheapest
+        equivalent way (e.g. a file copy or rename).
+
+        Handlers without a fast path fall back to _wipe().
+
+        Args:
+            backup: If True, back up all data to trash before wiping.
+
+        Returns:
+            Dict with 'storage', 'wiped' count, and optionally 'backup_path'.
+
+        Raises:
+            CleanupError: On any recoverable error.
+        """
+        return self._wipe(backup)
+
+    def wipe(self, backup: bool = True, fast: bool = False) -> dict[str, Any]:
         """Completely erase all data from storage, with error handling.
 
         Args:
             backup: If True, export all data to trash before wiping.
+            fast: If True, replace storage wholesale instead of deleting items (see _wipe_fast()).
 
         Returns:
             Dict with 'storage', 'wiped' count, and optionally 'backup_path'.
             On error, returns dict with 'storage' and 'error'.
         """
         try:
-            return self._wipe(backup)
+            return self._wipe_fast(backup) if fast else self._wipe(backup)
         except CleanupError as e:
             return self._return_error_dict(e, "wipe")
 
@@ -106,6 +185,9 @@ class CleanupHandler(ABC):
                 }
 
             cutoff = self.get_cutoff(retention)
+            if self._is_streaming():
+                return self._cleanup_in_batches(cutoff, retention, dry_run)
+
             items = self.get_stale_items(cutoff)
 
             if not items:
@@ -125,6 +207,7 @@ class CleanupHandler(ABC):
 
             # write *new* files for the deleted items to the trash
             # (to be kept for the specified grace period)
+            self._check_cancelled()
             trash_path = self.export_items_to_trash(items, retention)
 
             count = self.delete_items_from_storage(items)
@@ -136,3 +219,47 @@ class CleanupHandler(ABC):
             }
         except CleanupError as e:
             return self._return_error_dict(e, "cleanup")
+
+    def _cleanup_in_batches(self, cutoff: datetime, retention: str, dry_run: bool) -> dict[str, Any]:
+        """Streaming counterpart of cleanup(): export then delete each batch before fetching the next.
+
+        Returns the same result dicts as the list-based path.
+        """
+        batch_size = get_cleanup_batch_size()
+
+        if dry_run:
+            would_delete = 0
+            preview: list[dict[str, Any]] = []
+            for batch in self.iter_stale_batches(cutoff, batch_size):
+                would_delete += len(batch)
+                preview.extend(batch[:10 - len(preview)])
+
+            if not would_delete:
+                return {"storage": self.name, "deleted": 0, "message": "no expired items"}
+            return {
+                "storage": self.name,
+                "would_delete": would_delete,
+                "dry_run": True,
+                "items": preview,  # show first 10 items that *would have been* deleted
+            }
+
+        deleted = 0
+        # the writer is closed (and its manifest entry written) even if a later batch fails,
+        #   keeping already-deleted batches recoverable from the trash
+        with TrashWriter(self.name, retention, get_trash_grace_period()) as writer:
+            for batch in self.iter_stale_batches(cutoff, batch_size):
+                self._check_cancelled()
+                # write the batch to the trash before deleting it from storage
+                self.export_batch_to_trash(batch, writer)
+                deleted += self.delete_batch_from_storage(batch)
+
+        if not writer.item_count:
+            return {"storage": self.name, "deleted": 0, "message": "no expired items"}
+
+        self.finish_batch_deletes()
+
+        return {
+            "storage": self.name,
+            "deleted": deleted,
+            "trash_path": str(writer.close()),
+        }
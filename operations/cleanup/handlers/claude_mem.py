@@ -1,12 +1,87 @@
 """Claude-mem SQLite cleanup handler."""
+import gzip
 import json
+import logging
+import os
+import shutil
 import sqlite3
+import time
 from datetime import datetime, timezone
-from typing import Any
+from pathlib import Path
+from typing import Any, Iterator
 
 from .base import CleanupHandler, CleanupError
-from ..trash import get_trash_dir, generate_trash_filename, write_manifest
-from ...config_loader import get_storage, get_trash_grace_period
+from ..trash import (
+    ARCHIVE_DB_NAME,
+    ARCHIVE_TRASHED_AT_COLUMN,
+    TrashWriter,
+    archive_timestamp,
+    generate_trash_filename,
+    get_trash_dir,
+    write_manifest,
+)
+from ...config_loader import (
+    get_claude_mem_busy_timeout,
+    get_claude_mem_compress_wipe_backup,
+    get_claude_mem_create_indexes,
+    get_claude_mem_delete_chunk_size,
+    get_claude_mem_incremental_vacuum,
+    get_claude_mem_trash_format,
+    get_claude_mem_vacuum_threshold,
+    get_storage,
+    get_trash_grace_period,
+)
+
+logger = logging.getLogger(__name__)
+
+# rows fetched from SQLite at a time when streaming query results
+FETCH_SIZE = 500
+
+# max bound parameters per statement on SQLite builds older than 3.32
+_MAX_VARIABLES = 999
+
+# pause between delete transactions, giving a claude-mem worker waiting on the write lock
+#   (which polls for it every few milliseconds) a chance to take it
+_DELETE_CHUNK_PAUSE_SECONDS = 0.005
+
+# free pages handed back to the OS per incremental vacuum step (each step is its own transaction)
+_INCREMENTAL_VACUUM_PAGES = 1000
+
+# PRAGMA auto_vacuum value for incremental auto-vacuum
+_AUTO_VACUUM_INCREMENTAL = 2
+
+# pages copied per step of a wipe backup (the source is only read-locked during a step)
+_BACKUP_STEP_PAGES = 1024
+
+# bytes read at a time when (de)compressing a backup
+_COPY_CHUNK_SIZE = 1 << 20
+
+
+def _sql_identifier(name: str) -> str:
+    """Quote a table/column name for use in SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_string(text: str) -> str:
+    """Quote text as an SQL string literal."""
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _shadow_tables(conn: sqlite3.Connection, schema: list[tuple[str, str, str]]) -> set[str]:
+    """Names of the shadow tables backing virtual (e.g. FTS) tables, given the database's schema.
+
+    Read from PRAGMA table_list (SQLite 3.37+); older versions don't report it, so tables named
+    after a virtual table (e.g. notes_fts_data for notes_fts) are taken to be its shadow tables.
+    """
+    table_list = conn.execute("PRAGMA main.table_list").fetchall()
+    if table_list:
+        return {row[1] for row in table_list if row[2] == "shadow"}
+
+    virtual_tables = [name for _, name, sql in schema if sql.upper().startswith("CREATE VIRTUAL TABLE")]
+    return {
+        name for type_, name, _ in schema
+        if type_ == "table" and any(name.startswith(f"{table}_") for table in virtual_tables)
+    }
 
 
 class ClaudeMemHandler(CleanupHandler):
@@ -20,10 +95,32 @@ class ClaudeMemHandler(CleanupHandler):
         #   (previously "sessions")
         return "session_summaries" if entity_type == "session" else "observations"
 
-    def _get_db_connection(self) -> sqlite3.Connection | None:
-        """Get SQLite connection if database exists."""
+    def _entity_type_for_table(self, table_name: str) -> str:
+        """Inverse of _table_name_for_entity_type(), returning the table name for other tables."""
+        for entity_type in self.entity_types:
+            if self._table_name_for_entity_type(entity_type) == table_name:
+                return entity_type
+        return table_name
+
+    def _get_db_connection(self, read_only: bool = False) -> sqlite3.Connection | None:
+        """Get SQLite connection if database exists.
+
+        Connections wait up to claude_mem.busy_timeout seconds for locks held by the claude-mem
+        worker. Read-only connections (used for scans) open the database via a mode=ro URI, so
+        they can never take a write lock.
+        """
         db_path = get_storage("claude_mem")
-        return sqlite3.connect(db_path) if db_path.exists() else None
+        if not db_path.exists():
+            return None
+
+        timeout = get_claude_mem_busy_timeout()
+        if read_only:
+            return sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True, timeout=timeout)
+        return sqlite3.connect(db_path, timeout=timeout)
+
+    def _format_cutoff(self, cutoff: datetime) -> str:
+        """Format staleness cutoff with Z suffix to match stored ISO format produced by toISOString() in claude-mem."""
+        return cutoff.strftime("%Y-%m-%dT%H:%M:%S.") + f"{cutoff.microsecond // 1000:03d}Z"
 
     def get_stale_items(self, cutoff: datetime) -> list[dict[str, Any]]:
         """Retrieve stale sessions and observations (relative to provided cutoff).
@@ -31,14 +128,12 @@ class ClaudeMemHandler(CleanupHandler):
         Raises:
             CleanupError: On database errors (locked, corrupt, etc.).
         """
-        conn = self._get_db_connection()
+        conn = self._get_db_connection(read_only=True)
         if not conn:
             return []
 
         stale_items = []
-
-        # format staleness cutoff with Z suffix to match stored ISO format produced by toISOString() in claude-mem
-        cutoff_str = cutoff.strftime("%Y-%m-%dT%H:%M:%S.") + f"{cutoff.microsecond // 1000:03d}Z"
+        cutoff_str = self._format_cutoff(cutoff)
 
         try:
             cursor = conn.cursor()
@@ -63,12 +158,13 @@ class ClaudeMemHandler(CleanupHandler):
                 # extract list of column names from table
                 columns = [desc[0] for desc in cursor.description]
 
-                for row in cursor.fetchall():
-                    stale_items.append({
-                        "type": entity_type,
-                        "table": table_name,
-                        "data": dict(zip(columns, row)),  # creates tuples of (column name, value)
-                    })
+                while rows := cursor.fetchmany(FETCH_SIZE):
+                    for row in rows:
+                        stale_items.append({
+                            "type": entity_type,
+                            "table": table_name,
+                            "data": dict(zip(columns, row)),  # creates tuples of (column name, value)
+                        })
 
         except sqlite3.Error as e:
             raise CleanupError(f"SQLite query failed: {e}") from e
@@ -77,43 +173,274 @@ class ClaudeMemHandler(CleanupHandler):
 
         return stale_items
 
+    def iter_stale_batches(self, cutoff: datetime, batch_size: int) -> Iterator[list[dict[str, Any]]]:
+        """Yield stale sessions and observations in batches of at most batch_size rows.
+
+        Pages through each table with keyset pagination, so each batch is a short indexed query and
+        no more than one batch of rows is held in memory. Tables with an index on created_at are
+        paged in (created_at, id) order, so the scan ends where the stale range does; others are
+        paged by id, which takes one pass over the whole table (see _stale_scan_plan()). Each batch
+        may be deleted before the next is requested.
+
+        Only each row's id and created_at are read: export_batch_to_trash() streams full rows
+        straight from SQLite into the trash file.
+
+        Raises:
+            CleanupError: On database errors (locked, corrupt, etc.).
+        """
+        conn = self._get_db_connection(read_only=True)
+        if not conn:
+            return
+
+        cutoff_str = self._format_cutoff(cutoff)
+
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            tables = {row[0] for row in cursor.fetchall()}
+
+            for entity_type in self.entity_types:
+
+                table_name = self._table_name_for_entity_type(entity_type)
+                if table_name not in tables:
+                    continue
+
+                by_created_at, _ = self._stale_scan_plan(conn, table_name)
+                order = "created_at, id" if by_created_at else "id"
+
+                last_row = None
+                while True:
+                    if last_row is None:
+                        cursor.execute(
+                            f"SELECT id, created_at FROM {table_name} WHERE created_at < ? ORDER BY {order} LIMIT ?",
+                            (cutoff_str, batch_size)
+                        )
+                    elif by_created_at:
+                        cursor.execute(
+                            f"SELECT id, created_at FROM {table_name} WHERE created_at < ? "
+                            "AND (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?",
+                            (cutoff_str, last_row[1], last_row[0], batch_size)
+                        )
+                    else:
+                        cursor.execute(
+                            f"SELECT id, created_at FROM {table_name} WHERE created_at < ? AND id > ? "
+                            "ORDER BY id LIMIT ?",
+                            (cutoff_str, last_row[0], batch_size)
+                        )
+
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+
+                    batch = [
+                        {"type": entity_type, "table": table_name, "data": {"id": row_id, "created_at": created_at}}
+                        for row_id, created_at in rows
+                    ]
+                    last_row = rows[-1]
+
+                    # end the read transaction so the consumer's deletes aren't blocked by it
+                    conn.commit()
+                    yield batch
+
+                    if len(rows) < batch_size:
+                        break
+
+        except sqlite3.Error as e:
+            raise CleanupError(f"SQLite query failed: {e}") from e
+        finally:
+            conn.close()
+
+    def _stale_scan_plan(self, conn: sqlite3.Connection, table_name: str) -> tuple[bool, str]:
+        """Return whether a table's stale rows can be scanned in created_at order off an index, and the scan's plan.
+
+        Checks EXPLAIN QUERY PLAN for the (created_at, id)-ordered scan: it walks an index if one
+        covers created_at (and no sort is needed). The plan returned (its details, joined) is that
+        of the scan cleanup runs: the id-ordered one otherwise.
+        """
+        table = _sql_identifier(table_name)
+        plan = [
+            row[3] for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id, created_at FROM {table} WHERE created_at < ? "
+                "ORDER BY created_at, id LIMIT ?", ("", 1)
+            )
+        ]
+        by_created_at = (
+            any(detail.startswith("SEARCH") and "created_at" in detail for detail in plan)
+            and not any("TEMP B-TREE" in detail for detail in plan)
+        )
+        if not by_created_at:
+            plan = [
+                row[3] for row in conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id, created_at FROM {table} WHERE created_at < ? AND id > ? "
+                    "ORDER BY id LIMIT ?", ("", "", 1)
+                )
+            ]
+        return by_created_at, "; ".join(plan)
+
+    def _check_created_at_indexes(self, create: bool) -> list[dict[str, Any]]:
+        """Check each table's stale scan plan, creating a covering (created_at, id) index where it has none.
+
+        Indexes are only created if `create` is set and claude_mem.create_indexes opts in (claude-mem
+        owns the database schema). Failures aren't fatal: scans still work (just more slowly)
+        without the index.
+
+        Returns:
+            A {table, plan, index_created} dict per table (reported in verbose output).
+        """
+        create = create and get_claude_mem_create_indexes()
+        conn = self._get_db_connection(read_only=not create)
+        if not conn:
+            return []
+
+        plans = []
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+            for entity_type in self.entity_types:
+                table_name = self._table_name_for_entity_type(entity_type)
+                if table_name not in tables:
+                    continue
+
+                by_created_at, plan = self._stale_scan_plan(conn, table_name)
+                index_created = False
+                if not by_created_at and create:
+                    index_name = _sql_identifier(f"idx_{table_name}_created_at_id")
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} "
+                                 f"ON {_sql_identifier(table_name)} (created_at, id)")
+                    conn.commit()
+                    index_created = True
+                    _, plan = self._stale_scan_plan(conn, table_name)
+
+                plans.append({"table": table_name, "plan": plan, "index_created": index_created})
+        except sqlite3.Error as e:
+            logger.warning("claude-mem: could not check created_at indexes: %s", e)
+        finally:
+            conn.close()
+
+        return plans
+
     def export_items_to_trash(self, items: list[dict[str, Any]], retention: str) -> str:
-        """Export items to a new JSON file in trash directory."""
-        trash_dir = get_trash_dir(self.name)
+        """Export items to a new JSONL file in trash directory (one {type, table, data} document per line)."""
+        with TrashWriter(self.name, retention, get_trash_grace_period()) as writer:
+            writer.write(items)
+        return str(writer.close())
 
-        # triage items to export by entity type, preserving only their "data" field
-        items_by_entity_type = {}
-        for entity_type in self.entity_types:
-            items_by_entity_type[entity_type] = [item["data"] for item in items if item["type"] == entity_type]
-
-        trash_file_json = {
-            "exported_at": datetime.now(timezone.utc).isoformat(),
-            "sessions": items_by_entity_type["session"],
-            "observations": items_by_entity_type["observation"],
-            "counts": {
-                "sessions": len(items_by_entity_type["session"]),
-                "observations": len(items_by_entity_type["observation"]),
-            },
-        }
-
-        # write deleted items' data to new file in the trash folder for claude-mem
-        filename = generate_trash_filename(len(items), "json")
-        trash_path = trash_dir / filename
-        with open(trash_path, "w") as f:
-            json.dump(trash_file_json, f, indent=2, default=str)
-
-        write_manifest(trash_dir, 
-                       self.name, 
-                       len(items), 
-                       retention,
-                       get_trash_grace_period(),
-                       files=[trash_path])
-
-        return str(trash_path)
+    def export_batch_to_trash(self, batch: list[dict[str, Any]], writer: TrashWriter) -> None:
+        """Stream one batch's full rows from SQLite into the trash file.
+
+        Raises:
+            CleanupError: On database errors (locked, corrupt, etc.).
+        """
+        conn = self._get_db_connection(read_only=True)
+        if not conn:
+            return
+
+        try:
+            for entity_type in self.entity_types:
+                ids = [item["data"]["id"] for item in batch if item["type"] == entity_type]
+                if ids:
+                    table_name = self._table_name_for_entity_type(entity_type)
+                    writer.write_json_lines(self._iter_rows_as_json(conn, table_name, ids))
+        except sqlite3.Error as e:
+            raise CleanupError(f"SQLite query failed: {e}") from e
+        finally:
+            conn.close()
+
+    def _iter_rows_as_json(self, conn: sqlite3.Connection, table_name: str, ids: list[Any]) -> Iterator[str]:
+        """Yield the rows of a table with the given ids as {type, table, data} JSON documents.
+
+        The JSON is built SQL-side with SQLite's JSON1 functions and read FETCH_SIZE rows at a
+        time, so rows never become Python dicts. Builds without JSON1 (or tables with more columns
+        than json_object() accepts) fall back to serializing rows in Python.
+        """
+        entity_type = self._entity_type_for_table(table_name)
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({_sql_identifier(table_name)})")]
+
+        try:
+            yield from self._iter_rows_as_json_sql(conn, table_name, entity_type, columns, ids)
+        except sqlite3.OperationalError as e:
+            # raised when the statement is prepared, i.e. before any row was yielded
+            if "json" not in str(e) and "too many arguments" not in str(e):
+                raise
+            yield from self._iter_rows_as_json_python(conn, table_name, entity_type, columns, ids)
+
+    def _iter_rows_as_json_sql(self, conn: sqlite3.Connection, table_name: str, entity_type: str,
+                               columns: list[str], ids: list[Any]) -> Iterator[str]:
+        # JSON can't hold BLOBs: export them as hex strings
+        fields = ", ".join(
+            f"{_sql_string(column)}, "
+            f"CASE WHEN typeof({_sql_identifier(column)}) = 'blob' THEN hex({_sql_identifier(column)}) "
+            f"ELSE {_sql_identifier(column)} END"
+            for column in columns
+        )
+        # ids are passed as a single JSON array parameter, sidestepping SQLite's bound variable limit
+        query = (
+            f"SELECT json_object('type', ?, 'table', ?, 'data', json_object({fields})) "
+            f"FROM {_sql_identifier(table_name)} WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id"
+        )
+
+        cursor = conn.execute(query, (entity_type, table_name, json.dumps(ids)))
+        while rows := cursor.fetchmany(FETCH_SIZE):
+            for (document,) in rows:
+                yield document
+
+    def _iter_rows_as_json_python(self, conn: sqlite3.Connection, table_name: str, entity_type: str,
+                                  columns: list[str], ids: list[Any]) -> Iterator[str]:
+        for i in range(0, len(ids), _MAX_VARIABLES):
+            chunk = ids[i:i + _MAX_VARIABLES]
+            cursor = conn.execute(
+                f"SELECT * FROM {_sql_identifier(table_name)} WHERE id IN ({','.join('?' * len(chunk))}) ORDER BY id",
+                chunk
+            )
+            while rows := cursor.fetchmany(FETCH_SIZE):
+                for row in rows:
+                    data = {
+                        column: value.hex().upper() if isinstance(value, bytes) else value
+                        for column, value in zip(columns, row)
+                    }
+                    yield json.dumps({"type": entity_type, "table": table_name, "data": data}, default=str)
 
     def delete_items_from_storage(self, items: list[dict[str, Any]]) -> int:
         """Delete items from SQLite, then vacuum the database (to make the freed space available to the OS).
 
+        Raises:
+            CleanupError: On database errors (locked, corrupt, etc.).
+        """
+        return self._delete_items(items, vacuum=True)
+
+    def delete_batch_from_storage(self, batch: list[dict[str, Any]]) -> int:
+        """Delete one batch of items from SQLite (vacuuming is deferred to finish_batch_deletes()).
+
+        Raises:
+            CleanupError: On database errors (locked, corrupt, etc.).
+        """
+        return self._delete_items(batch, vacuum=False)
+
+    def finish_batch_deletes(self) -> None:
+        """Reclaim free space (see _reclaim_space()) once all batches are deleted.
+
+        Raises:
+            CleanupError: On database errors (locked, corrupt, etc.).
+        """
+        conn = self._get_db_connection()
+        if not conn:
+            return
+
+        conn.isolation_level = None
+        try:
+            self._reclaim_space(conn)
+        except sqlite3.Error as e:
+            raise CleanupError(f"SQLite vacuum failed: {e}") from e
+        finally:
+            conn.close()
+
+    def _delete_items(self, items: list[dict[str, Any]], vacuum: bool) -> int:
+        """Delete items from their tables, optionally reclaiming free space afterwards.
+
+        Rows are deleted in transactions of at most claude_mem.delete_chunk_size rows, pausing
+        between them, so the write lock is never held for long while the claude-mem worker may be
+        waiting to record observations.
+
         Raises:
             CleanupError: On database errors (locked, corrupt, etc.).
         """
@@ -121,99 +448,523 @@ class ClaudeMemHandler(CleanupHandler):
         if not conn:
             return 0
 
+        # manage transactions explicitly (see below)
+        conn.isolation_level = None
+        chunk_size = min(get_claude_mem_delete_chunk_size(), _MAX_VARIABLES)
+
         deleted = 0
         try:
-            cursor = conn.cursor()
+            self._apply_chunked_write_settings(conn)
 
             # for each entity type, retrieve ids corresponding to items to delete
-            #   then delete them from that entity's table
+            #   then delete them from that entity's table, one chunk per transaction
+            chunks: list[tuple[str, list[Any]]] = []
             for entity_type in self.entity_types:
-                entities_to_delete = [item for item in items if item["type"] == entity_type]
-                if not entities_to_delete:
-                    continue
+                ids = [item["data"].get("id") for item in items
+                       if item["type"] == entity_type and item["data"].get("id")]
+                table_name = self._table_name_for_entity_type(entity_type)
+                chunks.extend((table_name, ids[i:i + chunk_size]) for i in range(0, len(ids), chunk_size))
 
-                ids = [entity["data"].get("id") for entity in entities_to_delete if entity["data"].get("id")]
-                if not ids:
-                    continue
+            for index, (table_name, chunk) in enumerate(chunks):
+                if index:
+                    time.sleep(_DELETE_CHUNK_PAUSE_SECONDS)
 
-                placeholders = ",".join("?" * len(ids))
-                table_name = self._table_name_for_entity_type(entity_type)
-                cursor.execute(f"DELETE FROM {table_name} WHERE id IN ({placeholders})", ids)
+                # take the write lock up front (waiting up to busy_timeout for it), rather than
+                #   failing to upgrade a read lock mid-transaction
+                conn.execute("BEGIN IMMEDIATE")
+                cursor = conn.execute(f"DELETE FROM {table_name} WHERE id IN ({','.join('?' * len(chunk))})", chunk)
                 deleted += cursor.rowcount
+                conn.execute("COMMIT")
 
-            conn.commit()
-
-            # vacuum to immediately hand back freed space to OS
-            cursor.execute("VACUUM")
+            if vacuum:
+                self._reclaim_space(conn)
 
         except sqlite3.Error as e:
+            # closing the connection rolls back the failed chunk (earlier chunks stay deleted)
             raise CleanupError(f"SQLite delete failed: {e}") from e
         finally:
             conn.close()
 
         return deleted
 
+    def _cleanup_in_batches(self, cutoff: datetime, retention: str, dry_run: bool) -> dict[str, Any]:
+        """Streaming cleanup, or in archive mode (claude_mem.trash_format: archive) see _archive_stale_rows().
+
+        Each table's stale scan is checked first (see _check_created_at_indexes()), and its query
+        plan added to the result.
+        """
+        query_plans = self._check_created_at_indexes(create=not dry_run)
+
+        if dry_run or get_claude_mem_trash_format() != "archive":
+            result = super()._cleanup_in_batches(cutoff, retention, dry_run)
+        else:
+            result = self._archive_stale_rows(cutoff, retention)
+
+        if query_plans:
+            result["query_plans"] = query_plans
+        return result
+
+    def _archive_stale_rows(self, cutoff: datetime, retention: str) -> dict[str, Any]:
+        """Move stale rows into the archive database in claude-mem's trash, entirely SQL-side.
+
+        The archive is ATTACHed to the claude-mem connection, then each chunk of up to
+        claude_mem.delete_chunk_size stale rows is copied (`INSERT INTO archive.<table> SELECT ...`)
+        and deleted in one short transaction, pausing between them like _delete_items(), so rows
+        never become Python objects. Archived rows record when they were trashed: grace-period
+        expiry is a ranged DELETE on that column (see trash.expire_archive_rows()), and
+        restore_archive() is the inverse INSERT ... SELECT.
+
+        Raises:
+            CleanupError: On database errors (locked, corrupt, etc.).
+        """
+        conn = self._get_db_connection()
+        if not conn:
+            return {"storage": self.name, "deleted": 0, "message": "no expired items"}
+
+        # manage transactions explicitly (as in _delete_items())
+        conn.isolation_level = None
+        chunk_size = get_claude_mem_delete_chunk_size()
+        cutoff_str = self._format_cutoff(cutoff)
+
+        trash_dir = get_trash_dir(self.name)
+        archive_path = trash_dir / ARCHIVE_DB_NAME
+        trashed_at = archive_timestamp(datetime.now(timezone.utc))
+
+        archived = 0
+        try:
+            self._apply_chunked_write_settings(conn)
+            self._attach_archive(conn, archive_path)
+
+            tables = {row[0] for row in conn.execute("SELECT name FROM main.sqlite_master WHERE type='table'")}
+            for entity_type in self.entity_types:
+                table_name = self._table_name_for_entity_type(entity_type)
+                if table_name not in tables:
+                    continue
+
+                table = _sql_identifier(table_name)
+                columns = ", ".join(_sql_identifier(column) for column in self._sync_archive_table(conn, table_name))
+                # ordered (by created_at if indexed), so both statements of a transaction pick the same rows
+                by_created_at, _ = self._stale_scan_plan(conn, table_name)
+                order = "created_at, id" if by_created_at else "id"
+                stale_ids = f"SELECT id FROM main.{table} WHERE created_at < ? ORDER BY {order} LIMIT ?"
+
+                while True:
+                    self._check_cancelled()
+                    if archived:
+                        time.sleep(_DELETE_CHUNK_PAUSE_SECONDS)
+
+                    conn.execute("BEGIN IMMEDIATE")
+                    cursor = conn.execute(
+                        f"INSERT INTO archive.{table} ({columns}, {ARCHIVE_TRASHED_AT_COLUMN}) "
+                        f"SELECT {columns}, ? FROM main.{table} WHERE id IN ({stale_ids})",
+                        (trashed_at, cutoff_str, chunk_size)
+                    )
+                    moved = cursor.rowcount
+                    conn.execute(f"DELETE FROM main.{table} WHERE id IN ({stale_ids})", (cutoff_str, chunk_size))
+                    conn.execute("COMMIT")
+
+                    archived += moved
+                    if moved < chunk_size:
+                        break
+
+            if archived:
+                self._reclaim_space(conn)
+
+        except sqlite3.Error as e:
+            # closing the connection rolls back the failed chunk (earlier chunks stay archived)
+            raise CleanupError(f"SQLite archive failed: {e}") from e
+        finally:
+            conn.close()
+
+            # recorded even if a later chunk failed, since earlier chunks were already moved
+            if archived:
+                write_manifest(trash_dir, self.name, archived, retention, get_trash_grace_period(),
+                               details={"archive": str(archive_path), "archived_at": trashed_at})
+
+        if not archived:
+            return {"storage": self.name, "deleted": 0, "message": "no expired items"}
+        return {"storage": self.name, "deleted": archived, "trash_path": str(archive_path)}
+
+    def _attach_archive(self, conn: sqlite3.Connection, archive_path: Path) -> None:
+        """Attach the archive database (created if missing) to a connection as schema "archive"."""
+        conn.execute("ATTACH DATABASE ? AS archive", (str(archive_path),))
+
+        # lets expiry hand freed pages back to the OS (only takes effect before the first table is created)
+        conn.execute("PRAGMA archive.auto_vacuum = INCREMENTAL")
+
+    def _sync_archive_table(self, conn: sqlite3.Connection, table_name: str) -> list[str]:
+        """Create (or add any new columns to) a table's archive counterpart, returning the table's columns.
+
+        Archive tables copy no constraints, so a row can be archived again after being restored.
+        """
+        table = _sql_identifier(table_name)
+        columns = [row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")]
+        archived_columns = {row[1] for row in conn.execute(f"PRAGMA archive.table_info({table})")}
+
+        if not archived_columns:
+            conn.execute(
+                f"CREATE TABLE archive.{table} AS "
+                f"SELECT *, '' AS {ARCHIVE_TRASHED_AT_COLUMN} FROM main.{table} WHERE 0"
+            )
+            conn.execute(
+                f"CREATE INDEX archive.{_sql_identifier(f'{table_name}{ARCHIVE_TRASHED_AT_COLUMN}')} "
+                f"ON {table} ({ARCHIVE_TRASHED_AT_COLUMN})"
+            )
+        else:
+            # claude-mem may have added columns since the table was archived
+            for column in columns:
+                if column not in archived_columns:
+                    conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {_sql_identifier(column)}")
+
+        return columns
+
+    def restore_archive(self, since: datetime | None = None) -> dict[str, Any]:
+        """Move rows from the archive database back into claude-mem (the inverse of _archive_stale_rows()).
+
+        All rows are restored in one transaction: if any can't be (e.g. its id was reused since),
+        none are.
+
+        Args:
+            since: Only restore rows trashed at or after this time (default: every archived row).
+
+        Returns:
+            Dict with the count of restored rows, or an error.
+        """
+        archive_path = get_trash_dir(self.name) / ARCHIVE_DB_NAME
+        if not archive_path.exists():
+            return {"storage": self.name, "error": f"No archive found at {archive_path}"}
+
+        conn = self._get_db_connection()
+        if not conn:
+            return {"storage": self.name, "error": "database does not exist"}
+
+        conn.isolation_level = None
+        where, params = (f" WHERE {ARCHIVE_TRASHED_AT_COLUMN} >= ?", (archive_timestamp(since),)) if since else ("", ())
+
+        restored = 0
+        try:
+            conn.execute("ATTACH DATABASE ? AS archive", (str(archive_path),))
+            conn.execute("BEGIN IMMEDIATE")
+
+            archive_tables = conn.execute("SELECT name FROM archive.sqlite_master WHERE type='table'").fetchall()
+            for (table_name,) in archive_tables:
+                table = _sql_identifier(table_name)
+                main_columns = {row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")}
+                if not main_columns:
+                    continue
+
+                columns = ", ".join(
+                    _sql_identifier(row[1]) for row in conn.execute(f"PRAGMA archive.table_info({table})")
+                    if row[1] in main_columns
+                )
+                cursor = conn.execute(
+                    f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM archive.{table}{where}", params
+                )
+                restored += cursor.rowcount
+                conn.execute(f"DELETE FROM archive.{table}{where}", params)
+
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            return {"storage": self.name, "error": f"SQLite restore failed: {e}"}
+        finally:
+            conn.close()
+
+        return {"storage": self.name, "restored": restored}
+
+    def _apply_chunked_write_settings(self, conn: sqlite3.Connection) -> None:
+        """Tune a connection for many small write transactions.
+
+        In WAL mode, commits then skip their fsync (the WAL is synced at checkpoints instead): a
+        power loss can at worst undo the latest deletes, whose rows are already in trash.
+        """
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if str(journal_mode).lower() == "wal":
+            conn.execute("PRAGMA synchronous = NORMAL")
+
+    def _reclaim_space(self, conn: sqlite3.Connection) -> None:
+        """Hand free pages back to the OS once they make up claude_mem.vacuum_threshold of the database.
+
+        Below the threshold, free pages are left for SQLite to reuse for new rows. Past it,
+        databases in incremental auto-vacuum mode are shrunk by PRAGMA incremental_vacuum in short
+        transactions (pausing between them, like deletes); others need a full VACUUM, which
+        rewrites the whole database under an exclusive lock. With claude_mem.incremental_vacuum
+        set, a database not yet in that mode is switched to it (by one full VACUUM) regardless of
+        the threshold. The WAL, which vacuuming grows, is then checkpointed and truncated.
+
+        Expects a connection in autocommit mode (isolation_level=None).
+
+        Raises:
+            sqlite3.Error: On database errors.
+        """
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+        if get_claude_mem_incremental_vacuum() and auto_vacuum != _AUTO_VACUUM_INCREMENTAL:
+            # a database's auto_vacuum mode only changes when it is rebuilt by VACUUM
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not page_count or free_pages / page_count < get_claude_mem_vacuum_threshold():
+                return
+
+            if auto_vacuum == _AUTO_VACUUM_INCREMENTAL:
+                while free_pages:
+                    # the pragma frees one page per step, so its (empty) result must be fetched
+                    conn.execute(f"PRAGMA incremental_vacuum({_INCREMENTAL_VACUUM_PAGES})").fetchall()
+                    remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                    if remaining >= free_pages:
+                        break
+                    free_pages = remaining
+                    if free_pages:
+                        time.sleep(_DELETE_CHUNK_PAUSE_SECONDS)
+            else:
+                conn.execute("VACUUM")
+
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if str(journal_mode).lower() == "wal":
+            # a reader still using the WAL keeps it from being truncated: it is then reset at a later checkpoint
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
     def _wipe(self, backup: bool) -> dict[str, Any]:
         """Completely erase all data from claude-mem database.
 
+        Backups are page-level copies of the whole database (see _backup_database()), restored by
+        restore_backup().
+
         Raises:
-            CleanupError: On database errors (locked, corrupt, etc.).
+            CleanupError: On database errors (locked, corrupt, etc.) or failures to write the backup.
         """
         conn = self._get_db_connection()
         if not conn:
             return {"storage": self.name, "wiped": 0, "message": "database does not exist"}
 
+        backup_path = None
         try:
             cursor = conn.cursor()
 
-            # retrieve all tables
+            # retrieve all tables (except SQLite's internal ones)
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in cursor.fetchall()]
+            tables = [row[0] for row in cursor.fetchall() if not row[0].startswith("sqlite_")]
 
-            # survey items in database:
-            #   - determine total count of items
-            #   - if backup requested, save them for subsequent re-export to backup location
+            # determine total count of items
             total_count = 0
-            items_to_back_up = []
             for table in tables:
-                if table.startswith("sqlite_"):
-                    continue
                 cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count_of_entity_type = cursor.fetchone()[0]
-                total_count += count_of_entity_type
-
-                if backup and count_of_entity_type > 0:
-                    cursor.execute(f"SELECT * FROM {table}")
-                    columns = [desc[0] for desc in cursor.description]
-                    for row in cursor.fetchall():
-                        items_to_back_up.append({
-                            "type": table,
-                            "table": table,
-                            "data": dict(zip(columns, row)),
-                        })
+                total_count += cursor.fetchone()[0]
 
             # backup data if requested
-            backup_path = None
-            if backup and items_to_back_up:
-                backup_path = self.export_items_to_trash(items_to_back_up, "wipe")
+            if backup and total_count:
+                backup_path = str(self._backup_database(conn, total_count))
+            self._check_cancelled()
 
-            # delete all data in all tables (except SQLite's internal ones)
+            # delete all data in all tables
             for table in tables:
-                if table.startswith("sqlite_"):
-                    continue
                 cursor.execute(f"DELETE FROM {table}")
 
             conn.commit()
 
-            # vacuum to immediately hand back freed space to OS
-            cursor.execute("VACUUM")
+            conn.isolation_level = None
+            self._reclaim_space(conn)
+
+        except sqlite3.Error as e:
+            raise CleanupError(f"SQLite wipe failed: {e}") from e
+        except OSError as e:
+            raise CleanupError(f"Failed to write claude-mem backup: {e}") from e
+        finally:
+            conn.close()
+
+        result: dict[str, Any] = {"storage": self.name, "wiped": total_count}
+        if backup_path:
+            result["backup_path"] = backup_path
+        return result
+
+    def _backup_database(self, conn: sqlite3.Connection, item_count: int, pause: bool = True) -> Path:
+        """Copy the database into trash with SQLite's online backup API, returning the backup's path.
+
+        Pages are copied _BACKUP_STEP_PAGES at a time, pausing between steps (unless pause is
+        False, e.g. while the caller holds the write lock anyway) so the claude-mem worker can
+        take its locks in between. The copy is gzip-compressed if
+        claude_mem.compress_wipe_backup is set, and only recorded in the manifest once complete.
+
+        Raises:
+            sqlite3.Error: On database errors.
+            OSError: On failures to write the backup.
+        """
+        trash_dir = get_trash_dir(self.name)
+        backup_path = trash_dir / generate_trash_filename(item_count, "db")
+        partial_path = backup_path.with_name(backup_path.name + ".partial")
+
+        def pause_between_steps(status: int, remaining: int, total: int) -> None:
+            if remaining:
+                time.sleep(_DELETE_CHUNK_PAUSE_SECONDS)
+
+        try:
+            target = sqlite3.connect(partial_path)
+            try:
+                conn.backup(target, pages=_BACKUP_STEP_PAGES if pause else -1,
+                            progress=pause_between_steps if pause else None)
+            finally:
+                target.close()
+
+            if get_claude_mem_compress_wipe_backup():
+                backup_path = backup_path.with_name(backup_path.name + ".gz")
+                with open(partial_path, "rb") as src, gzip.open(backup_path, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, _COPY_CHUNK_SIZE)
+            else:
+                os.replace(partial_path, backup_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
+        write_manifest(trash_dir, self.name, item_count, "wipe", get_trash_grace_period(), files=[backup_path])
+        return backup_path
+
+    def restore_backup(self, backup_path: Path | None = None) -> dict[str, Any]:
+        """Replace the database with a wipe's backup (a page-level copy, or a fast wipe's file).
+
+        The backup is copied (decompressed if needed) next to the database, then swapped in
+        atomically: rows written since the wipe are lost. Processes holding the database open keep
+        seeing the old one until they reopen it.
+
+        Args:
+            backup_path: Backup file to restore (default: the latest one in claude-mem's trash).
+
+        Returns:
+            Dict with the restored backup's path, or an error.
+        """
+        db_path = get_storage("claude_mem")
+        restore_path = db_path.with_name(db_path.name + ".restore")
+        try:
+            if backup_path is None:
+                backup_path = latest_wipe_backup()
+                if backup_path is None:
+                    raise CleanupError(f"No backup found in {get_trash_dir(self.name)}")
+
+            opener = gzip.open if backup_path.suffix == ".gz" else open
+            with opener(backup_path, "rb") as src, open(restore_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, _COPY_CHUNK_SIZE)
+
+            # drop the old database's WAL and shared-memory index first, so they're never applied to the backup
+            for suffix in ("-wal", "-shm"):
+                db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+            os.replace(restore_path, db_path)
+
+            return {"storage": self.name, "restored": str(backup_path)}
+        except CleanupError as e:
+            return {"storage": self.name, "error": str(e)}
+        except OSError as e:
+            return {"storage": self.name, "error": f"Cannot restore backup: {e}"}
+        finally:
+            restore_path.unlink(missing_ok=True)
+
+    def _wipe_fast(self, backup: bool) -> dict[str, Any]:
+        """Erase all claude-mem data by swapping in an empty database with the same schema.
+
+        The old database's write lock is held (BEGIN IMMEDIATE) from reading its schema until
+        after the swap, so no row can be committed in between and lost. Its WAL (if any) is
+        checkpointed just before, since a checkpoint can't run inside a transaction. The backup
+        (if requested) is a page-level copy taken under that lock (see _backup_database()), WAL
+        contents included, and the old database is then atomically replaced by the empty one.
+        Processes holding the old database open keep seeing it until they reopen it.
+
+        Raises:
+            CleanupError: On database or file system errors.
+        """
+        db_path = get_storage("claude_mem")
+        conn = self._get_db_connection()
+        if not conn:
+            return {"storage": self.name, "wiped": 0, "message": "database does not exist"}
+
+        # manage transactions explicitly (as in _delete_items())
+        conn.isolation_level = None
+        empty_path = db_path.with_name(db_path.name + ".wipe")
+        backup_path = None
+        try:
+            # fold the WAL (if any) into the main file first, keeping what's left for the swap small
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            conn.execute("BEGIN IMMEDIATE")
+
+            schema = conn.execute(
+                "SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY rowid"
+            ).fetchall()
+            pragmas = {
+                pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+                for pragma in ("page_size", "auto_vacuum", "user_version", "application_id", "journal_mode")
+            }
+
+            shadow_tables = _shadow_tables(conn, schema)
 
+            # count items the same way _wipe() does
+            total_count = 0
+            for type_, name, _ in schema:
+                if type_ == "table" and not name.startswith("sqlite_"):
+                    total_count += conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+
+            self._create_empty_copy(empty_path, schema, pragmas, shadow_tables)
+
+            if backup:
+                # read through another connection: one inside a transaction can't be a backup source
+                reader = sqlite3.connect(db_path)
+                try:
+                    backup_path = str(self._backup_database(reader, total_count, pause=False))
+                finally:
+                    reader.close()
+            self._check_cancelled()
+
+            os.replace(empty_path, db_path)
         except sqlite3.Error as e:
             raise CleanupError(f"SQLite wipe failed: {e}") from e
+        except OSError as e:
+            raise CleanupError(f"Failed to replace claude-mem database: {e}") from e
         finally:
+            # releases the write lock (rolling back the read-only transaction)
             conn.close()
+            empty_path.unlink(missing_ok=True)
+
+        try:
+            # the old database's WAL and shared-memory index (its rows are in the backup, if any)
+            for suffix in ("-wal", "-shm"):
+                db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+        except OSError as e:
+            raise CleanupError(f"Failed to replace claude-mem database: {e}") from e
 
         result: dict[str, Any] = {"storage": self.name, "wiped": total_count}
         if backup_path:
             result["backup_path"] = backup_path
         return result
+
+    def _create_empty_copy(self, path: Path, schema: list[tuple[str, str, str]], pragmas: dict[str, Any],
+                           shadow_tables: set[str]) -> None:
+        """Create an empty database at path from another database's schema and settings.
+
+        Tables are created before indexes, triggers and views. Shadow tables backing virtual (e.g.
+        FTS) tables are skipped, since creating the virtual table creates them too.
+        """
+        path.unlink(missing_ok=True)
+
+        conn = sqlite3.connect(path)
+        try:
+            # page size and auto-vacuum mode only take effect before the first table is created
+            conn.execute(f"PRAGMA page_size = {int(pragmas['page_size'])}")
+            conn.execute(f"PRAGMA auto_vacuum = {int(pragmas['auto_vacuum'])}")
+
+            for type_, name, sql in sorted(schema, key=lambda entry: entry[0] != "table"):
+                if name.startswith("sqlite_") or (type_ == "table" and name in shadow_tables):
+                    continue
+                conn.execute(sql)
+
+            conn.execute(f"PRAGMA user_version = {int(pragmas['user_version'])}")
+            conn.execute(f"PRAGMA application_id = {int(pragmas['application_id'])}")
+            conn.commit()
+
+            if str(pragmas["journal_mode"]).lower() == "wal":
+                conn.execute("PRAGMA journal_mode = WAL")
+        finally:
+            conn.close()
+
+
+def latest_wipe_backup() -> Path | None:
+    """Return the most recent claude-mem wipe backup saved to trash, or None if there is none."""
+    trash_dir = get_trash_dir(ClaudeMemHandler.name)
+    backups = sorted([*trash_dir.glob("*-items.db"), *trash_dir.glob("*-items.db.gz")], key=lambda path: path.name)
+    return backups[-1] if backups else None
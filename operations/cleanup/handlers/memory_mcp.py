@@ -1,12 +1,91 @@
 """Memory MCP JSONL cleanup handler."""
 import json
+import mmap
+import os
+import re
+import shutil
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
 
 from .base import CleanupHandler, CleanupError
-from ..trash import get_trash_dir, generate_trash_filename, write_manifest
-from ...config_loader import get_storage, get_trash_grace_period
+from ..trash import TrashWriter, get_trash_dir, generate_trash_filename, link_into_trash, write_manifest
+from ...config_loader import get_cleanup_batch_size, get_memory_mcp_compact, get_storage, get_trash_grace_period
+
+# a created_at key, with its value if that's a plain string (no escape sequences): lines whose every
+#   match has a recent plain value can't be stale, so they're never decoded (keys are assumed to be
+#   written unescaped, as JSON encoders do)
+# group 1 is set for UTC timestamps (as written by toISOString()), holding them up to the seconds, which
+#   compare against the cutoff's as bytes; group 2 is set for any other plain string
+_CREATED_AT = re.compile(
+    rb'"created_at"(?:[ \t]*:[ \t]*(?:"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.\d+)?Z"|"([^"\\\n]*)"))?'
+)
+
+# bytes copied at a time from the mapped file into its rewritten copy
+_COPY_CHUNK = 1 << 20
+
+
+def _parse_line(line: bytes) -> dict[str, Any] | None:
+    """Parse a JSONL line's entity (None for blank or malformed lines, or ones that aren't objects)."""
+    if not line.strip():
+        return None
+    try:
+        entity = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None  # skip malformed lines
+    return entity if isinstance(entity, dict) else None
+
+
+class _Edit(NamedTuple):
+    """A change cleanup makes to one line of the JSONL file: moving it to trash, or rewriting it."""
+    start: int
+    end: int  # past the newline
+    replacement: bytes | None = None  # None: moved to trash
+    cascaded: bool = False  # a relation to or from a removed entity
+    dropped_observations: int = 0
+
+
+def _dedupe(values: list[Any]) -> list[Any]:
+    """Drop repeated values from a list, keeping the first of each (in order)."""
+    try:
+        if len(set(values)) == len(values):
+            return values
+    except TypeError:
+        pass  # unhashable (e.g. object) values: compared by their JSON below
+    seen: set[tuple[bool, str]] = set()
+    unique = []
+    for value in values:
+        key = (True, value) if isinstance(value, str) else (False, json.dumps(value, sort_keys=True))
+        if key not in seen:
+            seen.add(key)
+            unique.append(value)
+    return unique
+
+
+def _line_ending(line: bytes) -> bytes:
+    return line[len(line.rstrip(b"\r\n")):]
+
+
+def _iter_chunks(buf: bytes | mmap.mmap, start: int, end: int) -> Iterator[bytes]:
+    """Yield buf[start:end] in chunks of at most _COPY_CHUNK bytes."""
+    for offset in range(start, end, _COPY_CHUNK):
+        yield buf[offset:min(offset + _COPY_CHUNK, end)]
+
+
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory's entries (e.g. a rename into it) to disk, where the platform allows it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # not supported for directories on some platforms/filesystems
+    finally:
+        os.close(fd)
 
 
 class MemoryMcpHandler(CleanupHandler):
@@ -18,79 +97,377 @@ class MemoryMcpHandler(CleanupHandler):
         """Get the Memory MCP JSONL file path."""
         return get_storage("memory_mcp")
 
-    def _read_entities(self) -> list[dict[str, Any]]:
-        """Read all entities from JSONL file.
+    def _iter_lines(self) -> Iterator[tuple[bytes, dict[str, Any] | None]]:
+        """Stream the JSONL file, yielding each raw line with its parsed entity (None for blank or
+        malformed lines).
 
         Raises:
-            CleanupError: On file I/O errors.
+            OSError: On file I/O errors.
+        """
+        file_path = self._get_file_path()
+        if not file_path.exists():
+            return
+
+        with open(file_path, "rb") as f:
+            for line in f:
+                yield line, _parse_line(line)
+
+    @contextmanager
+    def _mapped_file(self) -> Iterator[bytes | mmap.mmap]:
+        """Memory-map the JSONL file read-only (an empty buffer if it's missing or empty).
+
+        Memory MCP saves by truncating and rewriting the file in place, and reading a mapped page
+        past the file's new end kills the process with SIGBUS (which Python can't catch). It takes
+        no lock to wait on, so the file's size and mtime are compared before and after mapping it
+        instead: if they differ (i.e. it's being written), it's read into memory instead. A save
+        that starts after the mapping is still a hazard, so Memory MCP should be stopped first.
+
+        Raises:
+            OSError: On file I/O errors.
         """
         file_path = self._get_file_path()
         if not file_path.exists():
-            return []
+            yield b""
+            return
+
+        with open(file_path, "rb") as f:
+            before = os.fstat(f.fileno())
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                mapped = None  # empty files can't be mapped
+            after = os.fstat(f.fileno())
+
+            if (before.st_size, before.st_mtime_ns) != (after.st_size, after.st_mtime_ns) or (
+                mapped is not None and len(mapped) != after.st_size
+            ):
+                if mapped is not None:
+                    mapped.close()
+                f.seek(0)
+                yield f.read()
+                return
+            if mapped is None:
+                yield b""
+                return
+            with mapped:
+                yield mapped
+
+    def _iter_stale_lines(self, buf: bytes | mmap.mmap, cutoff: datetime) -> Iterator[tuple[int, int, dict[str, Any]]]:
+        """Yield (start, end) offsets (end past the newline) and entity of each stale line in buf.
+
+        created_at keys are found by a byte pattern search over the whole buffer: only lines with a
+        created_at that is older than cutoff, or that isn't a plain string, are decoded as JSON (to
+        check they are entities, and that it's theirs rather than a nested object's).
+        """
+        cutoff_seconds = cutoff.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S").encode()
+        pos = 0
+        while True:
+            match = _CREATED_AT.search(buf, pos)
+            if match is None:
+                return
+            utc_seconds, value = match.group(1, 2)
+            # (a UTC timestamp in the cutoff's second may be either side of it: decode those)
+            if utc_seconds is not None and utc_seconds > cutoff_seconds or (
+                value is not None and not self._raw_created_before(value, cutoff)
+            ):
+                pos = match.end()
+                continue
+
+            start = buf.rfind(b"\n", 0, match.start()) + 1
+            end = buf.find(b"\n", match.end())
+            end = len(buf) if end == -1 else end + 1
+            entity = _parse_line(buf[start:end])
+            if entity is not None and self._is_stale(entity, cutoff):
+                yield start, end, entity
+            pos = end
+
+    def _read_entities(self) -> list[dict[str, Any]]:
+        """Read all entities from JSONL file.
 
+        Raises:
+            CleanupError: On file I/O errors.
+        """
         try:
-            entities = []
-            with open(file_path) as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            entities.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            continue  # skip malformed lines
-            return entities
+            return [entity for _, entity in self._iter_lines() if entity is not None]
         except OSError as e:
             raise CleanupError(f"Failed to read JSONL file: {e}") from e
 
     def _write_entities(self, entities: list[dict[str, Any]]) -> None:
-        """Write entities back to JSONL file, rewriting it from scratch.
+        """Write entities back to JSONL file, atomically replacing it.
 
         Raises:
             CleanupError: On file I/O errors.
         """
+        try:
+            self._get_file_path().parent.mkdir(parents=True, exist_ok=True)
+            self._replace_file((json.dumps(entity) + "\n").encode() for entity in entities)
+        except OSError as e:
+            raise CleanupError(f"Failed to write JSONL file: {e}") from e
+
+    def _replace_file(self, lines: Iterable[bytes], only_if: Callable[[], bool] = lambda: True) -> bool:
+        """Write lines to a temp file beside the JSONL file, then swap it in with os.replace().
+
+        The temp file is fsync'd first (and the directory after), so a crash at any point leaves
+        either the old or the new file intact, never a partial one. If only_if() (checked once all
+        lines are written) is false, the temp file is discarded instead.
+
+        Returns:
+            Whether the file was replaced.
+
+        Raises:
+            OSError: On file I/O errors.
+        """
         file_path = self._get_file_path()
+        tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.writelines(lines)
+                if not only_if():
+                    return False
+                f.flush()
+                os.fsync(f.fileno())
+            if file_path.exists():
+                shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        _fsync_dir(file_path.parent)
+        return True
+
+    def _is_stale(self, entity: dict[str, Any], cutoff: datetime) -> bool:
+        """Check whether an entity's created_at is older than cutoff (entities without one never are)."""
+        created_at = entity.get("created_at")
+        if not created_at:
+            return False  # skip entities without timestamp
+        return self._created_before(str(created_at), cutoff)
+
+    def _raw_created_before(self, value: bytes, cutoff: datetime) -> bool:
+        """_created_before() for a created_at value read from raw bytes (true if it can't be decoded,
+        leaving the decision to the line's full decode)."""
+        try:
+            return self._created_before(value.decode(), cutoff)
+        except UnicodeDecodeError:
+            return True
+
+    def _created_before(self, created_at: str, cutoff: datetime) -> bool:
+        """Check whether a created_at timestamp is older than cutoff (unparseable ones never are)."""
+        if not created_at:
+            return False
 
         try:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            created_str = created_at
 
-            # open file in write mode; existing file will be erased
-            with open(file_path, "w") as f:
-                for entity in entities:
-                    f.write(json.dumps(entity) + "\n")
-        except OSError as e:
-            raise CleanupError(f"Failed to write JSONL file: {e}") from e
+            # timestamp will be ISO with optional Z; normalize Z to +00:00 for fromisoformat
+            if created_str.endswith("Z"):
+                created_str = created_str[:-1] + "+00:00"
+
+            created_dt = datetime.fromisoformat(created_str)
+        except (ValueError, TypeError):
+            try:
+                created_dt = datetime.strptime(created_at, "%Y-%m-%d")
+            except (ValueError, TypeError):
+                return False
+
+        # ensure created_dt is timezone-aware (use UTC since this is the timezone agents
+        #   are directed to use for all memories in Bureau's context files)
+        if created_dt.tzinfo is None:
+            created_dt = created_dt.replace(tzinfo=timezone.utc)
+
+        return created_dt < cutoff
 
     def get_stale_items(self, cutoff: datetime) -> list[dict[str, Any]]:
         """Find entities with created_at older than cutoff."""
-        items = []
-        for entity in self._read_entities():
-            created_at = entity.get("created_at")
-            if not created_at:
-                continue  # skip entities without timestamp
+        return [item for batch in self.iter_stale_batches(cutoff, get_cleanup_batch_size()) for item in batch]
+
+    def iter_stale_batches(self, cutoff: datetime, batch_size: int) -> Iterator[list[dict[str, Any]]]:
+        """Yield entities with created_at older than cutoff in batches, scanning the mapped file
+        (see _iter_stale_lines()).
 
+        Only used as such for dry runs: cleanup itself makes a single pass (see _cleanup_in_batches()).
+
+        Raises:
+            CleanupError: On file I/O errors.
+        """
+        batch: list[dict[str, Any]] = []
+        try:
+            with self._mapped_file() as buf:
+                for _, _, entity in self._iter_stale_lines(buf, cutoff):
+                    batch.append(entity)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+        except OSError as e:
+            raise CleanupError(f"Failed to read JSONL file: {e}") from e
+        if batch:
+            yield batch
+
+    def _compaction_edits(self, buf: bytes | mmap.mmap, cutoff: datetime) -> list[_Edit]:
+        """Plan the edits of a compacting cleanup of buf, in file order.
+
+        Besides the stale lines, relations to or from a removed (stale) entity (by its name or its id,
+        as entities may be keyed by either) are moved to trash with it, via an index of each relation
+        endpoint's lines, unless a kept entity has that name or id too; and entities with repeated
+        observations are rewritten without the repeats (re-serialized as Memory MCP writes them).
+        Every line is decoded, and the index holds every relation's offsets.
+        """
+        edits: list[_Edit] = []
+        stale: set[int] = set()
+        removed_keys: set[str] = set()
+        for start, end, removed in self._iter_stale_lines(buf, cutoff):
+            edits.append(_Edit(start, end))
+            stale.add(start)
+            if removed.get("type") != "relation":
+                removed_keys.update(key for key in (removed.get("name"), removed.get("id")) if isinstance(key, str))
+
+        # entity name or id -> (start, end) of the relation lines naming it as "from" or "to"
+        relations_of: defaultdict[str, list[tuple[int, int]]] = defaultdict(list)
+        kept_keys: set[str] = set()
+        pos, size = 0, len(buf)
+        while pos < size:
+            start = pos
+            end = buf.find(b"\n", start)
+            pos = end = size if end == -1 else end + 1
+            if start in stale:
+                continue
+            line = buf[start:end]
+            entity = _parse_line(line)
+            if entity is None:
+                continue
+
+            if entity.get("type") == "relation":
+                for endpoint in {entity.get("from"), entity.get("to")}:
+                    if isinstance(endpoint, str):
+                        relations_of[endpoint].append((start, end))
+                continue
+
+            kept_keys.update(key for key in (entity.get("name"), entity.get("id")) if isinstance(key, str))
+            observations = entity.get("observations")
+            if isinstance(observations, list):
+                unique = _dedupe(observations)
+                if len(unique) < len(observations):
+                    entity["observations"] = unique
+                    replacement = json.dumps(entity, ensure_ascii=False, separators=(",", ":")).encode()
+                    edits.append(_Edit(start, end, replacement + _line_ending(line),
+                                       dropped_observations=len(observations) - len(unique)))
+
+        # (a relation naming a key that a kept entity still holds isn't orphaned)
+        cascaded = {span for key in removed_keys - kept_keys for span in relations_of.get(key, ())}
+        edits.extend(_Edit(start, end, cascaded=True) for start, end in cascaded)
+        edits.sort(key=lambda edit: edit.start)
+        return edits
+
+    def _plan_edits(self, buf: bytes | mmap.mmap, cutoff: datetime, compact: bool) -> Iterable[_Edit]:
+        """The edits cleanup makes to buf, in file order: compacting (see _compaction_edits()), or
+        just moving stale lines to trash (streamed)."""
+        if compact:
+            return self._compaction_edits(buf, cutoff)
+        return (_Edit(start, end) for start, end, _ in self._iter_stale_lines(buf, cutoff))
+
+    def _cleanup_in_batches(self, cutoff: datetime, retention: str, dry_run: bool) -> dict[str, Any]:
+        """Clean up in a single streaming pass over the JSONL file.
+
+        Stale lines are found by scanning the mapped file (see _plan_edits()) and go to the trash
+        file (as they were, in batches of cleanup.batch_size), along with cascaded relations if
+        compacting; the bytes between them (kept lines, including blank and malformed ones) are
+        copied unchanged to a temp file that then atomically replaces the original (see
+        _replace_file()). The file is read once and written once, and memory use is O(batch)
+        (O(relations) if compacting).
+        """
+        compact = get_memory_mcp_compact()
+        if dry_run:
+            if not compact:
+                return super()._cleanup_in_batches(cutoff, retention, dry_run)
             try:
-                created_str = str(created_at)
-                
-                # timestamp will be ISO with optional Z; normalize Z to +00:00 for fromisoformat
-                if created_str.endswith("Z"):
-                    created_str = created_str[:-1] + "+00:00"
+                return self._compaction_dry_run(cutoff)
+            except OSError as e:
+                raise CleanupError(f"Failed to read JSONL file: {e}") from e
 
-                created_dt = datetime.fromisoformat(created_str)
-            except (ValueError, TypeError):
-                try:
-                    created_dt = datetime.strptime(str(created_at), "%Y-%m-%d")
-                except (ValueError, TypeError):
-                    continue
+        try:
+            counts, trash_path = self._rewrite(cutoff, retention, compact)
+        except OSError as e:
+            raise CleanupError(f"Failed to rewrite JSONL file: {e}") from e
+
+        if not counts["edits"]:
+            return {"storage": self.name, "deleted": 0, "message": "no expired items"}
+
+        result: dict[str, Any] = {"storage": self.name, "deleted": counts["deleted"]}
+        if compact:
+            result["cascaded"] = counts["cascaded"]
+            result["deduped"] = counts["deduped"]
+        result["bytes_reclaimed"] = counts["reclaimed"]
+        if trash_path:
+            result["trash_path"] = str(trash_path)
+        return result
 
-            # ensure created_dt is timezone-aware (use UTC since this is the timezone agents
-            #   are directed to use for all memories in Bureau's context files)
-            if created_dt.tzinfo is None:
-                created_dt = created_dt.replace(tzinfo=timezone.utc)
+    def _rewrite(self, cutoff: datetime, retention: str, compact: bool) -> tuple[dict[str, int], Path | None]:
+        """Apply _plan_edits() to the JSONL file.
 
-            if created_dt < cutoff:
-                items.append(entity)
+        Returns:
+            Counts of edits made, lines deleted (stale) and cascaded, observations deduped, and
+            bytes reclaimed; and the trash file's path (None if no lines were moved to trash).
 
-        return items
+        Raises:
+            OSError: On file I/O errors.
+        """
+        batch_size = get_cleanup_batch_size()
+        pending: list[str] = []
+        counts = {"edits": 0, "deleted": 0, "cascaded": 0, "deduped": 0, "reclaimed": 0}
+
+        # the writer is closed (and its manifest entry written) even if the rewrite fails: the
+        #   original file is then left as it was, so its trash file only holds copies
+        with TrashWriter(self.name, retention, get_trash_grace_period()) as writer:
+            def kept_bytes(buf: bytes | mmap.mmap) -> Iterator[bytes]:
+                pos = 0
+                for edit in self._plan_edits(buf, cutoff, compact):
+                    yield from _iter_chunks(buf, pos, edit.start)
+                    counts["edits"] += 1
+                    counts["reclaimed"] += edit.end - edit.start
+                    if edit.replacement is None:
+                        pending.append(buf[edit.start:edit.end].decode().strip())
+                        if len(pending) >= batch_size:
+                            self._check_cancelled()
+                            writer.write_json_lines(pending)
+                            pending.clear()
+                        counts["cascaded" if edit.cascaded else "deleted"] += 1
+                    else:
+                        yield edit.replacement
+                        counts["reclaimed"] -= len(edit.replacement)
+                        counts["deduped"] += edit.dropped_observations
+                    pos = edit.end
+                yield from _iter_chunks(buf, pos, len(buf))
+                # cancelling leaves the original file as it was (the temp file is discarded)
+                self._check_cancelled()
+                # stale entities reach the trash before the original file is replaced
+                writer.write_json_lines(pending)
+
+            if self._get_file_path().exists():
+                with self._mapped_file() as buf:
+                    # (left untouched if there was nothing to change)
+                    self._replace_file(kept_bytes(buf), only_if=lambda: counts["edits"] > 0)
+
+        return counts, writer.close() if writer.item_count else None
+
+    def _compaction_dry_run(self, cutoff: datetime) -> dict[str, Any]:
+        """Report what a compacting cleanup would do, without changing anything.
+
+        Raises:
+            OSError: On file I/O errors.
+        """
+        with self._mapped_file() as buf:
+            edits = self._compaction_edits(buf, cutoff)
+            stale = [edit for edit in edits if edit.replacement is None and not edit.cascaded]
+            preview = [_parse_line(buf[edit.start:edit.end]) for edit in stale[:10]]
+
+        if not edits:
+            return {"storage": self.name, "deleted": 0, "message": "no expired items"}
+        return {
+            "storage": self.name,
+            "would_delete": len(stale),
+            "would_cascade": sum(1 for edit in edits if edit.cascaded),
+            "would_dedupe": sum(edit.dropped_observations for edit in edits),
+            "dry_run": True,
+            "items": preview,  # show first 10 items that *would have been* deleted
+        }
 
     def export_items_to_trash(self, items: list[dict[str, Any]], retention: str) -> str:
         """Export entities to JSONL in trash directory."""
@@ -112,7 +489,7 @@ class MemoryMcpHandler(CleanupHandler):
         return str(trash_path)
 
     def delete_items_from_storage(self, items: list[dict[str, Any]]) -> int:
-        """Rewrite JSONL without expired entities."""
+        """Rewrite JSONL without expired entities (streaming it into an atomically swapped-in temp file)."""
         if not items:
             return 0
 
@@ -126,26 +503,29 @@ class MemoryMcpHandler(CleanupHandler):
             elif "id" in item:
                 expired_ids.add(item["id"])
 
-        # filter out expired entities from overall set
-        all_entities = self._read_entities()
-        remaining = []
         deleted_count = 0
 
-        for entity in all_entities:
-            # match by the same field type: name → expired_names, id → expired_ids
-            should_delete = False
-            if "name" in entity:
-                should_delete = entity["name"] in expired_names
-            elif "id" in entity:
-                should_delete = entity["id"] in expired_ids
+        def remaining_lines() -> Iterator[bytes]:
+            nonlocal deleted_count
+            for line, entity in self._iter_lines():
+                # match by the same field type: name → expired_names, id → expired_ids
+                should_delete = False
+                if entity is None:
+                    pass  # blank and malformed lines are kept as they are
+                elif "name" in entity:
+                    should_delete = entity["name"] in expired_names
+                elif "id" in entity:
+                    should_delete = entity["id"] in expired_ids
+
+                if should_delete:
+                    deleted_count += 1
+                else:
+                    yield line
 
-            if should_delete:
-                deleted_count += 1
-            else:
-                remaining.append(entity)
-
-        # write back remaining entities
-        self._write_entities(remaining)
+        try:
+            self._replace_file(remaining_lines())
+        except OSError as e:
+            raise CleanupError(f"Failed to write JSONL file: {e}") from e
 
         return deleted_count
 
@@ -169,3 +549,47 @@ class MemoryMcpHandler(CleanupHandler):
         if backup_path:
             result["backup_path"] = backup_path
         return result
+
+    def _wipe_fast(self, backup: bool) -> dict[str, Any]:
+        """Erase all entities by atomically replacing the JSONL file with an empty one.
+
+        The old file is hard-linked (or copied) into trash as a backup if requested. Entities aren't
+        parsed: the reported count is the file's number of non-blank lines.
+
+        Raises:
+            CleanupError: On file I/O errors.
+        """
+        file_path = self._get_file_path()
+        if not file_path.exists():
+            return {"storage": self.name, "wiped": 0, "message": "no entities found"}
+
+        empty_path = file_path.with_name(file_path.name + ".wipe")
+        try:
+            with open(file_path, "rb") as f:
+                count = sum(1 for line in f if line.strip())
+            if not count:
+                return {"storage": self.name, "wiped": 0, "message": "no entities found"}
+
+            backup_path = None
+            if backup:
+                trash_dir = get_trash_dir(self.name)
+                trash_path = trash_dir / generate_trash_filename(count, "jsonl")
+                link_into_trash(file_path, trash_path)
+                write_manifest(trash_dir, self.name, count, "wipe",
+                               get_trash_grace_period(),
+                               files=[trash_path])
+                backup_path = str(trash_path)
+
+            # swap in an empty file in one step, so the MCP never sees a missing or partial file
+            empty_path.touch()
+            shutil.copymode(file_path, empty_path)
+            os.replace(empty_path, file_path)
+        except OSError as e:
+            raise CleanupError(f"Failed to truncate JSONL file: {e}") from e
+        finally:
+            empty_path.unlink(missing_ok=True)
+
+        result: dict[str, Any] = {"storage": self.name, "wiped": count}
+        if backup_path:
+            result["backup_path"] = backup_path
+        return result
@@ -1,13 +1,83 @@
 """Qdrant vector database cleanup handler."""
+import http.client
 import json
+import logging
+import os
+import time
+import uuid
 from datetime import datetime, timezone
-from typing import Any
-from urllib.request import urlopen, Request
-from urllib.error import URLError, HTTPError
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, cast
 
 from .base import CleanupHandler, CleanupError
+from ..http_pool import HTTPConnectionPool
 from ..trash import get_trash_dir, generate_trash_filename, write_manifest
-from ...config_loader import get_qdrant_url, get_qdrant_collection, get_trash_grace_period
+from ...config_loader import (
+    get_cleanup_batch_size,
+    get_cleanup_handler_timeout,
+    get_qdrant_collection,
+    get_qdrant_connect_timeout,
+    get_qdrant_delete_chunk_size,
+    get_qdrant_delete_mode,
+    get_qdrant_export_vectors,
+    get_qdrant_request_timeout,
+    get_qdrant_url,
+    get_qdrant_wipe_backup,
+    get_trash_grace_period,
+)
+
+logger = logging.getLogger(__name__)
+
+# payload field holding each memory's creation timestamp
+CREATED_AT_FIELD = "metadata.created_at"
+
+# lower bound matching every value Qdrant can parse as a datetime (see _stale_filter())
+_MIN_DATETIME = "0001-01-01T00:00:00Z"
+
+# bounds for the number of points per scroll page while scanning for stale points, and the
+#   response time the page size is adjusted towards (see _iter_stale_refs())
+SCAN_PAGE_SIZE_MIN = 256
+SCAN_PAGE_SIZE_MAX = 4096
+SCAN_PAGE_TARGET_SECONDS = 0.5
+
+# extension of collection snapshots saved to trash (see _backup_snapshot())
+SNAPSHOT_EXTENSION = "snapshot"
+
+# bytes read at a time when uploading a snapshot file
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+# endpoints (by method) safe to send twice besides GETs: reads, deletes of given points, and payload
+#   index creation; they may be retried on a new connection if a pooled one turns out closed (see
+#   HTTPConnectionPool.request())
+_IDEMPOTENT_ENDPOINTS = {
+    "POST": ("/points", "/points/scroll", "/points/count", "/points/delete"),
+    "PUT": ("/index",),
+}
+
+
+class _LocalFileError(Exception):
+    """Wraps an OSError from a local file read or written mid-request (a sink, or a streamed body),
+    so it isn't taken for a connection failure."""
+
+    def __init__(self, error: OSError):
+        super().__init__(str(error))
+        self.error = error
+
+
+class _GuardedSink:
+    """Sink wrapper raising _LocalFileError when writing to the underlying file fails."""
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+
+    def write(self, data: bytes) -> int:
+        try:
+            return self._file.write(data)
+        except OSError as e:
+            raise _LocalFileError(e) from e
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
 
 
 class QdrantHandler(CleanupHandler):
@@ -15,32 +85,134 @@ class QdrantHandler(CleanupHandler):
 
     name = "qdrant"
 
-    def _http_request(self, method: str, endpoint: str, data: dict | None = None) -> dict:
-        """Make HTTP request to (locally-running) Qdrant server.
+    def __init__(self) -> None:
+        # per-run state: one keep-alive connection pool and the collection's metadata,
+        #   both reset once each cleanup()/wipe() finishes
+        self._pool: HTTPConnectionPool | None = None
+        self._collection_info: dict[str, Any] | None = None
+        self._collection_info_loaded = False
+        # cutoff of the latest stale-point scan (used by filter-based deletes)
+        self._scan_cutoff: datetime | None = None
+        # whether this run is a dry run (which leaves the collection untouched, indexes included)
+        self._dry_run = False
+        # (points, milliseconds) for each delete request sent this run
+        self._delete_chunk_timings: list[tuple[int, float]] = []
+
+    def cleanup(self, retention: str | None = None, dry_run: bool = False) -> dict[str, Any]:
+        self._dry_run = dry_run
+        try:
+            return self._with_delete_chunks(super().cleanup(retention, dry_run))
+        finally:
+            self._end_run()
+
+    def wipe(self, backup: bool = True, fast: bool = False) -> dict[str, Any]:
+        try:
+            return self._with_delete_chunks(super().wipe(backup, fast))
+        finally:
+            self._end_run()
+
+    def _with_delete_chunks(self, result: dict[str, Any]) -> dict[str, Any]:
+        """Add this run's per-request delete latencies to its result (reported in verbose output)."""
+        if self._delete_chunk_timings:
+            result["delete_chunks"] = [
+                {"points": points, "ms": round(ms, 1)} for points, ms in self._delete_chunk_timings
+            ]
+        return result
+
+    def _end_run(self) -> None:
+        """Close pooled connections and forget cached collection metadata."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        self._collection_info = None
+        self._collection_info_loaded = False
+        self._scan_cutoff = None
+        self._dry_run = False
+        self._delete_chunk_timings = []
+
+    def _get_pool(self) -> HTTPConnectionPool:
+        if self._pool is None:
+            try:
+                self._pool = HTTPConnectionPool(
+                    get_qdrant_url(),
+                    connect_timeout=get_qdrant_connect_timeout(),
+                    request_timeout=get_qdrant_request_timeout(),
+                )
+            except ValueError as e:
+                raise CleanupError(f"Invalid Qdrant URL: {e}") from e
+        return self._pool
+
+    def _http_request(self, method: str, endpoint: str, data: dict | None = None,
+                      timeout: float | None = None) -> dict:
+        """Make HTTP request to (locally-running) Qdrant server over a pooled keep-alive connection.
 
         Raises:
             CleanupError: On HTTP errors, connection failures, or invalid responses.
         """
-        url = f"{get_qdrant_url()}{endpoint}"
         headers = {"Content-Type": "application/json"}
-
         body = json.dumps(data).encode() if data else None
-        req = Request(url, data=body, headers=headers, method=method)
+        return self._parse_json(self._raw_request(method, endpoint, body, headers, timeout=timeout))
 
+    @staticmethod
+    def _parse_json(raw: bytes) -> dict:
         try:
-            # send request with 30s timeout
-            with urlopen(req, timeout=30) as resp:
-                # read response bytes, decode to string, parse as JSON and return resulting dict
-                return json.loads(resp.read().decode())
+            # decode response bytes to string, parse as JSON and return resulting dict
+            return json.loads(raw.decode())
+        except json.JSONDecodeError as e:
+            raise CleanupError(f"Invalid JSON response from Qdrant: {e}") from e
 
-        except HTTPError as e:  # must catch before URLError since it's a subclass of it
-            raise CleanupError(f"Qdrant HTTP {e.code}: {e.reason}") from e
+    def _raw_request(self, method: str, endpoint: str, body: bytes | Iterable[bytes] | None = None,
+                     headers: dict[str, str] | None = None, sink: BinaryIO | None = None,
+                     timeout: float | None = None) -> bytes:
+        """Make HTTP request to Qdrant server, returning the raw response body (see HTTPConnectionPool.request()).
+
+        Raises:
+            CleanupError: On HTTP errors or connection failures.
+            OSError: On local file errors: writing the response to sink, or reading a streamed
+                body (whose iterator raises them as _LocalFileError).
+        """
+        # Qdrant's other writes (e.g. creating a collection or a snapshot) can't be resent safely,
+        #   whatever their method
+        path = endpoint.split("?", 1)[0]
+        idempotent = method == "GET" or path.endswith(_IDEMPOTENT_ENDPOINTS.get(method, ()))
+        try:
+            status, reason, raw = self._get_pool().request(
+                method, endpoint, body, headers, cast(BinaryIO, _GuardedSink(sink)) if sink else None, timeout,
+                idempotent=idempotent,
+            )
+        except _LocalFileError as e:
+            # e.g. a full disk or missing permissions: Qdrant itself is fine
+            raise e.error from e
+        except (OSError, http.client.HTTPException) as e:
+            raise CleanupError(f"Qdrant unavailable: {e}") from e
 
-        except URLError as e:
-            raise CleanupError(f"Qdrant unavailable: {e.reason}") from e
+        if status >= 400:
+            raise CleanupError(f"Qdrant HTTP {status}: {reason}")
+        return raw
 
-        except json.JSONDecodeError as e:
-            raise CleanupError(f"Invalid JSON response from Qdrant: {e}") from e
+    def _get_collection_info(self) -> dict[str, Any] | None:
+        """Retrieve collection info (incl. its payload_schema), or None if collection doesn't exist.
+
+        Fetched once per run and cached.
+
+        Returns None if collection doesn't exist (404).
+        Raises CleanupError for other failures.
+        """
+        if self._collection_info_loaded:
+            return self._collection_info
+
+        try:
+            result = self._http_request("GET", f"/collections/{get_qdrant_collection()}")
+            info = (result.get("result") or {}) if result.get("status") == "ok" else None
+        except CleanupError as e:
+            if "HTTP 404" not in str(e):
+                # re-raise anything but a missing collection
+                raise
+            info = None
+
+        self._collection_info = info
+        self._collection_info_loaded = True
+        return info
 
     def _collection_exists(self) -> bool:
         """Check if collection exists.
@@ -48,38 +220,135 @@ class QdrantHandler(CleanupHandler):
         Returns False if collection doesn't exist (404).
         Raises CleanupError for other failures.
         """
+        return self._get_collection_info() is not None
+
+    def _ensure_created_at_index(self, collection_info: dict[str, Any]) -> None:
+        """Create a datetime payload index on metadata.created_at if the collection lacks one.
+
+        The index lets Qdrant answer the stale-points range filter without scanning every payload.
+        Failing to create it isn't fatal: the filter still works (just more slowly) without it.
+        """
+        existing = (collection_info.get("payload_schema") or {}).get(CREATED_AT_FIELD)
+        if existing:
+            if existing.get("data_type") != "datetime":
+                # don't replace an index someone else set up on this field
+                logger.warning("qdrant: %s is indexed as %s, not datetime; stale point lookups may be slow",
+                               CREATED_AT_FIELD, existing.get("data_type"))
+            return
+
         try:
-            result = self._http_request("GET", f"/collections/{get_qdrant_collection()}")
-            return result.get("status") == "ok"
+            result = self._http_request(
+                "PUT",
+                f"/collections/{get_qdrant_collection()}/index?wait=true",
+                {"field_name": CREATED_AT_FIELD, "field_schema": "datetime"}
+            )
         except CleanupError as e:
-            if "HTTP 404" in str(e):
-                # collection doesn't exist
-                return False
-            
-            # otherwise re-raise
-            raise
+            logger.warning("qdrant: could not create datetime index on %s: %s", CREATED_AT_FIELD, e)
+            return
+
+        if result.get("status") != "ok":
+            logger.warning("qdrant: could not create datetime index on %s: %s", CREATED_AT_FIELD, result)
+            return
+
+        # keep the cached metadata in sync so the index isn't requested again this run
+        collection_info.setdefault("payload_schema", {})[CREATED_AT_FIELD] = {"data_type": "datetime"}
+
+    def _stale_filter(self, cutoff: datetime) -> dict[str, Any]:
+        """Build a scroll filter matching points that may be older than cutoff.
+
+        Matches points whose created_at is a datetime before the cutoff, plus points whose created_at
+        Qdrant can't parse as a datetime (e.g. legacy YYYY-MM-DD strings), which are then checked
+        client-side. Points without a created_at are excluded.
+        """
+        cutoff_str = cutoff.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        return {
+            "should": [
+                {"key": CREATED_AT_FIELD, "range": {"lt": cutoff_str}},
+                {
+                    "must_not": [
+                        {"is_empty": {"key": CREATED_AT_FIELD}},
+                        {"key": CREATED_AT_FIELD, "range": {"gte": _MIN_DATETIME}},
+                    ]
+                },
+            ]
+        }
 
     def get_stale_items(self, cutoff: datetime) -> list[dict[str, Any]]:
         """Query points with metadata.created_at older than cutoff."""
-        if not self._collection_exists():
-            return []
+        return [item for batch in self.iter_stale_batches(cutoff, get_cleanup_batch_size()) for item in batch]
 
-        items = []
+    def iter_stale_batches(self, cutoff: datetime, batch_size: int) -> Iterator[list[dict[str, Any]]]:
+        """Yield points with metadata.created_at older than cutoff, in batches of at most batch_size.
+
+        Scans in two phases: the scroll only transfers each point's created_at, then full payloads
+        (and vectors, if qdrant.export_vectors is set) are retrieved for each batch of stale IDs.
+
+        Scroll pages are consumed as the batches are, so each batch may be deleted before the
+        next page is requested (the scroll offset only moves forward past deleted points).
+
+        A missing created_at index is created first, except in dry runs.
+        """
+        collection_info = self._get_collection_info()
+        if collection_info is None:
+            return
+
+        if not self._dry_run:
+            self._ensure_created_at_index(collection_info)
+        self._scan_cutoff = cutoff
+
+        refs: list[dict[str, Any]] = []
+        for page in self._iter_stale_refs(cutoff):
+            refs.extend(page)
+            while len(refs) >= batch_size:
+                yield self._retrieve_points(refs[:batch_size])
+                refs = refs[batch_size:]
+
+        if refs:
+            yield self._retrieve_points(refs)
+
+    def _iter_stale_refs(self, cutoff: datetime) -> Iterator[list[dict[str, Any]]]:
+        """Scroll through points matching the stale filter, yielding the (id, created_at) of stale points on each page.
+
+        Only metadata.created_at is requested per point. The page size adapts to how quickly
+        Qdrant answers, between SCAN_PAGE_SIZE_MIN and SCAN_PAGE_SIZE_MAX points.
+
+        Every returned point is still checked against the cutoff client-side, which both resolves
+        points with legacy timestamps and keeps results correct on servers without datetime range
+        support (Qdrant < 1.8), where the scroll falls back to reading every point.
+        """
         offset: int | None = 0
+        scroll_filter: dict[str, Any] | None = self._stale_filter(cutoff)
+        first_page = True
+        page_size = SCAN_PAGE_SIZE_MIN
 
         while True:
             # scroll through all points using offset (starting ID to read points from)
             scroll_params: dict[str, Any] = {
-                "limit": 100,
-                "with_payload": True,
+                "limit": page_size,
+                "with_payload": [CREATED_AT_FIELD],
+                "with_vector": False,
                 "offset": offset,
             }
+            if scroll_filter is not None:
+                scroll_params["filter"] = scroll_filter
+
+            started = time.monotonic()
+            try:
+                result = self._http_request(
+                    "POST",
+                    f"/collections/{get_qdrant_collection()}/points/scroll",
+                    scroll_params
+                )
+            except CleanupError as e:
+                if scroll_filter is not None and first_page and "HTTP 400" in str(e):
+                    logger.warning("qdrant: server rejected datetime range filter (%s); "
+                                   "filtering all points client-side", e)
+                    scroll_filter = None
+                    continue
+                raise
+            elapsed = time.monotonic() - started
 
-            result = self._http_request(
-                "POST",
-                f"/collections/{get_qdrant_collection()}/points/scroll",
-                scroll_params
-            )
+            first_page = False
 
             if result.get("status") != "ok":
                 break
@@ -90,6 +359,7 @@ class QdrantHandler(CleanupHandler):
                 # reached the end of the collection
                 break
 
+            refs = []
             for point in points:
                 payload = point.get("payload") or {}
                 metadata = payload.get("metadata") or {}
@@ -117,18 +387,48 @@ class QdrantHandler(CleanupHandler):
                         point_date = point_date.replace(tzinfo=timezone.utc)
 
                     if point_date < cutoff:
-                        items.append({
-                            "id": point["id"],
-                            "created_at": created_at,
-                            "payload": payload,
-                        })
+                        refs.append({"id": point["id"], "created_at": created_at})
                 except (ValueError, TypeError):
                     continue
 
+            if refs:
+                yield refs
+
             offset = result_data.get("next_page_offset")
             if not offset:
                 break
 
+            # grow pages while Qdrant answers quickly; shrink them if it starts to struggle
+            if elapsed < SCAN_PAGE_TARGET_SECONDS / 2 and len(points) >= page_size:
+                page_size = min(page_size * 2, SCAN_PAGE_SIZE_MAX)
+            elif elapsed > SCAN_PAGE_TARGET_SECONDS * 2:
+                page_size = max(page_size // 2, SCAN_PAGE_SIZE_MIN)
+
+    def _retrieve_points(self, refs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Fetch full payloads (and optionally vectors) for the given stale points in one request.
+
+        Points that no longer exist (e.g. deleted since the scan) are left out.
+        """
+        with_vector = get_qdrant_export_vectors()
+        result = self._http_request(
+            "POST",
+            f"/collections/{get_qdrant_collection()}/points",
+            {"ids": [ref["id"] for ref in refs], "with_payload": True, "with_vector": with_vector}
+        )
+
+        points_by_id = {point["id"]: point for point in result.get("result") or []}
+
+        items = []
+        for ref in refs:
+            point = points_by_id.get(ref["id"])
+            if point is None:
+                continue
+
+            item = {"id": ref["id"], "created_at": ref["created_at"], "payload": point.get("payload") or {}}
+            if with_vector:
+                item["vector"] = point.get("vector")
+            items.append(item)
+
         return items
 
     def export_items_to_trash(self, items: list[dict[str, Any]], retention: str) -> str:
@@ -153,34 +453,114 @@ class QdrantHandler(CleanupHandler):
         return str(trash_path)
 
     def delete_items_from_storage(self, items: list[dict[str, Any]]) -> int:
-        """Delete points from Qdrant by ID."""
+        """Delete points from Qdrant (by ID, or by filter if qdrant.delete_mode is "filter")."""
         if not items:
             return 0
 
-        point_ids = [item["id"] for item in items]
+        return self._delete_points([item["id"] for item in items], self._scan_cutoff)
+
+    def _delete_points(self, point_ids: list[Any], cutoff: datetime | None = None) -> int:
+        """Delete points in chunks of qdrant.delete_chunk_size, returning the count actually deleted.
+
+        All chunks but the last are sent with wait=false, so Qdrant queues them without each
+        request blocking on the collection's update queue. The last is sent with wait=true: since
+        Qdrant applies a collection's updates in order, all chunks have been applied once it
+        returns. The requested IDs are then counted to confirm how many are gone.
+
+        In "filter" delete mode (given the cutoff of the scan that found the points), each chunk is
+        deleted via the scan's created_at range filter restricted to the chunk's IDs, so only points
+        that were exported (and are still stale) can be removed.
+        """
+        if not point_ids:
+            return 0
+
+        collection = get_qdrant_collection()
+        chunk_size = get_qdrant_delete_chunk_size()
+        by_filter = cutoff is not None and get_qdrant_delete_mode() == "filter"
+
+        acknowledged = 0
+        for start in range(0, len(point_ids), chunk_size):
+            chunk = point_ids[start:start + chunk_size]
+            is_last = start + chunk_size >= len(point_ids)
+
+            if by_filter and cutoff is not None:
+                body: dict[str, Any] = {
+                    "filter": {"must": [{"has_id": chunk}, self._stale_filter(cutoff)]}
+                }
+            else:
+                body = {"points": chunk}
+
+            started = time.monotonic()
+            result = self._http_request(
+                "POST",
+                f"/collections/{collection}/points/delete?wait={'true' if is_last else 'false'}",
+                body
+            )
+            self._delete_chunk_timings.append((len(chunk), (time.monotonic() - started) * 1000))
+
+            if result.get("status") == "ok":
+                acknowledged += len(chunk)
+
+        remaining = self._count_points(point_ids)
+        if remaining is None:
+            # count unavailable: trust the acknowledgements
+            return acknowledged
+        if remaining:
+            logger.warning("qdrant: %d of %d points were still present after deletion", remaining, len(point_ids))
+        return len(point_ids) - remaining
+
+    def _count_points(self, point_ids: list[Any]) -> int | None:
+        """Count how many of the given points exist, or None if Qdrant doesn't report a count.
+
+        Counted in chunks of qdrant.delete_chunk_size ids (like the deletes), so a wipe's count
+        request bodies stay bounded. A failed count request counts as unavailable.
+        """
+        chunk_size = get_qdrant_delete_chunk_size()
+        total = 0
+        for start in range(0, len(point_ids), chunk_size):
+            try:
+                result = self._http_request(
+                    "POST",
+                    f"/collections/{get_qdrant_collection()}/points/count",
+                    {"filter": {"must": [{"has_id": point_ids[start:start + chunk_size]}]}, "exact": True}
+                )
+            except CleanupError as e:
+                logger.warning("qdrant: could not count points after deletion: %s", e)
+                return None
+
+            count = (result.get("result") or {}).get("count") if result.get("status") == "ok" else None
+            if not isinstance(count, int):
+                return None
+            total += count
+        return total
+
+    def _count_all_points(self) -> int:
+        """Count the collection's points exactly.
 
+        Raises:
+            CleanupError: If Qdrant doesn't report a count.
+        """
         result = self._http_request(
-            "POST",
-            f"/collections/{get_qdrant_collection()}/points/delete",
-            {"points": point_ids}
+            "POST", f"/collections/{get_qdrant_collection()}/points/count", {"exact": True}
         )
 
-        if result.get("status") == "ok":
-            return len(point_ids)
-        return 0
+        count = (result.get("result") or {}).get("count") if result.get("status") == "ok" else None
+        if not isinstance(count, int):
+            raise CleanupError(f"Could not count Qdrant points: {result}")
+        return count
 
-    def _get_all_points(self) -> list[dict[str, Any]]:
-        """Retrieve all points from the collection."""
+    def _get_all_points(self, with_payload: bool = True) -> list[dict[str, Any]]:
+        """Retrieve all points from the collection (only their IDs unless with_payload is set)."""
         if not self._collection_exists():
             return []
 
-        items = []
+        items: list[dict[str, Any]] = []
         offset = None
 
         while True:
             scroll_data: dict[str, Any] = {
                 "limit": 100,
-                "with_payload": True,
+                "with_payload": with_payload,
             }
             if offset:
                 scroll_data["offset"] = offset
@@ -200,11 +580,10 @@ class QdrantHandler(CleanupHandler):
                 break
 
             for point in points:
-                payload = point.get("payload") or {}
-                items.append({
-                    "id": point["id"],
-                    "payload": payload,
-                })
+                item: dict[str, Any] = {"id": point["id"]}
+                if with_payload:
+                    item["payload"] = point.get("payload") or {}
+                items.append(item)
 
             offset = result_data.get("next_page_offset")
             if not offset:
@@ -213,28 +592,200 @@ class QdrantHandler(CleanupHandler):
         return items
 
     def _wipe(self, backup: bool) -> dict[str, Any]:
-        """Completely erase all points from Qdrant collection."""
-        items = self._get_all_points()
+        """Completely erase all points from Qdrant collection.
+
+        Backups are a collection snapshot streamed into trash (restorable with restore_snapshot()),
+        or a JSON export of every point if qdrant.wipe_backup is "json".
+        """
+        by_snapshot = backup and get_qdrant_wipe_backup() == "snapshot"
+
+        # list points before snapshotting, so every point deleted below is in the snapshot
+        items = self._get_all_points(with_payload=backup and not by_snapshot)
 
         if not items:
             return {"storage": self.name, "wiped": 0, "message": "collection empty or does not exist"}
 
-        # back up data if requested
+        # back up data if requested (a failed backup aborts the wipe)
         backup_path = None
-        if backup:
+        if by_snapshot:
+            backup_path = self._backup_snapshot(len(items))
+        elif backup:
             backup_path = self.export_items_to_trash(items, "wipe")
+        self._check_cancelled()
 
         # delete all points via corresponding Qdrant endpoint
-        point_ids = [item["id"] for item in items]
-        result = self._http_request(
-            "POST",
-            f"/collections/{get_qdrant_collection()}/points/delete",
-            {"points": point_ids}
-        )
-
-        wiped = len(point_ids) if result.get("status") == "ok" else 0
+        wiped = self._delete_points([item["id"] for item in items])
 
         result_dict: dict[str, Any] = {"storage": self.name, "wiped": wiped}
         if backup_path:
             result_dict["backup_path"] = backup_path
         return result_dict
+
+    def _wipe_fast(self, backup: bool) -> dict[str, Any]:
+        """Erase all points by dropping the collection and recreating it with the same configuration.
+
+        The collection's config and payload indexes are captured before it's dropped. Backups are
+        always snapshots here (whatever qdrant.wipe_backup says), since exporting points would take
+        as long as deleting them.
+
+        Its points are counted exactly first: the collection info's points_count is only an estimate.
+        """
+        collection_info = self._get_collection_info()
+        point_count = self._count_all_points() if collection_info is not None else 0
+        if collection_info is None or not point_count:
+            return {"storage": self.name, "wiped": 0, "message": "collection empty or does not exist"}
+
+        # fail before anything is dropped if the collection can't be recreated as it was
+        create_params = self._collection_create_params(collection_info)
+
+        backup_path = self._backup_snapshot(point_count) if backup else None
+        self._check_cancelled()
+
+        collection = get_qdrant_collection()
+        self._http_request("DELETE", f"/collections/{collection}", timeout=get_cleanup_handler_timeout())
+        result = self._http_request("PUT", f"/collections/{collection}", create_params,
+                                    timeout=get_cleanup_handler_timeout())
+        if result.get("status") != "ok":
+            restore_hint = f" (restore it from {backup_path})" if backup_path else ""
+            raise CleanupError(f"Qdrant collection was dropped but could not be recreated{restore_hint}: {result}")
+
+        for field_name, field_schema in (collection_info.get("payload_schema") or {}).items():
+            self._http_request(
+                "PUT",
+                f"/collections/{collection}/index?wait=true",
+                {"field_name": field_name, "field_schema": field_schema.get("params") or field_schema.get("data_type")}
+            )
+
+        result_dict: dict[str, Any] = {"storage": self.name, "wiped": point_count}
+        if backup_path:
+            result_dict["backup_path"] = backup_path
+        return result_dict
+
+    def _collection_create_params(self, collection_info: dict[str, Any]) -> dict[str, Any]:
+        """Build the request body recreating a collection from its info (as returned by GET /collections/{name}).
+
+        Raises:
+            CleanupError: If the info lacks the collection's vector configuration.
+        """
+        config = collection_info.get("config") or {}
+        params = config.get("params") or {}
+        if not params.get("vectors"):
+            raise CleanupError("Could not capture Qdrant collection config (missing vectors params)")
+
+        create_params = {
+            key: params[key]
+            for key in ("vectors", "sparse_vectors", "shard_number", "replication_factor",
+                        "write_consistency_factor", "on_disk_payload")
+            if params.get(key) is not None
+        }
+        # note collection info reports "optimizer_config", but creation takes "optimizers_config"
+        for info_key, create_key in (("hnsw_config", "hnsw_config"), ("optimizer_config", "optimizers_config"),
+                                     ("wal_config", "wal_config"), ("quantization_config", "quantization_config")):
+            value = config.get(info_key)
+            if isinstance(value, dict):
+                value = {k: v for k, v in value.items() if v is not None}
+            if value:
+                create_params[create_key] = value
+
+        return create_params
+
+    def _backup_snapshot(self, point_count: int) -> str:
+        """Create a collection snapshot and stream it into trash, returning its path.
+
+        The snapshot is removed from Qdrant's own storage once downloaded.
+        """
+        collection = get_qdrant_collection()
+
+        # snapshotting a large collection can outlast the per-request timeout
+        result = self._http_request("POST", f"/collections/{collection}/snapshots?wait=true",
+                                    timeout=get_cleanup_handler_timeout())
+        snapshot_name = (result.get("result") or {}).get("name") if result.get("status") == "ok" else None
+        if not snapshot_name:
+            raise CleanupError(f"Qdrant snapshot creation failed: {result}")
+
+        trash_dir = get_trash_dir(self.name)
+        trash_path = trash_dir / generate_trash_filename(point_count, SNAPSHOT_EXTENSION)
+        partial_path = trash_path.with_name(trash_path.name + ".partial")
+        try:
+            with open(partial_path, "wb") as f:
+                self._raw_request("GET", f"/collections/{collection}/snapshots/{snapshot_name}",
+                                  sink=f, timeout=get_cleanup_handler_timeout())
+            os.replace(partial_path, trash_path)
+        except OSError as e:
+            raise CleanupError(f"Failed to write Qdrant snapshot to trash: {e}") from e
+        finally:
+            partial_path.unlink(missing_ok=True)
+            try:
+                self._http_request("DELETE", f"/collections/{collection}/snapshots/{snapshot_name}?wait=true")
+            except CleanupError as e:
+                logger.warning("qdrant: could not remove snapshot %s from server: %s", snapshot_name, e)
+
+        write_manifest(trash_dir, self.name, point_count, "wipe",
+                       get_trash_grace_period(),
+                       files=[trash_path],
+                       details={"collection": collection, "snapshot": snapshot_name})
+
+        return str(trash_path)
+
+    def restore_snapshot(self, snapshot_path: Path | None = None) -> dict[str, Any]:
+        """Restore the collection from a snapshot saved to trash by a wipe.
+
+        The collection is replaced by the snapshot's contents (points added since are lost).
+
+        Args:
+            snapshot_path: Snapshot file to restore (default: the latest one in qdrant's trash).
+
+        Returns:
+            Dict with the restored snapshot's path, or an error.
+        """
+        try:
+            if snapshot_path is None:
+                snapshot_path = latest_snapshot()
+                if snapshot_path is None:
+                    raise CleanupError(f"No snapshot found in {get_trash_dir(self.name)}")
+            self._upload_snapshot(snapshot_path)
+            return {"storage": self.name, "restored": str(snapshot_path)}
+        except CleanupError as e:
+            return {"storage": self.name, "error": str(e)}
+        except OSError as e:
+            return {"storage": self.name, "error": f"Cannot read snapshot: {e}"}
+        finally:
+            self._end_run()
+
+    def _upload_snapshot(self, snapshot_path: Path) -> None:
+        """Stream a snapshot file to Qdrant as a multipart upload and wait for it to be recovered."""
+        boundary = uuid.uuid4().hex
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="snapshot"; filename="{snapshot_path.name}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+
+        def body() -> Iterator[bytes]:
+            yield head
+            try:
+                with open(snapshot_path, "rb") as f:
+                    while chunk := f.read(_UPLOAD_CHUNK_SIZE):
+                        yield chunk
+            except OSError as e:
+                raise _LocalFileError(e) from e
+            yield tail
+
+        headers = {
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(len(head) + snapshot_path.stat().st_size + len(tail)),
+        }
+        result = self._parse_json(self._raw_request(
+            "POST",
+            f"/collections/{get_qdrant_collection()}/snapshots/upload?priority=snapshot&wait=true",
+            body(), headers, timeout=get_cleanup_handler_timeout()
+        ))
+        if result.get("status") != "ok":
+            raise CleanupError(f"Qdrant snapshot recovery failed: {result}")
+
+
+def latest_snapshot() -> Path | None:
+    """Return the most recent Qdrant snapshot saved to trash, or None if there is none."""
+    snapshots = sorted(get_trash_dir(QdrantHandler.name).glob(f"*.{SNAPSHOT_EXTENSION}"))
+    return snapshots[-1] if snapshots else None
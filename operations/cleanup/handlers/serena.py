@@ -1,11 +1,34 @@
 """Serena memories cleanup handler."""
+import fnmatch
+import json
+import os
+import re
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator, TypeVar
 
 from .base import CleanupHandler, CleanupError
-from ..trash import get_trash_dir, move_to_trash, write_manifest
-from ...config_loader import get_path, get_trash_grace_period
+from ..serena_inventory import MtimeTable, is_memory_file, load_live_inventory
+from ..trash import get_trash_dir, generate_trash_filename, move_to_trash, write_manifest
+from ...config_loader import (
+    get_path,
+    get_serena_ignore,
+    get_serena_index_path,
+    get_serena_jobs,
+    get_serena_max_depth,
+    get_serena_rescan_interval,
+    get_trash_grace_period,
+    parse_duration,
+)
+
+# bump to invalidate indexes written by older versions
+_INDEX_FORMAT = 1
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 class SerenaHandler(CleanupHandler):
@@ -17,95 +40,302 @@ class SerenaHandler(CleanupHandler):
         """Get root directory for scanning Serena memory files."""
         return get_path("serena_memories_root")
 
-    def _find_serena_dirs(self) -> list[Path]:
-        """Find all .serena/memories directories under memories root.
+    def _find_serena_dirs(self, rescan: bool = False) -> list[Path]:
+        """Find all .serena/memories directories under memories root, using the persisted index.
+
+        The index (see get_serena_index_path()) lists known memories directories, plus the mtime of
+        each of the memories root's direct children (i.e. projects). Each run, known directories are
+        re-checked (two lstat() calls each), and only children that are new or whose mtime changed
+        (an entry such as .serena was added or removed directly inside them) are scanned. The whole
+        root is scanned when the index is missing or stale, once serena.rescan_interval has passed
+        since the last full scan, or if rescan is set.
 
-        Skips directories reached via symlinks to avoid scanning
-        unintended locations outside the memories root.
+        A .serena directory created deeper inside a known project (e.g. <project>/packages/app/.serena)
+        leaves the project's mtime unchanged, so it's only found by the next full scan.
+
+        Children are scanned, and known directories re-checked, on up to serena.jobs threads.
         """
-        serena_dirs: list[Path] = []
         memories_root = self._get_memories_root()
 
         if not memories_root.exists():
-            return serena_dirs
+            return []
+
+        children = self._list_children(memories_root)
+        index = self._load_index(memories_root)
+        now = datetime.now(timezone.utc)
+
+        if rescan or index is None or now - index["full_scan_at"] >= parse_duration(get_serena_rescan_interval()):
+            memories_dirs = set(self._scan_children(memories_root, list(children)))
+            full_scan_at = now
+        else:
+            known = index["memories_dirs"]
+            memories_dirs = {path for path, valid in zip(known, self._map(self._is_memories_dir, known)) if valid}
+            changed = [name for name, mtime_ns in children.items() if index["children"].get(name) != mtime_ns]
+            memories_dirs.update(self._scan_children(memories_root, changed))
+            full_scan_at = index["full_scan_at"]
+
+        serena_dirs = sorted(memories_dirs)
+        self._save_index(memories_root, full_scan_at, children, serena_dirs)
+        return serena_dirs
+
+    def rescan_index(self) -> dict[str, Any]:
+        """Rescan the whole memories root, rebuilding the index of memories directories.
+
+        Returns:
+            Dict with the count of memories directories found, or an error.
+        """
+        try:
+            return {"storage": self.name, "memories_dirs": len(self._find_serena_dirs(rescan=True))}
+        except OSError as e:
+            return {"storage": self.name, "error": f"Failed to scan for Serena memories: {e}"}
 
-        # search for .serena/memories directories
-        for serena_dir in memories_root.rglob(".serena"):
-            # skip if .serena itself is a symlink
-            if serena_dir.is_symlink():
-                continue
+    def _scan_children(self, memories_root: Path, names: list[str]) -> list[Path]:
+        """Find all .serena/memories directories in the named children of memories root, one task per child."""
+        found = self._map(lambda name: self._scan_for_serena_dirs(memories_root, memories_root / name), names)
+        return [memories_dir for memories_dirs in found for memories_dir in memories_dirs]
+
+    def _map(self, fn: Callable[[T], R], items: list[T]) -> list[R]:
+        """Apply fn to each item on up to serena.jobs threads, returning results in items' order.
+
+        (Filesystem calls release the GIL, so this pays off when each one is slow, e.g. on network
+        or FUSE mounts.) If any call raises, the first exception (in items' order) is re-raised
+        once all calls have finished.
+        """
+        jobs = min(get_serena_jobs(), len(items))
+        if jobs <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix=f"cleanup-{self.name}") as pool:
+            # (unlike pool.map(), a failed call doesn't cancel the calls still queued)
+            futures = [pool.submit(fn, item) for item in items]
+            return [future.result() for future in futures]
 
-            # skip if any parent in the path is a symlink
+    def _scan_for_serena_dirs(self, memories_root: Path, subtree: Path) -> list[Path]:
+        """Find all .serena/memories directories in a subtree of memories root.
+
+        Walks with os.scandir(), never following symlinks (so nothing outside the memories root is
+        reached), skipping directories whose names match serena.ignore, and looking no deeper than
+        serena.max_depth levels below memories root.
+        """
+        ignored = self._ignore_pattern()
+        max_depth = get_serena_max_depth()
+
+        serena_dirs: list[Path] = []
+        if subtree == memories_root:
+            stack = [(str(memories_root), 0)]
+        else:
+            # a direct child of the root, rescanned on its own (see _find_serena_dirs())
+            if subtree.name == ".serena":
+                return [subtree / "memories"] if self._is_memories_dir(subtree / "memories") else []
             try:
-                rel_path = serena_dir.relative_to(memories_root)
-                current = memories_root
-                followed_symlink = False
-                for part in rel_path.parts:
-                    current = current / part
-                    if current.is_symlink():
-                        followed_symlink = True
-                        break
-                if followed_symlink:
-                    continue
-            except ValueError:
-                continue  # not relative to memories_root, skip
+                if not stat.S_ISDIR(os.lstat(subtree).st_mode):
+                    return []
+            except OSError:
+                return []
+            if max_depth < 2 or (ignored and ignored.match(subtree.name)):
+                return []
+            stack = [(str(subtree), 1)]
 
-            memories_dir = serena_dir / "memories"
-            if memories_dir.exists() and memories_dir.is_dir():
-                serena_dirs.append(memories_dir)
+        while stack:
+            path, depth = stack.pop()
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        # DirEntry.is_dir() uses the type read with the directory listing (no stat)
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                        if entry.name == ".serena":
+                            memories_dir = Path(entry.path, "memories")
+                            if self._is_memories_dir(memories_dir):
+                                serena_dirs.append(memories_dir)
+                        elif depth + 2 <= max_depth and not (ignored and ignored.match(entry.name)):
+                            stack.append((entry.path, depth + 1))
+            except OSError:
+                continue  # unreadable or since removed (rglob skipped these too)
 
         return serena_dirs
 
+    def _ignore_pattern(self) -> re.Pattern[str] | None:
+        """Compile serena.ignore's globs into one pattern matching ignored directory names."""
+        patterns = get_serena_ignore()
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+    def _list_children(self, memories_root: Path) -> dict[str, int]:
+        """Return the mtime (ns) of each directory directly under memories root (symlinks excluded)."""
+        children = {}
+        with os.scandir(memories_root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    children[entry.name] = entry.stat(follow_symlinks=False).st_mtime_ns
+        return children
+
+    def _is_memories_dir(self, path: Path) -> bool:
+        """Check a memories directory is a real directory (not a symlink) in a real .serena directory."""
+        try:
+            return all(stat.S_ISDIR(os.lstat(p).st_mode) for p in (path, path.parent))
+        except OSError:
+            return False
+
+    def _load_index(self, memories_root: Path) -> dict[str, Any] | None:
+        """Load the index of memories directories, or None if missing, corrupt or built for another root
+        (or with other serena.ignore/max_depth settings)."""
+        try:
+            with open(get_serena_index_path()) as f:
+                index = json.load(f)
+            if index.get("format") != _INDEX_FORMAT or index.get("scan") != self._scan_settings(memories_root):
+                return None
+            return {
+                "full_scan_at": datetime.fromisoformat(index["full_scan_at"]),
+                "children": dict(index["children"]),
+                "memories_dirs": [Path(path) for path in index["memories_dirs"]],
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _save_index(self, memories_root: Path, full_scan_at: datetime, children: dict[str, int],
+                    memories_dirs: list[Path]) -> None:
+        """Atomically write the index; failures are ignored (the index is only a cache)."""
+        index = {
+            "format": _INDEX_FORMAT,
+            "scan": self._scan_settings(memories_root),
+            "full_scan_at": full_scan_at.isoformat(),
+            "children": children,
+            "memories_dirs": [str(path) for path in memories_dirs],
+        }
+        index_path = get_serena_index_path()
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def _scan_settings(self, memories_root: Path) -> dict[str, Any]:
+        """Settings an index was built with (it's rebuilt when they change)."""
+        return {"root": str(memories_root), "ignore": get_serena_ignore(), "max_depth": get_serena_max_depth()}
+
+    def _iter_memory_files(self, memories_dir: Path) -> Iterator[os.DirEntry[str]]:
+        """Yield the *.md memory files in a memories directory.
+
+        Entries cache their stat() result, so each file is stat'ed at most once.
+        """
+        with os.scandir(memories_dir) as entries:
+            for entry in entries:
+                if is_memory_file(entry.name) and entry.is_file():
+                    yield entry
+
     def get_stale_items(self, cutoff: datetime) -> list[dict[str, Any]]:
         """Find memory files older than cutoff based on mtime.
 
+        While `sweep --watch` keeps the inventory of memory files up to date, stale files are
+        looked up in it instead of scanning (see _stale_items_from_inventory()).
+
         Raises:
             CleanupError: On file system errors.
         """
+        inventory = load_live_inventory(self._scan_settings(self._get_memories_root()))
+        if inventory is not None:
+            return self._stale_items_from_inventory(inventory, cutoff)
+
         try:
-            items = []
             cutoff_timestamp = cutoff.timestamp()
+            return self._list_memory_items(lambda st: st.st_mtime < cutoff_timestamp)
+        except OSError as e:
+            raise CleanupError(f"Failed to scan Serena memories: {e}") from e
 
-            for memories_dir in self._find_serena_dirs():
-                # grandparent will be the project name since the memories dir
-                #   will always be at <project>/.serena/memories
-                project_name = memories_dir.parent.parent.name
-
-                for memory_file in memories_dir.glob("*.md"):
-                    mtime = memory_file.stat().st_mtime
-                    if mtime < cutoff_timestamp:
-                        items.append({
-                            "path": memory_file,
-                            "project": project_name,
-                            "mtime": datetime.fromtimestamp(mtime, tz=timezone.utc),
-                            "size": memory_file.stat().st_size,
-                        })
+    def _list_memory_items(self, include: Callable[[os.stat_result], bool]) -> list[dict[str, Any]]:
+        """List the memory files (with their stat() results) include accepts, across all memories
+        directories, listing directories on up to serena.jobs threads."""
+        def list_dir(memories_dir: Path) -> list[dict[str, Any]]:
+            # grandparent will be the project name since the memories dir
+            #   will always be at <project>/.serena/memories
+            project_name = memories_dir.parent.parent.name
 
+            items = []
+            for entry in self._iter_memory_files(memories_dir):
+                st = entry.stat()
+                if include(st):
+                    items.append({
+                        "path": Path(entry.path),
+                        "project": project_name,
+                        "mtime": datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+                        "size": st.st_size,
+                    })
             return items
-        except OSError as e:
-            raise CleanupError(f"Failed to scan Serena memories: {e}") from e
+
+        return [item for items in self._map(list_dir, self._find_serena_dirs()) for item in items]
+
+    def _stale_items_from_inventory(self, inventory: MtimeTable, cutoff: datetime) -> list[dict[str, Any]]:
+        """Find memory files older than cutoff using a watcher's inventory.
+
+        Each candidate is stat'ed again before it's returned, since the watcher may not have
+        recorded the very latest changes yet (files modified since are no longer stale).
+        """
+        items = []
+        cutoff_timestamp = cutoff.timestamp()
+
+        for path, _, _ in inventory.older_than(int(cutoff_timestamp * 1_000_000_000)):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue  # since removed
+            except OSError as e:
+                raise CleanupError(f"Failed to scan Serena memories: {e}") from e
+            if st.st_mtime < cutoff_timestamp:
+                memory_file = Path(path)
+                items.append({
+                    "path": memory_file,
+                    # <project>/.serena/memories/<file>
+                    "project": memory_file.parent.parent.parent.name,
+                    "mtime": datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+                    "size": st.st_size,
+                })
+
+        return items
 
     def export_items_to_trash(self, items: list[dict[str, Any]], retention: str) -> str:
-        """Move files to trash, preserving project structure.
+        """Move files to trash, preserving project structure (projects moved on up to serena.jobs threads).
 
         Raises:
             CleanupError: On file system errors.
         """
-        try:
-            trash_dir = get_trash_dir(self.name)
-            moved_files: list[Path] = []
-
-            for item in items:
-                dest = move_to_trash(item["path"], self.name, project_name=item["project"])
-                moved_files.append(dest)
+        trash_dir = get_trash_dir(self.name)
+        moved_files: list[Path | None] = [None] * len(items)
 
-            write_manifest(trash_dir, self.name, len(items), retention,
-                           get_trash_grace_period(),
-                           files=moved_files)
+        def move(index: int) -> None:
+            moved_files[index] = move_to_trash(items[index]["path"], self.name,
+                                               project_name=items[index]["project"])
 
-            return str(trash_dir)
+        try:
+            self._per_project(list(range(len(items))), lambda index: items[index]["project"], move)
         except OSError as e:
             raise CleanupError(f"Failed to move files to trash: {e}") from e
+        finally:
+            # one manifest entry per run, listing files in items' order (and whatever was moved,
+            #   even if some files failed)
+            moved = [path for path in moved_files if path is not None]
+            if moved:
+                write_manifest(trash_dir, self.name, len(moved), retention,
+                               get_trash_grace_period(),
+                               files=moved)
+
+        return str(trash_dir)
+
+    def _per_project(self, items: list[T], project: Callable[[T], str], fn: Callable[[T], Any]) -> None:
+        """Call fn on each item, one task per project (serially within each project, so a
+        project's files still land in its trash directory one at a time)."""
+        by_project: dict[str, list[T]] = {}
+        for item in items:
+            by_project.setdefault(project(item), []).append(item)
+
+        def run(project_items: list[T]) -> None:
+            for item in project_items:
+                fn(item)
+
+        self._map(run, list(by_project.values()))
 
     def delete_items_from_storage(self, items: list[dict[str, Any]]) -> int:
         """Files already moved by export_items_to_trash, just return count."""
@@ -119,19 +349,7 @@ class SerenaHandler(CleanupHandler):
             CleanupError: On file system errors.
         """
         try:
-            items = []
-
-            for memories_dir in self._find_serena_dirs():
-                project_name = memories_dir.parent.parent.name
-
-                for memory_file in memories_dir.glob("*.md"):
-                    mtime = memory_file.stat().st_mtime
-                    items.append({
-                        "path": memory_file,
-                        "project": project_name,
-                        "mtime": datetime.fromtimestamp(mtime, tz=timezone.utc),
-                        "size": memory_file.stat().st_size,
-                    })
+            items = self._list_memory_items(lambda st: True)
 
             if not items:
                 return {"storage": self.name, "wiped": 0, "message": "no memory files found"}
@@ -141,8 +359,7 @@ class SerenaHandler(CleanupHandler):
             if backup:
                 backup_path = self.export_items_to_trash(items, "wipe")
             else:
-                for item in items:
-                    Path(str(item["path"])).unlink()
+                self._per_project(items, lambda item: item["project"], lambda item: Path(str(item["path"])).unlink())
 
             result: dict[str, Any] = {"storage": self.name, "wiped": len(items)}
             if backup_path:
@@ -150,3 +367,63 @@ class SerenaHandler(CleanupHandler):
             return result
         except OSError as e:
             raise CleanupError(f"Failed to wipe Serena memories: {e}") from e
+
+    def _wipe_fast(self, backup: bool) -> dict[str, Any]:
+        """Erase all Serena memories by moving each project's whole memories directory at once.
+
+        With a backup, each directory is renamed into trash (as <project>/<timestamp>_<N>-items.memories);
+        without one, it's renamed aside and then removed. Either way an empty memories directory takes
+        its place, as _wipe() leaves. Unlike _wipe(), files other than *.md memories go too.
+
+        Raises:
+            CleanupError: On file system errors.
+        """
+        total_count = 0
+        moved_dirs: list[Path] = []
+        try:
+            for memories_dir in self._find_serena_dirs():
+                count = sum(1 for _ in self._iter_memory_files(memories_dir))
+                if not count:
+                    continue
+
+                if backup:
+                    moved_dirs.append(self._move_memories_dir_to_trash(memories_dir, count))
+                else:
+                    doomed = memories_dir.with_name(".memories-wiped")
+                    memories_dir.rename(doomed)
+                    memories_dir.mkdir()
+                    shutil.rmtree(doomed)
+                total_count += count
+        except OSError as e:
+            raise CleanupError(f"Failed to wipe Serena memories: {e}") from e
+        finally:
+            # record whatever was moved, even if a later directory failed
+            if moved_dirs:
+                write_manifest(get_trash_dir(self.name), self.name, total_count, "wipe",
+                               get_trash_grace_period(),
+                               files=moved_dirs)
+
+        if not total_count:
+            return {"storage": self.name, "wiped": 0, "message": "no memory files found"}
+
+        result: dict[str, Any] = {"storage": self.name, "wiped": total_count}
+        if backup:
+            result["backup_path"] = str(get_trash_dir(self.name))
+        return result
+
+    def _move_memories_dir_to_trash(self, memories_dir: Path, count: int) -> Path:
+        """Move a whole memories directory into trash (leaving an empty one behind), returning its new path."""
+        project_dir = get_trash_dir(self.name) / memories_dir.parent.parent.name
+        project_dir.mkdir(exist_ok=True)
+
+        dest = project_dir / generate_trash_filename(count, "memories")
+        suffix = 1
+        while dest.exists():
+            # another project with the same name was wiped within the same second
+            suffix += 1
+            dest = project_dir / generate_trash_filename(count, f"memories-{suffix}")
+
+        # a rename unless the trash is on another filesystem
+        shutil.move(str(memories_dir), str(dest))
+        memories_dir.mkdir()
+        return dest
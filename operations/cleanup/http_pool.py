@@ -0,0 +1,159 @@
+"""Small keep-alive HTTP connection pool used by handlers talking to local REST services."""
+import http.client
+import threading
+from typing import BinaryIO, Iterable
+from urllib.parse import urlsplit
+
+
+# errors raised when a kept-alive connection was closed by the server while idle
+#   (the request is retried once on a fresh connection)
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+# methods safe to send twice (RFC 9110), which may reuse an idle connection and be retried
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+# bytes read at a time when streaming a response body to a file
+_STREAM_CHUNK_SIZE = 1 << 20
+
+
+class HTTPConnectionPool:
+    """Pool of persistent HTTP/1.1 connections to a single host.
+
+    Connections are kept open between requests and reused, so a run of many small requests
+    (e.g. paging through a scroll API) pays for one TCP handshake instead of one per request.
+    Connections the server has since closed are replaced transparently: an idempotent request
+    failing on one is resent on a new connection, while other requests always get a new one
+    (the server may have acted on a request whose response was lost, so it can't be resent).
+
+    Safe to share between threads: each request checks out its own connection.
+    """
+
+    def __init__(self, base_url: str, connect_timeout: float = 5, request_timeout: float = 30,
+                 max_idle: int = 4):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+
+        self.scheme = parts.scheme
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.max_idle = max_idle
+
+        # number of connections opened over the pool's lifetime (reuse means this stays small)
+        self.connections_opened = 0
+
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        conn_cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        conn = conn_cls(self.host, self.port, timeout=self.connect_timeout)
+        conn.connect()
+
+        # connect_timeout only bounds the handshake: use request_timeout for everything after it
+        if conn.sock is not None:
+            conn.sock.settimeout(self.request_timeout)
+
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _checkout(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Return an idle connection (and True) if one is available, else a new one (and False)."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._new_connection(), False
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method: str, path: str, body: bytes | Iterable[bytes] | None = None,
+                headers: dict[str, str] | None = None,
+                sink: BinaryIO | None = None,
+                timeout: float | None = None,
+                idempotent: bool | None = None) -> tuple[int, str, bytes]:
+        """Send a request, returning (status code, reason phrase, response body).
+
+        Args:
+            body: Request body; an iterable of byte chunks is streamed (on a new connection,
+                since a partly sent body can't be retried).
+            sink: If given, a successful (2xx) response body is streamed into it in chunks
+                rather than returned (b"" is returned in its place).
+            timeout: Overrides request_timeout for this request (e.g. for slow server-side operations).
+            idempotent: Whether the request is safe to send twice, i.e. may use an idle connection
+                and be retried if that turns out closed (default: by method; e.g. read-only POSTs
+                can opt in). Other requests are sent once, on a new connection.
+
+        Raises:
+            OSError: On connection failures and timeouts.
+            http.client.HTTPException: On malformed responses.
+        """
+        if idempotent is None:
+            idempotent = method in _IDEMPOTENT_METHODS
+        if idempotent and (body is None or isinstance(body, bytes)):
+            conn, reused = self._checkout()
+        else:
+            conn, reused = self._new_connection(), False
+
+        sink_start = sink.tell() if sink is not None else 0
+        try:
+            try:
+                response = self._send(conn, method, path, body, headers, sink, timeout)
+            except _STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                # server closed the idle connection: retry once on a fresh one
+                conn.close()
+                if sink is not None:
+                    sink.seek(sink_start)
+                    sink.truncate()
+                conn = self._new_connection()
+                response = self._send(conn, method, path, body, headers, sink, timeout)
+        except BaseException:
+            conn.close()
+            raise
+
+        status, reason, data, will_close = response
+        if will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+        return status, reason, data
+
+    def _send(self, conn: http.client.HTTPConnection, method: str, path: str,
+              body: bytes | Iterable[bytes] | None, headers: dict[str, str] | None,
+              sink: BinaryIO | None, timeout: float | None) -> tuple[int, str, bytes, bool]:
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout if timeout is not None else self.request_timeout)
+
+        conn.request(method, f"{self.base_path}{path}", body=body, headers=headers or {})
+        resp = conn.getresponse()
+
+        # the body must be read in full before the connection can be reused
+        if sink is not None and 200 <= resp.status < 300:
+            while chunk := resp.read(_STREAM_CHUNK_SIZE):
+                sink.write(chunk)
+            data = b""
+        else:
+            data = resp.read()
+        return resp.status, resp.reason, data, resp.will_close
+
+    def close(self) -> None:
+        """Close all idle connections (the pool remains usable and reconnects on demand)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,135 @@
+"""Minimal binding to Linux's inotify API, via ctypes (so no native dependency is needed)."""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+from typing import NamedTuple
+
+# event masks (from <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+
+# struct inotify_event header: wd, mask, cookie, len (followed by a NUL-padded name of len bytes)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+_libc: ctypes.CDLL | None = None
+
+
+class InotifyEvent(NamedTuple):
+    wd: int
+    mask: int
+    cookie: int
+    name: str  # empty for events on the watched directory itself
+
+
+class WatchLimitError(OSError):
+    """Raised when a watch can't be added because the user's inotify watch limit
+    (fs.inotify.max_user_watches) has been reached."""
+    pass
+
+
+def _load_libc() -> ctypes.CDLL:
+    global _libc
+    if _libc is None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        try:
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        except AttributeError:
+            raise OSError(errno.ENOSYS, "libc has no inotify support")
+        _libc = libc
+    return _libc
+
+
+def _raise_errno(filename: str | None = None) -> None:
+    err = ctypes.get_errno()
+    if err == errno.ENOSPC:
+        raise WatchLimitError(err, "inotify watch limit reached (fs.inotify.max_user_watches)", filename)
+    raise OSError(err, os.strerror(err), filename)
+
+
+class Inotify:
+    """An inotify instance: a set of watches, and the queue of events they produce.
+
+    Raises:
+        OSError: If inotify isn't available (not Linux), or the instance couldn't be created.
+    """
+
+    def __init__(self) -> None:
+        self._libc = _load_libc()
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            _raise_errno()
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Watch path for the events in mask, returning the watch descriptor.
+
+        Raises:
+            WatchLimitError: If the user's watch limit has been reached.
+            OSError: If path can't be watched (e.g. it doesn't exist).
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            _raise_errno(path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """Stop watching (ignored if the watch was already removed, e.g. its directory was deleted)."""
+        if self._libc.inotify_rm_watch(self._fd, wd) < 0 and ctypes.get_errno() != errno.EINVAL:
+            _raise_errno()
+
+    def read_events(self, timeout: float | None = None) -> list[InotifyEvent]:
+        """Return queued events, waiting up to timeout seconds (None: indefinitely) for the first one."""
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        if not poller.poll(None if timeout is None else int(timeout * 1000)):
+            return []
+
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            # each read returns whole events
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                events.append(InotifyEvent(wd, mask, cookie, name))
+        return events
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> "Inotify":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
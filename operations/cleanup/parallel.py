@@ -0,0 +1,109 @@
+"""Concurrent execution of independent cleanup tasks with per-task deadlines."""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+
+@dataclass
+class TaskOutcome:
+    """Outcome of one task run via run_with_deadlines()."""
+    name: str
+    result: Any = None
+    error: BaseException | None = None
+    timed_out: bool = False
+    elapsed: float = 0.0  # seconds since the task started running
+    # set once the task's callable has returned (later than the outcome, for abandoned tasks)
+    finished: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
+
+
+def run_with_deadlines(
+    tasks: Sequence[tuple[str, Callable[[], Any]]],
+    jobs: int = 1,
+    timeout: float | None = None,
+    on_timeout: Callable[[int], None] | None = None,
+) -> list[TaskOutcome]:
+    """Run (name, fn) tasks on up to `jobs` threads, giving each `timeout` seconds once started.
+
+    Tasks still running past their deadline are abandoned (reported as timed out) and their
+    slot is handed to the next queued task. Abandoned tasks keep running on daemon threads,
+    so they can't block the remaining tasks or interpreter exit: `on_timeout` is the hook for
+    asking them to stop, and wait_for_abandoned() for waiting until they have.
+
+    Args:
+        tasks: (name, zero-arg callable) pairs.
+        jobs: Max number of tasks running at once (values < 1 are treated as 1).
+        timeout: Seconds each task may run for; None for no deadline.
+        on_timeout: Called with a task's index as it's abandoned (while holding an internal
+            lock, so it should only signal the task, e.g. set a cancel flag).
+
+    Returns:
+        One TaskOutcome per task, in the same order as `tasks`.
+    """
+    cond = threading.Condition()
+    slots = threading.Semaphore(max(1, jobs))
+    started_at: list[float | None] = [None] * len(tasks)
+    outcomes: list[TaskOutcome | None] = [None] * len(tasks)
+
+    def worker(index: int, name: str, fn: Callable[[], Any]) -> None:
+        slots.acquire()
+        with cond:
+            started_at[index] = time.monotonic()
+            cond.notify_all()
+
+        outcome = TaskOutcome(name)
+        try:
+            outcome.result = fn()
+        except BaseException as e:  # reported to the caller, like any other task error
+            outcome.error = e
+
+        with cond:
+            # publish only if the task wasn't already abandoned for missing its deadline
+            abandoned = outcomes[index]
+            if abandoned is None:
+                outcome.elapsed = time.monotonic() - (started_at[index] or 0.0)
+                outcomes[index] = outcome
+                slots.release()
+            (abandoned or outcome).finished.set()
+            cond.notify_all()
+
+    for index, (name, fn) in enumerate(tasks):
+        threading.Thread(
+            target=worker, args=(index, name, fn), name=f"cleanup-{name}", daemon=True
+        ).start()
+
+    with cond:
+        while any(outcome is None for outcome in outcomes):
+            now = time.monotonic()
+            next_deadline: float | None = None
+
+            for index, start in enumerate(started_at):
+                if outcomes[index] is not None or start is None or timeout is None:
+                    continue
+                deadline = start + timeout
+                if now >= deadline:
+                    outcomes[index] = TaskOutcome(tasks[index][0], timed_out=True, elapsed=now - start)
+                    slots.release()
+                    if on_timeout is not None:
+                        on_timeout(index)
+                elif next_deadline is None or deadline < next_deadline:
+                    next_deadline = deadline
+
+            if any(outcome is None for outcome in outcomes):
+                # woken early by any task starting or finishing
+                cond.wait(None if next_deadline is None else next_deadline - now)
+
+    return [outcome for outcome in outcomes if outcome is not None]
+
+
+def wait_for_abandoned(outcomes: Sequence[TaskOutcome], timeout: float) -> list[str]:
+    """Wait up to `timeout` seconds (in total) for timed-out tasks to actually return.
+
+    Returns:
+        Names of the timed-out tasks still running afterwards.
+    """
+    deadline = time.monotonic() + timeout
+    for outcome in outcomes:
+        if outcome.timed_out:
+            outcome.finished.wait(max(0.0, deadline - time.monotonic()))
+    return [outcome.name for outcome in outcomes if outcome.timed_out and not outcome.finished.is_set()]
@@ -0,0 +1,152 @@
+"""Inventory of Serena memory files' mtimes, kept up to date by `sweep --watch` (see serena_watch)."""
+import bisect
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+from ..config_loader import get_serena_inventory_path, get_serena_watch_poll_interval
+
+# bump to invalidate inventories written by older versions
+_INVENTORY_FORMAT = 1
+
+
+def is_memory_file(name: str) -> bool:
+    """Check a file name is a memory's (*.md, as glob("*.md") matched: no hidden files)."""
+    return name.endswith(".md") and not name.startswith(".")
+
+
+class MtimeTable:
+    """Memory files' mtimes and sizes, grouped by memories directory.
+
+    Also kept sorted by mtime, so the files older than a cutoff are found by bisection
+    rather than by stat'ing every file.
+    """
+
+    def __init__(self) -> None:
+        # memories directory -> file name -> (mtime_ns, size)
+        self._dirs: dict[str, dict[str, tuple[int, int]]] = {}
+        # (mtime_ns, path) of every file, sorted
+        self._by_mtime: list[tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._by_mtime)
+
+    def dirs(self) -> list[str]:
+        return list(self._dirs)
+
+    def set(self, directory: str, name: str, mtime_ns: int, size: int) -> bool:
+        """Record a file's mtime and size, returning whether anything changed."""
+        files = self._dirs.setdefault(directory, {})
+        old = files.get(name)
+        if old == (mtime_ns, size):
+            return False
+        path = os.path.join(directory, name)
+        if old is not None:
+            self._remove_sorted(old[0], path)
+        files[name] = (mtime_ns, size)
+        bisect.insort(self._by_mtime, (mtime_ns, path))
+        return True
+
+    def discard(self, directory: str, name: str) -> bool:
+        """Forget a file, returning whether it was known."""
+        old = self._dirs.get(directory, {}).pop(name, None)
+        if old is None:
+            return False
+        self._remove_sorted(old[0], os.path.join(directory, name))
+        return True
+
+    def replace_dir(self, directory: str, files: dict[str, tuple[int, int]]) -> bool:
+        """Replace what's known about a memories directory with a fresh listing, returning whether anything changed."""
+        if self._dirs.get(directory) == files:
+            return False
+        self.discard_dir(directory)
+        for name, (mtime_ns, size) in files.items():
+            self.set(directory, name, mtime_ns, size)
+        return True
+
+    def discard_dir(self, directory: str) -> bool:
+        """Forget a memories directory and its files, returning whether it was known."""
+        files = self._dirs.pop(directory, None)
+        if files is None:
+            return False
+        for name, (mtime_ns, _) in files.items():
+            self._remove_sorted(mtime_ns, os.path.join(directory, name))
+        return True
+
+    def older_than(self, cutoff_ns: int) -> Iterator[tuple[str, int, int]]:
+        """Yield (path, mtime_ns, size) of the files last modified before cutoff_ns, oldest first."""
+        end = bisect.bisect_left(self._by_mtime, (cutoff_ns, ""))
+        for mtime_ns, path in self._by_mtime[:end]:
+            directory, name = os.path.split(path)
+            yield path, mtime_ns, self._dirs[directory][name][1]
+
+    def _remove_sorted(self, mtime_ns: int, path: str) -> None:
+        index = bisect.bisect_left(self._by_mtime, (mtime_ns, path))
+        del self._by_mtime[index]
+
+    def to_json(self) -> dict[str, dict[str, list[int]]]:
+        return {directory: {name: list(entry) for name, entry in files.items()}
+                for directory, files in self._dirs.items()}
+
+    @classmethod
+    def from_json(cls, data: dict[str, dict[str, list[int]]]) -> "MtimeTable":
+        table = cls()
+        for directory, files in data.items():
+            table._dirs[directory] = {name: (int(mtime_ns), int(size)) for name, (mtime_ns, size) in files.items()}
+            table._by_mtime.extend((mtime_ns, os.path.join(directory, name))
+                                   for name, (mtime_ns, _) in table._dirs[directory].items())
+        table._by_mtime.sort()
+        return table
+
+
+def save_inventory(table: MtimeTable, scan_settings: dict[str, Any], watcher_pid: int | None) -> None:
+    """Atomically write the inventory; failures are ignored (cleanup falls back to scanning)."""
+    inventory = {
+        "format": _INVENTORY_FORMAT,
+        "scan": scan_settings,
+        # while the watcher runs, it rewrites the inventory at least every serena.watch_poll_interval
+        "watcher": {"pid": watcher_pid, "heartbeat": datetime.now(timezone.utc).isoformat()},
+        "files": table.to_json(),
+    }
+    inventory_path = get_serena_inventory_path()
+    tmp_path = inventory_path.with_name(f"{inventory_path.name}.{os.getpid()}.tmp")
+    try:
+        inventory_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(inventory, f, separators=(",", ":"))
+        os.replace(tmp_path, inventory_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_live_inventory(scan_settings: dict[str, Any]) -> MtimeTable | None:
+    """Load the inventory if a watcher is still keeping it up to date (with the same scan settings).
+
+    Returns None if there's no inventory, or it's corrupt, was built with other settings, or its
+    watcher has stopped (exited, or missed two heartbeats).
+    """
+    try:
+        with open(get_serena_inventory_path()) as f:
+            inventory = json.load(f)
+        if inventory.get("format") != _INVENTORY_FORMAT or inventory.get("scan") != scan_settings:
+            return None
+        pid = inventory["watcher"]["pid"]
+        heartbeat = datetime.fromisoformat(inventory["watcher"]["heartbeat"])
+        if pid is None or not _is_running(int(pid)):
+            return None
+        if datetime.now(timezone.utc) - heartbeat > timedelta(seconds=2 * get_serena_watch_poll_interval()):
+            return None
+        return MtimeTable.from_json(inventory["files"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # running, as another user
+    return True
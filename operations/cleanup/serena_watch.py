@@ -0,0 +1,190 @@
+"""Watch Serena memories directories with inotify, keeping an inventory of memory files' mtimes.
+
+While `sweep --watch` runs, cleanup finds stale Serena memories by looking them up in the inventory
+(see serena_inventory) instead of scanning the memories root and stat'ing every memory file.
+"""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from .handlers.serena import SerenaHandler
+from .inotify import (
+    IN_ATTRIB,
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_DELETE,
+    IN_DELETE_SELF,
+    IN_DONT_FOLLOW,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MODIFY,
+    IN_MOVE_SELF,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+    Inotify,
+    InotifyEvent,
+    WatchLimitError,
+)
+from .serena_inventory import MtimeTable, is_memory_file, save_inventory
+from ..config_loader import get_serena_watch_poll_interval
+
+logger = logging.getLogger(__name__)
+
+_WATCH_MASK = (
+    IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_ATTRIB | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW
+)
+_REMOVED = IN_DELETE | IN_MOVED_FROM
+_DIR_GONE = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+
+# seconds to wait for events before checking whether to stop (or poll)
+_READ_TIMEOUT = 1.0
+
+
+class SerenaWatcher:
+    """Keeps the inventory of memory files up to date until stopped.
+
+    Each known memories directory gets an inotify watch. Every serena.watch_poll_interval seconds,
+    memories directories are looked for again (see SerenaHandler._find_serena_dirs()), and any
+    that couldn't be watched because fs.inotify.max_user_watches was reached are rescanned instead.
+    """
+
+    def __init__(self, handler: SerenaHandler | None = None):
+        self.handler = handler or SerenaHandler()
+        self.table = MtimeTable()
+        self.poll_interval = get_serena_watch_poll_interval()
+        self._inotify: Inotify | None = None
+        self._dir_by_wd: dict[int, str] = {}
+        self._wd_by_dir: dict[str, int] = {}
+        # memories directories rescanned every poll, as they couldn't be watched
+        self.polled: set[str] = set()
+        self._next_poll = 0.0
+        self._dirty = False
+
+    @property
+    def watched(self) -> list[str]:
+        return list(self._wd_by_dir)
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """Watch until stop is set (or the process is interrupted).
+
+        Raises:
+            OSError: If inotify isn't available, or the memories root can't be scanned.
+        """
+        stop = stop or threading.Event()
+        scan_settings = self.handler._scan_settings(self.handler._get_memories_root())
+        with Inotify() as inotify:
+            self._inotify = inotify
+            try:
+                while not stop.is_set():
+                    if time.monotonic() >= self._next_poll:
+                        self._poll()
+                        save_inventory(self.table, scan_settings, os.getpid())
+                        self._dirty = False
+                    self._handle_events(inotify.read_events(_READ_TIMEOUT))
+                    if self._dirty:
+                        save_inventory(self.table, scan_settings, os.getpid())
+                        self._dirty = False
+            finally:
+                # no longer live: cleanup goes back to scanning
+                save_inventory(self.table, scan_settings, None)
+                self._inotify = None
+
+    def _poll(self) -> None:
+        """Watch newly found memories directories, forget removed ones, and rescan unwatched ones."""
+        memories_dirs = {str(path) for path in self.handler._find_serena_dirs()}
+
+        for directory in [d for d in self._wd_by_dir if d not in memories_dirs]:
+            self._unwatch(directory)
+        for directory in self.table.dirs():
+            if directory not in memories_dirs:
+                self.table.discard_dir(directory)
+                self._dirty = True
+        self.polled &= memories_dirs
+
+        limit_hit = False
+        for directory in sorted(memories_dirs):
+            if directory in self._wd_by_dir:
+                continue
+            if not limit_hit:
+                try:
+                    self._watch(directory)
+                    self.polled.discard(directory)
+                except WatchLimitError:
+                    limit_hit = True
+                except OSError:
+                    continue  # removed since it was found
+            if limit_hit:
+                self.polled.add(directory)
+            # (first) listing of a newly watched directory, taken after its watch was added so nothing is missed
+            self._rescan(directory)
+
+        if limit_hit:
+            logger.warning(
+                "inotify watch limit reached (fs.inotify.max_user_watches): rescanning %d Serena "
+                "memories directories every %ds instead", len(self.polled), self.poll_interval
+            )
+        self._next_poll = time.monotonic() + self.poll_interval
+
+    def _watch(self, directory: str) -> None:
+        assert self._inotify is not None
+        wd = self._inotify.add_watch(directory, _WATCH_MASK)
+        self._dir_by_wd[wd] = directory
+        self._wd_by_dir[directory] = wd
+
+    def _unwatch(self, directory: str) -> None:
+        wd = self._wd_by_dir.pop(directory, None)
+        if wd is None:
+            return
+        self._dir_by_wd.pop(wd, None)
+        if self._inotify is not None:
+            self._inotify.rm_watch(wd)
+
+    def _rescan(self, directory: str) -> None:
+        """Replace a directory's entries in the table with a fresh listing."""
+        files: dict[str, tuple[int, int]] = {}
+        try:
+            for entry in self.handler._iter_memory_files(Path(directory)):
+                st = entry.stat()
+                files[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            self._dirty |= self.table.discard_dir(directory)
+            return
+        self._dirty |= self.table.replace_dir(directory, files)
+
+    def _handle_events(self, events: list[InotifyEvent]) -> None:
+        for event in events:
+            if event.mask & IN_Q_OVERFLOW:
+                # events were dropped: relist everything watched
+                for watched_dir in self.watched:
+                    self._rescan(watched_dir)
+                continue
+
+            directory = self._dir_by_wd.get(event.wd)
+            if directory is None:
+                continue
+
+            if event.mask & _DIR_GONE:
+                # removed or renamed (e.g. moved into trash by a fast wipe): forget it, and look for
+                #   memories directories again right away (picking up any that replaced it)
+                self._unwatch(directory)
+                self._dirty |= self.table.discard_dir(directory)
+                self._next_poll = 0.0
+            elif event.mask & IN_ISDIR or not is_memory_file(event.name):
+                continue
+            elif event.mask & _REMOVED:
+                self._dirty |= self.table.discard(directory, event.name)
+            else:
+                self._update_file(directory, event.name)
+
+    def _update_file(self, directory: str, name: str) -> None:
+        try:
+            st = os.stat(os.path.join(directory, name))
+        except OSError:
+            self._dirty |= self.table.discard(directory, name)
+            return
+        self._dirty |= self.table.set(directory, name, st.st_mtime_ns, st.st_size)
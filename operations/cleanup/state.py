@@ -11,17 +11,14 @@ class State(TypedDict, total=False):
     last_trash_empty: str
 
 
-ARCHIVES_DIR = get_archives_dir()
-STATE_PATH = get_state_path()
-
-
 def load_state() -> State:
     """Load state from .archives/state.json."""
-    if not STATE_PATH.exists():
+    state_path = get_state_path()
+    if not state_path.exists():
         return {}
 
     try:
-        with open(STATE_PATH) as f:
+        with open(state_path) as f:
             return json.load(f)
     except (json.JSONDecodeError, IOError):
         return {}
@@ -29,12 +26,12 @@ def load_state() -> State:
 
 def save_state(updates: State) -> None:
     """Update state file with latest values."""
-    ARCHIVES_DIR.mkdir(parents=True, exist_ok=True)
+    get_archives_dir().mkdir(parents=True, exist_ok=True)
 
     current = load_state()
     current.update(updates)
 
-    with open(STATE_PATH, "w") as f:
+    with open(get_state_path(), "w") as f:
         json.dump(current, f, indent=2)
 
 
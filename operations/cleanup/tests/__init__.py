@@ -5,7 +5,9 @@ from .http_mocks import (
     RouteMap,
     RespSpec,
     ReqMethodAndPath,
+    create_mock_connection_pool,
     create_mock_http_endpoint,
+    patch_connection_pool,
 )
 
 __all__ = [
@@ -14,5 +16,7 @@ __all__ = [
     "RouteMap",
     "RespSpec",
     "ReqMethodAndPath",
+    "create_mock_connection_pool",
     "create_mock_http_endpoint",
+    "patch_connection_pool",
 ]
@@ -9,13 +9,18 @@ Shared pytest fixtures for cleanup handler tests.
 """
 
 import json
+import shutil
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import pytest
 
+from operations.config_loader import PATH_ENV_OVERRIDES, STORAGE_ENV_OVERRIDES, clear_config_cache
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
 
 # =============================================================================
 # DATETIME FIXTURES - Fixed dates for deterministic testing
@@ -63,6 +68,26 @@ def boundary_datetime(cutoff_datetime: datetime) -> datetime:
 # CONFIG FIXTURES
 # =============================================================================
 
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path_factory: pytest.TempPathFactory, monkeypatch) -> Iterator[Path]:
+    """Point config loading at a temp repo root holding only the tracked config files.
+
+    Every test then sees charter.yml and directives.yml defaults (never the developer's
+    local.yml or env overrides), and the config snapshot is written there rather than to the
+    checkout's .archives/.
+    """
+    config_root = tmp_path_factory.mktemp("config")
+    for filename in ("charter.yml", "directives.yml"):
+        shutil.copy(REPO_ROOT / filename, config_root / filename)
+    for env_var in (*PATH_ENV_OVERRIDES.values(), *STORAGE_ENV_OVERRIDES.values()):
+        monkeypatch.delenv(env_var, raising=False)
+
+    monkeypatch.setattr("operations.config_loader.find_repo_root", lambda start_path=None: config_root)
+    clear_config_cache()
+    yield config_root
+    clear_config_cache()
+
+
 @pytest.fixture
 def mock_config() -> dict[str, Any]:
     """Base configuration structure matching directives.yml."""
@@ -234,6 +259,32 @@ def with_jsonl_data(
 # SERENA FIXTURES (filesystem)
 # =============================================================================
 
+@pytest.fixture(autouse=True)
+def serena_index_path(tmp_path: Path, monkeypatch) -> Path:
+    """Keep the Serena memories directory index of every test in its own temp directory.
+
+    (Applied to all tests, since any test running SerenaHandler would otherwise write the
+    index into the repo's .archives/.)
+    """
+    index_path = tmp_path / "serena-index.json"
+    monkeypatch.setattr(
+        "operations.cleanup.handlers.serena.get_serena_index_path",
+        lambda: index_path
+    )
+    return index_path
+
+
+@pytest.fixture(autouse=True)
+def serena_inventory_path(tmp_path: Path, monkeypatch) -> Path:
+    """Keep the Serena memory file inventory (written by `sweep --watch`) in each test's temp directory."""
+    inventory_path = tmp_path / "serena-inventory.json"
+    monkeypatch.setattr(
+        "operations.cleanup.serena_inventory.get_serena_inventory_path",
+        lambda: inventory_path
+    )
+    return inventory_path
+
+
 @pytest.fixture
 def serena_memories_root(tmp_path: Path) -> Path:
     """Realistic Serena project structure including symlink edge case.
@@ -406,14 +457,6 @@ def apply_mock_patches(
         "operations.cleanup.state.get_state_path",
         lambda: archives_dir / "state.json"
     )
-    monkeypatch.setattr(
-        "operations.cleanup.state.ARCHIVES_DIR",
-        archives_dir
-    )
-    monkeypatch.setattr(
-        "operations.cleanup.state.STATE_PATH",
-        archives_dir / "state.json"
-    )
 
     # Patch trash module
     trash_dir = archives_dir / "trash"
@@ -421,9 +464,5 @@ def apply_mock_patches(
         "operations.cleanup.trash.get_base_trash_dir",
         lambda: trash_dir
     )
-    monkeypatch.setattr(
-        "operations.cleanup.trash.BASE_TRASH_DIR",
-        trash_dir
-    )
 
     return mock_config
@@ -1,7 +1,11 @@
 """HTTP mock helpers for cleanup handler tests."""
 import json
 from dataclasses import dataclass
-from typing import Any, Mapping, Tuple, Union
+from typing import Any, BinaryIO, Callable, Iterable, Mapping, Tuple, Union
+from unittest.mock import patch
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import Request
 
 
 # ━━━━━━━━━━━━ types/type aliases used for mock HTTP endpoints ━━━━━━━━━━━━
@@ -40,11 +44,12 @@ def create_mock_http_endpoint(responses_map: RouteMap):
         url = req.full_url if hasattr(req, "full_url") else str(req)
         method = req.get_method() if hasattr(req, "get_method") else "GET"
 
-        # iterate while checking if u is a substring of the url portion (instead of performing
-        #   direct lookup) since requests specify full url, but responses_map only contains the
+        # iterate while checking if the url's path ends with u (instead of performing direct
+        #   lookup) since requests specify full url, but responses_map only contains the trailing
         #   path portion; acceptable since responses_map will usually contain < 10 items
+        path = urlsplit(url).path
         for (m, u), response in responses_map.items():
-            if m == method and u in url:
+            if m == method and path.endswith(u):
                 if isinstance(response, Exception):
                     raise response
                 mock_resp = MagicMock()
@@ -72,3 +77,51 @@ def create_mock_http_endpoint(responses_map: RouteMap):
         return mock_resp
 
     return mock_http_endpoint
+
+
+# ━━━━━━━━━━━━ connection pool stand-in driven by mock HTTP endpoints ━━━━━━━━━━━━
+
+def create_mock_connection_pool(endpoint: Callable[..., Any]) -> type:
+    """Factory for HTTPConnectionPool stand-ins that route requests to a mock HTTP endpoint.
+
+    The endpoint is called like urlopen (i.e. with a urllib Request and a timeout), so endpoints
+    made via create_mock_http_endpoint() (or hand-written ones) can back the pool. HTTPErrors
+    raised by the endpoint become error responses; URLErrors become connection failures.
+
+    Returns:
+        A class suitable for use with patch("...HTTPConnectionPool", ...)
+    """
+
+    class MockConnectionPool:
+        def __init__(self, base_url: str, connect_timeout: float = 5, request_timeout: float = 30,
+                     max_idle: int = 4):
+            self.base_url = base_url.rstrip("/")
+            self.request_timeout = request_timeout
+            self.connections_opened = 0
+
+        def request(self, method: str, path: str, body: bytes | Iterable[bytes] | None = None,
+                    headers: dict[str, str] | None = None, sink: BinaryIO | None = None,
+                    timeout: float | None = None, idempotent: bool | None = None) -> tuple[int, str, bytes]:
+            if body is not None and not isinstance(body, bytes):
+                body = b"".join(body)
+            req = Request(f"{self.base_url}{path}", data=body, headers=headers or {}, method=method)
+            try:
+                with endpoint(req, timeout=timeout or self.request_timeout) as resp:
+                    if sink is not None:
+                        sink.write(resp.read())
+                        return 200, "OK", b""
+                    return 200, "OK", resp.read()
+            except HTTPError as e:  # must catch before URLError since it's a subclass of it
+                return e.code, str(e.reason), b""
+            except URLError as e:
+                raise ConnectionRefusedError(str(e.reason)) from e
+
+        def close(self) -> None:
+            pass
+
+    return MockConnectionPool
+
+
+def patch_connection_pool(target: str, endpoint: Callable[..., Any]):
+    """Patch the HTTPConnectionPool imported at `target` with one backed by a mock HTTP endpoint."""
+    return patch(target, create_mock_connection_pool(endpoint))
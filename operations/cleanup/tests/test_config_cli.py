@@ -0,0 +1,94 @@
+"""Tests for `get-config --export` (operations.config_cli), round-tripped through bash."""
+import shutil
+import subprocess
+
+import pytest
+
+from operations.config_cli import flatten_config, format_shell_export
+
+pytestmark = pytest.mark.skipif(shutil.which("bash") is None, reason="bash is required")
+
+
+def _eval_in_bash(exported: str, script: str) -> str:
+    """eval the exported block inside a bash function (as load_bureau_config does), then run script."""
+    result = subprocess.run(
+        ["bash", "-c", f'load() {{ eval "$1"; }}; load "$EXPORTED"; {script}'],
+        env={"EXPORTED": exported, "PATH": "/usr/bin:/bin"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def _round_trip(exported: str) -> dict[str, str]:
+    """Read every BUREAU_CONFIG entry back out of bash (NUL-separated, so any value survives)."""
+    output = _eval_in_bash(
+        exported,
+        'for key in "${!BUREAU_CONFIG[@]}"; do printf "%s\\0%s\\0" "$key" "${BUREAU_CONFIG[$key]}"; done',
+    )
+    fields = output.split("\0")[:-1]
+    return dict(zip(fields[::2], fields[1::2]))
+
+
+class TestFlattenConfig:
+    """Tests for flatten_config()."""
+
+    def test_dot_paths_and_formatting(self):
+        config = {"port_for": {"qdrant_db": 8780}, "agents": ["claude", "gemini"], "mcp": {"auto_approve": True},
+                  "path_to": {"unset": None}}
+
+        assert flatten_config(config) == {
+            "port_for.qdrant_db": "8780",
+            "agents": "claude gemini",
+            "mcp.auto_approve": "true",
+            "path_to.unset": "",
+        }
+
+
+class TestShellExport:
+    """Tests for format_shell_export(), eval'd by bash."""
+
+    def test_values_survive_eval(self):
+        """Quotes, spaces, `$`, backticks and newlines come back unchanged (and aren't expanded)."""
+        config = {
+            "path_to": {
+                "spaced": "/Users/me/My Projects/code",
+                "quoted": "it's \"quoted\"",
+                "dollar": "$HOME/${USER}/$(touch /tmp/pwned)",
+                "backtick": "`id`",
+                "multiline": "line 1\nline 2",
+            },
+        }
+
+        assert _round_trip(format_shell_export(config)) == flatten_config(config)
+
+    def test_agent_enabled_keys(self):
+        config = {"agents": ["claude", "Gemini"], "port_for": {"qdrant_db": 8780}}
+
+        values = _round_trip(format_shell_export(config))
+
+        assert values["agent_enabled.claude"] == "true"
+        assert values["agent_enabled.gemini"] == "true"
+        assert "agent_enabled.codex" not in values
+        assert values["agents"] == "claude Gemini"
+
+    def test_limited_to_key_paths(self):
+        config = {"agents": ["claude"], "port_for": {"qdrant_db": 8780, "sourcegraph_mcp": 8781},
+                  "path_to": {"workspace": "~/code"}}
+
+        values = _round_trip(format_shell_export(config, ["port_for", "path_to.workspace", "missing.key"]))
+
+        assert values == {
+            "port_for.qdrant_db": "8780",
+            "port_for.sourcegraph_mcp": "8781",
+            "path_to.workspace": "~/code",
+            "agent_enabled.claude": "true",
+        }
+
+    def test_declared_global(self):
+        """The array outlives the function that eval'd it (declare -g)."""
+        output = _eval_in_bash(format_shell_export({"agents": ["claude"]}), "declare -p BUREAU_CONFIG")
+
+        assert output.startswith("declare -A BUREAU_CONFIG=")
+        assert '[agent_enabled.claude]="true"' in output
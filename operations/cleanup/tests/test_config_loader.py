@@ -0,0 +1,178 @@
+"""Tests for config loading (operations.config_loader): the compiled config snapshot and repo root lookups."""
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from operations import config_loader
+from operations.config_loader import CONFIG_SNAPSHOT_PATH, clear_config_cache, get_config, get_storage
+
+
+class TestConfigSnapshot:
+    """Tests for the compiled config snapshot (.archives/config.cache) reused across processes."""
+
+    @pytest.fixture
+    def builds(self, monkeypatch) -> list[Path]:
+        """Record each full config build (i.e. each time the snapshot isn't reused)."""
+        calls: list[Path] = []
+        build_config = config_loader._build_config
+
+        def recording_build(repo_root: Path):
+            calls.append(repo_root)
+            return build_config(repo_root)
+
+        monkeypatch.setattr(config_loader, "_build_config", recording_build)
+        return calls
+
+    @staticmethod
+    def _reload() -> None:
+        """Drop the in-process cache, as a new process would start without it."""
+        clear_config_cache()
+        get_config()
+
+    def test_written_then_reused(self, isolated_config: Path, builds: list[Path]):
+        get_config()
+        assert (isolated_config / CONFIG_SNAPSHOT_PATH).is_file()
+
+        self._reload()
+
+        assert builds == [isolated_config]
+
+    def test_rebuilt_when_config_file_edited(self, isolated_config: Path, builds: list[Path]):
+        get_config()
+
+        (isolated_config / "local.yml").write_text("cleanup:\n  batch_size: 7\n")
+        self._reload()
+
+        assert len(builds) == 2
+        assert get_config()["cleanup"]["batch_size"] == 7
+
+    def test_rebuilt_when_env_override_changes(self, isolated_config: Path, builds: list[Path], monkeypatch):
+        get_config()
+
+        monkeypatch.setenv("QDRANT_STORAGE_PATH", "/tmp/qdrant-elsewhere")
+        self._reload()
+
+        assert len(builds) == 2
+        assert get_storage("qdrant") == Path("/tmp/qdrant-elsewhere")
+
+    def test_rebuilt_when_config_code_changes(
+        self, isolated_config: Path, builds: list[Path], tmp_path: Path, monkeypatch
+    ):
+        # (stand-in copies of the loader/validator sources, so their mtimes can be changed)
+        code_dir = Path(config_loader.__file__).parent
+        for module in ("config_loader.py", "validate_config.py"):
+            shutil.copy2(code_dir / module, tmp_path / module)
+        monkeypatch.setattr(config_loader, "__file__", str(tmp_path / "config_loader.py"))
+        get_config()
+
+        mtime = (tmp_path / "validate_config.py").stat().st_mtime
+        os.utime(tmp_path / "validate_config.py", (mtime + 10, mtime + 10))
+        self._reload()
+
+        assert len(builds) == 2
+
+
+class TestRepoRootLookup:
+    """Tests for finding the (worktree) repo root and the main repo root behind it."""
+
+    @pytest.fixture(autouse=True)
+    def uncached(self, monkeypatch):
+        """Resolve from scratch (the lookups are memoized per process), without git env overrides."""
+        for env_var in ("GIT_DIR", "GIT_COMMON_DIR"):
+            monkeypatch.delenv(env_var, raising=False)
+        clear_config_cache()
+        yield
+        clear_config_cache()
+
+    @pytest.fixture
+    def main_repo(self, tmp_path: Path) -> Path:
+        """A main checkout: `<root>/.git` is a directory."""
+        root = tmp_path / "main"
+        (root / ".git" / "worktrees").mkdir(parents=True)
+        (root / "src" / "pkg").mkdir(parents=True)
+        return root.resolve()
+
+    @staticmethod
+    def _add_worktree(main_repo: Path, worktree: Path, gitdir_pointer: str, commondir: str) -> Path:
+        """A linked worktree: its `.git` file points at a gitdir whose `commondir` leads back to the main `.git`."""
+        gitdir = main_repo / ".git" / "worktrees" / worktree.name
+        gitdir.mkdir()
+        (gitdir / "commondir").write_text(commondir + "\n")
+        (worktree / "src").mkdir(parents=True)
+        (worktree / ".git").write_text(f"gitdir: {gitdir_pointer}\n")
+        return worktree
+
+    def test_main_checkout(self, main_repo: Path):
+        """From anywhere in a main checkout, both roots are the checkout itself."""
+        start = main_repo / "src" / "pkg"
+
+        assert config_loader._find_repo_root_from(str(start)) == main_repo
+        assert config_loader._resolve_git_common_dir(start) == main_repo / ".git"
+        assert config_loader._main_repo_root_from(start) == main_repo
+
+    def test_linked_worktree(self, main_repo: Path, tmp_path: Path):
+        """A linked worktree is its own repo root; its main repo root is the main checkout."""
+        gitdir = main_repo / ".git" / "worktrees" / "feature"
+        worktree = self._add_worktree(main_repo, tmp_path / "feature", str(gitdir), str(main_repo / ".git"))
+        start = worktree / "src"
+
+        assert config_loader._find_repo_root_from(str(start)) == worktree
+        assert config_loader._resolve_git_common_dir(start) == main_repo / ".git"
+        assert config_loader._main_repo_root_from(start) == main_repo
+
+    def test_relative_commondir(self, main_repo: Path, tmp_path: Path):
+        """Relative pointers: gitdir from the worktree, commondir from the gitdir (git's default `../..`)."""
+        worktree = self._add_worktree(main_repo, tmp_path / "feature", "../main/.git/worktrees/feature", "../..")
+
+        assert config_loader._resolve_git_common_dir(worktree / "src") == main_repo / ".git"
+        assert config_loader._main_repo_root_from(worktree / "src") == main_repo
+
+    def test_directives_file_marks_root(self, tmp_path: Path):
+        """A directory holding directives.yml is a repo root, even without .git."""
+        (tmp_path / "checkout" / "sub").mkdir(parents=True)
+        (tmp_path / "checkout" / "directives.yml").touch()
+
+        checkout = (tmp_path / "checkout").resolve()
+        assert config_loader._find_repo_root_from(str(checkout / "sub")) == checkout
+
+    @pytest.fixture
+    def cli_calls(self, main_repo: Path, monkeypatch) -> list[Path]:
+        """Record lookups deferred to the git CLI (answering with main_repo's .git)."""
+        calls: list[Path] = []
+
+        def git_common_dir_via_cli(cwd: Path) -> Path:
+            calls.append(cwd)
+            return main_repo / ".git"
+
+        monkeypatch.setattr(config_loader, "_git_common_dir_via_cli", git_common_dir_via_cli)
+        return calls
+
+    def test_git_dir_set_defers_to_cli(self, main_repo: Path, cli_calls: list[Path], monkeypatch):
+        """With GIT_DIR set, metadata files aren't trusted: the git CLI resolves the common dir."""
+        monkeypatch.setenv("GIT_DIR", str(main_repo / ".git"))
+
+        assert config_loader._resolve_git_common_dir(main_repo) is None
+        assert config_loader._main_repo_root_from(main_repo) == main_repo
+        assert cli_calls == [main_repo]
+
+    def test_unhandled_layout_defers_to_cli(self, main_repo: Path, cli_calls: list[Path]):
+        """A submodule's gitdir (under .git/modules/) isn't shaped like `<root>/.git`: git resolves it."""
+        (main_repo / ".git" / "modules" / "lib").mkdir(parents=True)
+        submodule = main_repo / "lib"
+        submodule.mkdir()
+        (submodule / ".git").write_text("gitdir: ../.git/modules/lib\n")
+
+        assert config_loader._resolve_git_common_dir(submodule) is None
+        assert config_loader._main_repo_root_from(submodule) == main_repo
+        assert cli_calls == [submodule]
+
+    def test_cli_resolves_common_dir(self, tmp_path: Path):
+        """`git rev-parse --git-common-dir`'s relative answer is resolved from the working directory."""
+        repo = tmp_path / "repo"
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        (repo / "sub").mkdir()
+
+        assert config_loader._git_common_dir_via_cli(repo / "sub") == (repo / ".git").resolve()
@@ -1,8 +1,12 @@
 """Tests for ClaudeMemHandler (SQLite cleanup)."""
+import json
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
 
+import pytest
+
+from operations.cleanup.handlers import CleanupError
 from operations.cleanup.handlers.claude_mem import ClaudeMemHandler
 
 
@@ -163,6 +167,444 @@ class TestClaudeMemDeleteItems:
         assert deleted == 0
 
 
+class TestClaudeMemLockFriendlyDeletes:
+    """Tests for chunked deletes and read-only scans."""
+
+    @pytest.fixture
+    def stale_items(self, apply_mock_patches, with_sqlite_data: Path, stale_datetime: datetime) -> list:
+        """7 stale observations (6 added to the fixture data) and 1 stale session."""
+        created_at = stale_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        conn = sqlite3.connect(str(with_sqlite_data))
+        conn.executemany(
+            "INSERT INTO observations (id, created_at, content) VALUES (?, ?, ?)",
+            [(f"obs_stale_{i}", created_at, f"Stale observation {i}") for i in range(6)]
+        )
+        conn.commit()
+        conn.close()
+        return ClaudeMemHandler().get_stale_items(datetime(2024, 1, 15, tzinfo=timezone.utc))
+
+    def test_lock_released_between_chunks(
+        self,
+        stale_items: list,
+        with_sqlite_data: Path,
+        monkeypatch,
+    ):
+        """Each chunk is its own transaction, so other writers get in between chunks."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_delete_chunk_size", lambda: 3)
+        worker_writes: list[bool] = []
+
+        def worker_write(_seconds):
+            # stands in for the claude-mem worker recording an observation during the pause
+            conn = sqlite3.connect(str(with_sqlite_data), timeout=0)
+            conn.execute("INSERT INTO observations (id, created_at, content) VALUES (?, ?, ?)",
+                         (f"obs_new_{len(worker_writes)}", "2024-02-01T00:00:00.000Z", "New observation"))
+            conn.commit()
+            conn.close()
+            worker_writes.append(True)
+
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.time.sleep", worker_write)
+
+        deleted = ClaudeMemHandler().delete_items_from_storage(stale_items)
+
+        # 7 observations in chunks of 3, then 1 session: 4 transactions, paused between each
+        assert deleted == 8
+        assert len(worker_writes) == 3
+
+    def test_delete_gives_up_after_busy_timeout(
+        self,
+        stale_items: list,
+        with_sqlite_data: Path,
+        monkeypatch,
+    ):
+        """A write lock held elsewhere past busy_timeout fails the delete instead of hanging."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_busy_timeout", lambda: 0)
+        holder = sqlite3.connect(str(with_sqlite_data), isolation_level=None)
+        holder.execute("BEGIN EXCLUSIVE")
+        try:
+            with pytest.raises(CleanupError, match="locked"):
+                ClaudeMemHandler().delete_items_from_storage(stale_items)
+        finally:
+            holder.execute("ROLLBACK")
+            holder.close()
+
+    def test_scan_connections_are_read_only(
+        self,
+        apply_mock_patches,
+        with_sqlite_data: Path,
+    ):
+        """Scans open the database read-only."""
+        conn = ClaudeMemHandler()._get_db_connection(read_only=True)
+        assert conn is not None
+        try:
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute("DELETE FROM observations")
+        finally:
+            conn.close()
+
+
+class TestClaudeMemStreamingCleanup:
+    """Tests for ClaudeMemHandler.iter_stale_batches() and batched cleanup()."""
+
+    @pytest.fixture
+    def with_many_stale_rows(self, with_sqlite_data: Path, stale_datetime: datetime) -> Path:
+        """Adds 5 more stale observations (6 stale observations and 1 stale session in total)."""
+        created_at = stale_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        conn = sqlite3.connect(str(with_sqlite_data))
+        conn.executemany(
+            "INSERT INTO observations (id, created_at, content) VALUES (?, ?, ?)",
+            [(f"obs_stale_{i}", created_at, f"Stale observation {i}") for i in range(5)]
+        )
+        conn.commit()
+        conn.close()
+        return with_sqlite_data
+
+    def test_batches_respect_batch_size(
+        self,
+        apply_mock_patches,
+        with_many_stale_rows: Path,
+        cutoff_datetime: datetime,
+    ):
+        """Batches hold at most batch_size items and together cover every stale row exactly once."""
+        handler = ClaudeMemHandler()
+        batches = list(handler.iter_stale_batches(cutoff_datetime, batch_size=4))
+
+        assert all(0 < len(batch) <= 4 for batch in batches)
+
+        stale_ids = [item["data"]["id"] for batch in batches for item in batch]
+        assert len(stale_ids) == len(set(stale_ids)) == 7
+        assert "session_valid" not in stale_ids
+        assert "obs_valid" not in stale_ids
+
+    def test_indexed_batches_page_by_created_at(
+        self,
+        apply_mock_patches,
+        with_many_stale_rows: Path,
+        cutoff_datetime: datetime,
+    ):
+        """With a created_at index, batches are paged in (created_at, id) order (ties included)."""
+        conn = sqlite3.connect(str(with_many_stale_rows))
+        conn.execute("CREATE INDEX idx_observations_created_at_id ON observations (created_at, id)")
+        conn.commit()
+        conn.close()
+
+        handler = ClaudeMemHandler()
+        batches = list(handler.iter_stale_batches(cutoff_datetime, batch_size=4))
+
+        stale_ids = [item["data"]["id"] for batch in batches for item in batch]
+        assert len(stale_ids) == len(set(stale_ids)) == 7
+        assert [len(batch) for batch in batches] == [1, 4, 2]  # 1 stale session, then 6 stale observations
+
+    def test_cleanup_reports_query_plans(
+        self,
+        apply_mock_patches,
+        with_many_stale_rows: Path,
+        cutoff_datetime: datetime,
+        monkeypatch,
+    ):
+        """Without opting in, cleanup reports each table's scan plan but doesn't add indexes."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_create_indexes", lambda: False)
+        monkeypatch.setattr(ClaudeMemHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+
+        result = ClaudeMemHandler().cleanup(retention="30d")
+
+        assert [plan["table"] for plan in result["query_plans"]] == ["session_summaries", "observations"]
+        assert not any(plan["index_created"] for plan in result["query_plans"])
+        assert all("created_at" not in plan["plan"] for plan in result["query_plans"])
+
+    def test_opt_in_creates_created_at_indexes(
+        self,
+        apply_mock_patches,
+        with_many_stale_rows: Path,
+        cutoff_datetime: datetime,
+        monkeypatch,
+    ):
+        """With claude_mem.create_indexes set, missing (created_at, id) indexes are created (but not on dry runs)."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_create_indexes", lambda: True)
+        monkeypatch.setattr(ClaudeMemHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+
+        def indexes() -> list[str]:
+            conn = sqlite3.connect(str(with_many_stale_rows))
+            try:
+                return [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index' "
+                                                       "AND name LIKE 'idx_%' ORDER BY name")]
+            finally:
+                conn.close()
+
+        ClaudeMemHandler().cleanup(retention="30d", dry_run=True)
+        assert indexes() == []
+
+        result = ClaudeMemHandler().cleanup(retention="30d")
+
+        assert result["deleted"] == 7
+        assert indexes() == ["idx_observations_created_at_id", "idx_session_summaries_created_at_id"]
+        assert all(plan["index_created"] for plan in result["query_plans"])
+        assert all("COVERING INDEX" in plan["plan"] for plan in result["query_plans"])
+
+    def test_cleanup_deletes_in_batches(
+        self,
+        apply_mock_patches,
+        with_many_stale_rows: Path,
+        cutoff_datetime: datetime,
+        monkeypatch,
+    ):
+        """cleanup() deletes each batch after writing it to a single JSONL trash file."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_trash_format", lambda: "jsonl")
+        monkeypatch.setattr("operations.cleanup.handlers.base.get_cleanup_batch_size", lambda: 2)
+        monkeypatch.setattr(ClaudeMemHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+
+        result = ClaudeMemHandler().cleanup(retention="30d")
+
+        assert result["deleted"] == 7
+
+        trash_lines = Path(result["trash_path"]).read_text().splitlines()
+        assert len(trash_lines) == 7
+        assert {json.loads(line)["type"] for line in trash_lines} == {"session", "observation"}
+
+        conn = sqlite3.connect(str(with_many_stale_rows))
+        remaining = {row[0] for row in conn.execute("SELECT id FROM observations UNION SELECT id FROM session_summaries")}
+        conn.close()
+        assert remaining == {"obs_valid", "session_valid"}
+
+    def test_dry_run_counts_without_deleting(
+        self,
+        apply_mock_patches,
+        with_many_stale_rows: Path,
+        cutoff_datetime: datetime,
+        monkeypatch,
+    ):
+        """Dry run counts every stale item across batches but deletes nothing."""
+        monkeypatch.setattr("operations.cleanup.handlers.base.get_cleanup_batch_size", lambda: 2)
+        monkeypatch.setattr(ClaudeMemHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+
+        result = ClaudeMemHandler().cleanup(retention="30d", dry_run=True)
+
+        assert result["would_delete"] == 7
+        assert len(result["items"]) == 7
+
+        conn = sqlite3.connect(str(with_many_stale_rows))
+        assert conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0] == 7
+        conn.close()
+
+    def test_trash_lines_hold_full_rows(
+        self,
+        apply_mock_patches,
+        with_many_stale_rows: Path,
+        cutoff_datetime: datetime,
+        monkeypatch,
+    ):
+        """Batches only carry ids, but the trash file gets every column of each deleted row."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_trash_format", lambda: "jsonl")
+        monkeypatch.setattr("operations.cleanup.handlers.base.get_cleanup_batch_size", lambda: 1000)
+        monkeypatch.setattr(ClaudeMemHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+
+        result = ClaudeMemHandler().cleanup(retention="30d")
+
+        documents = [json.loads(line) for line in Path(result["trash_path"]).read_text().splitlines()]
+        assert {"type": "session", "table": "session_summaries", "data": {
+            "id": "session_stale", "created_at": "2024-01-01T00:00:00.000Z", "summary": "Stale session summary",
+        }} in documents
+        assert all(set(doc["data"]) == {"id", "created_at", "content"} for doc in documents if doc["type"] == "observation")
+
+    def test_python_fallback_matches_sql_json(
+        self,
+        apply_mock_patches,
+        with_many_stale_rows: Path,
+    ):
+        """Rows serialized in Python (for SQLite builds without JSON1) match the SQL-side JSON."""
+        handler = ClaudeMemHandler()
+        conn = sqlite3.connect(str(with_many_stale_rows))
+        columns = ["id", "created_at", "content"]
+        ids = ["obs_stale", "obs_stale_3"]
+
+        from_sql = list(handler._iter_rows_as_json_sql(conn, "observations", "observation", columns, ids))
+        from_python = list(handler._iter_rows_as_json_python(conn, "observations", "observation", columns, ids))
+        conn.close()
+
+        assert len(from_sql) == 2
+        assert [json.loads(doc) for doc in from_sql] == [json.loads(doc) for doc in from_python]
+
+
+class TestClaudeMemSpaceReclaim:
+    """Tests for reclaiming free space after deletes."""
+
+    @pytest.fixture
+    def bulky_db(self, apply_mock_patches, sqlite_db: Path, stale_datetime: datetime, valid_datetime: datetime,
+                 monkeypatch):
+        """Return a function filling the database with stale and valid 4 KiB observations.
+
+        The vacuum settings are pinned to their defaults: a 25% free-page threshold, no migration.
+        """
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_vacuum_threshold", lambda: 0.25)
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_incremental_vacuum", lambda: False)
+
+        def fill(stale: int, valid: int, auto_vacuum: str = "NONE", wal: bool = False) -> Path:
+            conn = sqlite3.connect(str(sqlite_db))
+            conn.execute(f"PRAGMA auto_vacuum = {auto_vacuum}")
+            conn.execute("VACUUM")
+            if wal:
+                conn.execute("PRAGMA journal_mode = WAL")
+            for prefix, count, dt in (("stale", stale, stale_datetime), ("valid", valid, valid_datetime)):
+                created_at = dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+                conn.executemany(
+                    "INSERT INTO observations (id, created_at, content) VALUES (?, ?, ?)",
+                    [(f"obs_{prefix}_{i}", created_at, "x" * 4096) for i in range(count)]
+                )
+            conn.commit()
+            conn.close()
+            return sqlite_db
+        return fill
+
+    @staticmethod
+    def _pragma(db_path: Path, name: str) -> int:
+        conn = sqlite3.connect(str(db_path))
+        try:
+            return conn.execute(f"PRAGMA {name}").fetchone()[0]
+        finally:
+            conn.close()
+
+    def _cleanup(self, cutoff_datetime: datetime) -> int:
+        handler = ClaudeMemHandler()
+        return handler.delete_items_from_storage(handler.get_stale_items(cutoff_datetime))
+
+    def test_below_threshold_keeps_free_pages(self, bulky_db, cutoff_datetime: datetime):
+        """Deleting a small fraction of the database leaves its pages free for reuse."""
+        db_path = bulky_db(stale=20, valid=400)
+        page_count = self._pragma(db_path, "page_count")
+
+        assert self._cleanup(cutoff_datetime) == 20
+        assert self._pragma(db_path, "freelist_count") > 0
+        assert self._pragma(db_path, "page_count") == page_count
+
+    def test_past_threshold_vacuums(self, bulky_db, cutoff_datetime: datetime):
+        """Past the threshold, a database without auto-vacuum is fully vacuumed."""
+        db_path = bulky_db(stale=300, valid=100)
+        page_count = self._pragma(db_path, "page_count")
+
+        assert self._cleanup(cutoff_datetime) == 300
+        assert self._pragma(db_path, "freelist_count") == 0
+        assert self._pragma(db_path, "page_count") < page_count / 2
+
+    def test_incremental_vacuum_in_steps(self, bulky_db, cutoff_datetime: datetime, monkeypatch):
+        """Databases in incremental auto-vacuum mode are shrunk a few pages per transaction."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem._INCREMENTAL_VACUUM_PAGES", 50)
+        pauses: list[float] = []
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.time.sleep", pauses.append)
+        db_path = bulky_db(stale=300, valid=100, auto_vacuum="INCREMENTAL")
+
+        assert self._cleanup(cutoff_datetime) == 300
+        assert self._pragma(db_path, "freelist_count") == 0
+        assert self._pragma(db_path, "auto_vacuum") == 2
+        # 300+ free pages (a row per page or more) at 50 per step, pausing between steps
+        assert len(pauses) >= 5
+
+    def test_opt_in_migrates_to_incremental(self, bulky_db, cutoff_datetime: datetime, monkeypatch):
+        """With claude_mem.incremental_vacuum set, the database is switched to incremental mode."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_incremental_vacuum", lambda: True)
+        db_path = bulky_db(stale=20, valid=400)
+
+        self._cleanup(cutoff_datetime)
+        assert self._pragma(db_path, "auto_vacuum") == 2
+        assert self._pragma(db_path, "freelist_count") == 0
+
+    def test_wal_truncated_after_vacuum(self, bulky_db, cutoff_datetime: datetime):
+        """Vacuuming in WAL mode checkpoints and truncates the WAL afterwards."""
+        db_path = bulky_db(stale=300, valid=100, wal=True)
+
+        # hold a connection open so the WAL outlives the handler's connection
+        reader = sqlite3.connect(str(db_path))
+        try:
+            reader.execute("SELECT COUNT(*) FROM observations").fetchone()
+            assert self._cleanup(cutoff_datetime) == 300
+            wal_path = db_path.with_name(db_path.name + "-wal")
+            assert wal_path.stat().st_size == 0
+        finally:
+            reader.close()
+
+
+class TestClaudeMemArchiveMode:
+    """Tests for claude_mem.trash_format: archive."""
+
+    @pytest.fixture
+    def archive_mode(self, apply_mock_patches, with_sqlite_data: Path, trash_dir: Path,
+                     cutoff_datetime: datetime, monkeypatch) -> Path:
+        """Enable archive mode, returning the archive database's path."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_trash_format", lambda: "archive")
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_delete_chunk_size", lambda: 500)
+        monkeypatch.setattr(ClaudeMemHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+        return trash_dir / "claude-mem" / "archive.db"
+
+    @staticmethod
+    def _ids(db_path: Path, table: str) -> list[str]:
+        conn = sqlite3.connect(str(db_path))
+        try:
+            return [row[0] for row in conn.execute(f"SELECT id FROM {table} ORDER BY id")]
+        finally:
+            conn.close()
+
+    def test_cleanup_moves_stale_rows_into_archive(self, archive_mode: Path, with_sqlite_data: Path):
+        """Stale rows are moved into the archive database, with when they were trashed."""
+        result = ClaudeMemHandler().cleanup(retention="30d")
+
+        assert result["deleted"] == 2
+        assert result["trash_path"] == str(archive_mode)
+        assert self._ids(with_sqlite_data, "observations") == ["obs_valid"]
+        assert self._ids(with_sqlite_data, "session_summaries") == ["session_valid"]
+
+        conn = sqlite3.connect(str(archive_mode))
+        rows = conn.execute("SELECT id, content, _trashed_at FROM observations").fetchall()
+        conn.close()
+        assert [row[:2] for row in rows] == [("obs_stale", "Stale observation")]
+        assert rows[0][2].startswith(str(datetime.now(timezone.utc).year))
+
+        # no JSONL file: the manifest points at the archive
+        assert sorted(path.name for path in archive_mode.parent.iterdir()) == [".manifest.json", "archive.db"]
+        manifest = json.loads((archive_mode.parent / ".manifest.json").read_text())
+        assert manifest[0]["item_count"] == 2
+        assert manifest[0]["archive"] == str(archive_mode)
+
+    def test_archive_gains_new_source_columns(self, archive_mode: Path, with_sqlite_data: Path):
+        """Columns added to a claude-mem table after it was first archived are added to the archive too."""
+        ClaudeMemHandler().cleanup(retention="30d")
+
+        conn = sqlite3.connect(str(with_sqlite_data))
+        conn.execute("ALTER TABLE observations ADD COLUMN title TEXT")
+        conn.execute("UPDATE observations SET created_at = '2020-01-01T00:00:00.000Z', title = 'Later'")
+        conn.commit()
+        conn.close()
+
+        assert ClaudeMemHandler().cleanup(retention="30d")["deleted"] == 1
+
+        conn = sqlite3.connect(str(archive_mode))
+        titles = conn.execute("SELECT id, title FROM observations ORDER BY id").fetchall()
+        conn.close()
+        assert titles == [("obs_stale", None), ("obs_valid", "Later")]
+
+    def test_restore_moves_rows_back(self, archive_mode: Path, with_sqlite_data: Path):
+        """Restoring moves every archived row back into claude-mem."""
+        ClaudeMemHandler().cleanup(retention="30d")
+
+        result = ClaudeMemHandler().restore_archive()
+
+        assert result == {"storage": "claude-mem", "restored": 2}
+        assert self._ids(with_sqlite_data, "observations") == ["obs_stale", "obs_valid"]
+        assert self._ids(with_sqlite_data, "session_summaries") == ["session_stale", "session_valid"]
+        assert self._ids(archive_mode, "observations") == []
+
+    def test_restore_since_leaves_older_rows(self, archive_mode: Path, with_sqlite_data: Path):
+        """Restoring since a time leaves rows trashed before it in the archive."""
+        ClaudeMemHandler().cleanup(retention="30d")
+
+        result = ClaudeMemHandler().restore_archive(datetime.now(timezone.utc))
+
+        assert result["restored"] == 0
+        assert self._ids(archive_mode, "observations") == ["obs_stale"]
+
+    def test_restore_without_archive(self, apply_mock_patches, with_sqlite_data: Path):
+        """Restoring with no archive database returns an error."""
+        result = ClaudeMemHandler().restore_archive()
+        assert "No archive found" in result["error"]
+
+
 class TestClaudeMemWipe:
     """Tests for ClaudeMemHandler.wipe()."""
 
@@ -170,8 +612,10 @@ class TestClaudeMemWipe:
         self,
         apply_mock_patches,
         with_sqlite_data: Path,
+        monkeypatch,
     ):
         """Wipe removes all data from all tables."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_compress_wipe_backup", lambda: False)
         handler = ClaudeMemHandler()
         result = handler.wipe(backup=True)
 
@@ -187,6 +631,86 @@ class TestClaudeMemWipe:
         assert cursor.fetchone()[0] == 0
         conn.close()
 
+        # the backup is a copy of the database, holding every wiped row
+        backup = sqlite3.connect(result["backup_path"])
+        backup_ids = sorted(
+            row[0] for table in ("session_summaries", "observations")
+            for row in backup.execute(f"SELECT id FROM {table}")
+        )
+        backup.close()
+        assert backup_ids == ["obs_stale", "obs_valid", "session_stale", "session_valid"]
+
+    def test_wipe_backup_copied_in_steps(
+        self,
+        apply_mock_patches,
+        with_sqlite_data: Path,
+        monkeypatch,
+    ):
+        """The backup is copied a few pages per step, pausing between steps."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_compress_wipe_backup", lambda: False)
+        conn = sqlite3.connect(str(with_sqlite_data))
+        conn.executemany("INSERT INTO observations (id, created_at, content) VALUES (?, ?, ?)",
+                         [(f"obs_bulk_{i}", "2024-02-01T00:00:00.000Z", "x" * 4096) for i in range(20)])
+        conn.commit()
+        conn.close()
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem._BACKUP_STEP_PAGES", 4)
+        pauses: list[float] = []
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.time.sleep", pauses.append)
+
+        result = ClaudeMemHandler().wipe(backup=True)
+
+        assert len(pauses) >= 5
+        backup = sqlite3.connect(result["backup_path"])
+        assert backup.execute("SELECT COUNT(*) FROM observations").fetchone()[0] == 22
+        backup.close()
+
+    def test_cancelled_wipe_keeps_data(
+        self,
+        apply_mock_patches,
+        with_sqlite_data: Path,
+        monkeypatch,
+    ):
+        """A wipe cancelled (after timing out) stops once its backup is taken, deleting nothing."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_compress_wipe_backup", lambda: False)
+        handler = ClaudeMemHandler()
+        handler.cancel()
+
+        result = handler.wipe(backup=True)
+
+        assert "cancelled" in result["error"]
+        conn = sqlite3.connect(str(with_sqlite_data))
+        assert conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0] == 2
+        conn.close()
+
+    def test_restore_backup_swaps_database(
+        self,
+        apply_mock_patches,
+        with_sqlite_data: Path,
+        monkeypatch,
+    ):
+        """Restoring the latest (compressed) backup brings back the wiped rows."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_compress_wipe_backup", lambda: True)
+        handler = ClaudeMemHandler()
+        wipe_result = handler.wipe(backup=True)
+        assert wipe_result["backup_path"].endswith(".db.gz")
+
+        result = handler.restore_backup()
+
+        assert result == {"storage": "claude-mem", "restored": wipe_result["backup_path"]}
+        conn = sqlite3.connect(str(with_sqlite_data))
+        assert conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0] == 2
+        conn.close()
+        assert not with_sqlite_data.with_name(with_sqlite_data.name + ".restore").exists()
+
+    def test_restore_without_backup(
+        self,
+        apply_mock_patches,
+        with_sqlite_data: Path,
+    ):
+        """Restoring with no backup in trash returns an error."""
+        result = ClaudeMemHandler().restore_backup()
+        assert "No backup found" in result["error"]
+
     def test_wipe_missing_db(
         self,
         tmp_path: Path,
@@ -205,3 +729,86 @@ class TestClaudeMemWipe:
 
         assert result["wiped"] == 0
         assert "database does not exist" in result["message"]
+
+    def test_fast_wipe_swaps_in_empty_database(
+        self,
+        apply_mock_patches,
+        with_sqlite_data: Path,
+        monkeypatch,
+    ):
+        """Fast wipe replaces the database with an empty one of the same schema, backing up the old file."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_compress_wipe_backup", lambda: False)
+        conn = sqlite3.connect(str(with_sqlite_data))
+        conn.execute("CREATE INDEX idx_observations_created_at ON observations (created_at)")
+        conn.execute("PRAGMA user_version = 7")
+        conn.commit()
+        schema_before = conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+        conn.close()
+
+        result = ClaudeMemHandler().wipe(backup=True, fast=True)
+
+        assert result["wiped"] == 4
+
+        conn = sqlite3.connect(str(with_sqlite_data))
+        assert conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall() == schema_before
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 7
+        assert conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0] == 0
+        conn.close()
+
+        backup = sqlite3.connect(result["backup_path"])
+        assert backup.execute("SELECT COUNT(*) FROM observations").fetchone()[0] == 2
+        backup.close()
+
+    def test_fast_wipe_keeps_objects_named_like_shadow_tables(
+        self,
+        apply_mock_patches,
+        with_sqlite_data: Path,
+    ):
+        """Only a virtual table's shadow tables are left for it to create: other objects sharing its
+        name prefix are recreated."""
+        conn = sqlite3.connect(str(with_sqlite_data))
+        conn.execute("CREATE VIRTUAL TABLE notes_fts USING fts5(body)")
+        conn.execute("CREATE TABLE notes_fts_log (body TEXT)")
+        conn.execute("CREATE INDEX notes_fts_by_body ON notes_fts_log (body)")
+        conn.execute("CREATE TRIGGER notes_fts_sync AFTER INSERT ON notes_fts_log "
+                     "BEGIN INSERT INTO notes_fts (body) VALUES (new.body); END")
+        conn.commit()
+        schema_before = conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+        conn.close()
+
+        result = ClaudeMemHandler().wipe(backup=False, fast=True)
+
+        assert "error" not in result
+        conn = sqlite3.connect(str(with_sqlite_data))
+        assert conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall() == schema_before
+        conn.close()
+
+    def test_fast_wipe_backs_up_rows_still_in_wal(
+        self,
+        apply_mock_patches,
+        with_sqlite_data: Path,
+        monkeypatch,
+    ):
+        """Rows committed to the WAL but not yet checkpointed into the main file are in the backup."""
+        monkeypatch.setattr("operations.cleanup.handlers.claude_mem.get_claude_mem_compress_wipe_backup", lambda: False)
+        conn = sqlite3.connect(str(with_sqlite_data))
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA wal_autocheckpoint = 0")
+        # an open read transaction keeps the checkpoint from folding in frames committed after it
+        reader = sqlite3.connect(str(with_sqlite_data), isolation_level=None)
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM observations").fetchone()
+        conn.execute("INSERT INTO observations (id, created_at) VALUES (99, '2024-06-01')")
+        conn.commit()
+        conn.close()
+
+        try:
+            result = ClaudeMemHandler().wipe(backup=True, fast=True)
+        finally:
+            reader.close()
+
+        assert result["wiped"] == 5
+        backup = sqlite3.connect(result["backup_path"])
+        assert backup.execute("SELECT COUNT(*) FROM observations").fetchone()[0] == 3
+        backup.close()
+        assert not with_sqlite_data.with_name(with_sqlite_data.name + "-wal").exists()
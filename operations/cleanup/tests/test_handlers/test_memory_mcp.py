@@ -1,8 +1,11 @@
 """Tests for MemoryMcpHandler (Memory MCP uses JSONL storage model)."""
 import json
+import mmap
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 
+import pytest
 
 from operations.cleanup.handlers.memory_mcp import MemoryMcpHandler
 
@@ -301,3 +304,266 @@ class TestMemoryMcpWipe:
 
         assert result["wiped"] == 0
         assert "no entities found" in result["message"]
+
+    def test_fast_wipe_replaces_file(
+        self,
+        with_jsonl_data: Path,
+        apply_mock_patches: dict,
+    ):
+        """Fast wipe swaps in an empty file, keeping the old one (unchanged) as the backup."""
+        original = with_jsonl_data.read_text()
+
+        result = MemoryMcpHandler().wipe(backup=True, fast=True)
+
+        assert result["wiped"] == 9
+        assert with_jsonl_data.read_text() == ""
+        assert Path(result["backup_path"]).read_text() == original
+
+
+class TestMemoryMcpCleanup:
+    """Tests for MemoryMcpHandler.cleanup() (a single streaming pass over the file)."""
+
+    def test_cleanup_moves_stale_lines_to_trash(
+        self,
+        jsonl_file: Path,
+        apply_mock_patches: dict,
+        monkeypatch,
+    ):
+        """Stale lines go to the trash as they were; all other lines (even malformed ones) are kept."""
+        stale = json.dumps({"name": "stale", "created_at": "2024-01-01T00:00:00Z"})
+        valid = json.dumps({"name": "valid", "created_at": "2024-06-01T00:00:00Z"})
+        jsonl_file.write_text(f"{stale}\nnot valid json\n\n{valid}\n")
+
+        cutoff = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        monkeypatch.setattr(MemoryMcpHandler, "get_cutoff", lambda self, retention: cutoff)
+        result = MemoryMcpHandler().cleanup("90d")
+
+        assert result["deleted"] == 1
+        assert jsonl_file.read_text() == f"not valid json\n\n{valid}\n"
+        assert Path(result["trash_path"]).read_text() == f"{stale}\n"
+        assert list(jsonl_file.parent.glob("*.tmp")) == []
+
+    def test_cleanup_nothing_stale_leaves_file(
+        self,
+        with_jsonl_data: Path,
+        apply_mock_patches: dict,
+        monkeypatch,
+    ):
+        """The file isn't replaced if nothing was stale."""
+        inode = with_jsonl_data.stat().st_ino
+
+        cutoff = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        monkeypatch.setattr(MemoryMcpHandler, "get_cutoff", lambda self, retention: cutoff)
+        result = MemoryMcpHandler().cleanup("90d")
+
+        assert result["deleted"] == 0
+        assert with_jsonl_data.stat().st_ino == inode
+
+    def test_failed_replace_keeps_original(
+        self,
+        with_jsonl_data: Path,
+        apply_mock_patches: dict,
+        monkeypatch,
+    ):
+        """If the rewritten file can't be swapped in, the original is left intact (and no temp file)."""
+        original = with_jsonl_data.read_text()
+
+        replace = os.replace
+
+        def fail_replace(src, dst):
+            if Path(dst) == with_jsonl_data:
+                raise OSError("disk full")
+            replace(src, dst)
+
+        monkeypatch.setattr(os, "replace", fail_replace)
+        result = MemoryMcpHandler().cleanup("90d")
+
+        assert "error" in result
+        assert with_jsonl_data.read_text() == original
+        assert list(with_jsonl_data.parent.glob("*.tmp")) == []
+
+    def test_cancelled_cleanup_keeps_original(
+        self,
+        with_jsonl_data: Path,
+        apply_mock_patches: dict,
+    ):
+        """A cleanup cancelled (after timing out) returns an error without replacing the file."""
+        original = with_jsonl_data.read_text()
+
+        handler = MemoryMcpHandler()
+        handler.cancel()
+        result = handler.cleanup("90d")
+
+        assert "cancelled" in result["error"]
+        assert with_jsonl_data.read_text() == original
+        assert list(with_jsonl_data.parent.glob("*.tmp")) == []
+
+
+class TestMemoryMcpScanner:
+    """Tests for MemoryMcpHandler._iter_stale_lines() (the byte pattern scan behind cleanup and dry runs)."""
+
+    CUTOFF = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+    LINES = [
+        '{"name": "stale", "created_at": "2024-01-01T00:00:00.000Z"}',
+        '{"name": "valid", "created_at": "2024-02-01T00:00:00.000Z"}',
+        # within the cutoff's second, either side of it
+        '{"name": "stale_same_second", "created_at": "2024-01-15T11:59:59.999Z"}',
+        '{"name": "valid_same_second", "created_at": "2024-01-15T12:00:00.001Z"}',
+        '{"name": "stale_offset", "created_at": "2024-01-15T13:00:00+02:00"}',
+        '{"name": "stale_date_only", "created_at": "2024-01-01"}',
+        '{"name": "stale_escaped", "created_at": "2024\\u002d01-01T00:00:00Z"}',
+        '{"name": "valid_nested_stale", "created_at": "2024-02-01T00:00:00Z", "meta": {"created_at": "2020-01-01"}}',
+        '{"name": "stale_nested_valid", "meta": {"created_at": "2025-01-01"}, "created_at": "2020-01-01"}',
+        '{"name": "only_nested_stale", "meta": {"created_at": "2020-01-01"}}',
+        '{"name": "quoted_key", "observations": ["\\"created_at\\": \\"2020-01-01\\""]}',
+        '{"name": "stale_numeric", "created_at": 20200101}',
+        '{"name": "empty", "created_at": ""}',
+        '["not an entity", {"created_at": "2020-01-01"}]',
+        '{"name": "malformed", "created_at": "2020-01-01"',
+        '{"type": "relation", "from": "stale", "to": "valid", "relationType": "relates_to"}',
+        '{"name":"stale_compact","created_at":"2023-12-31T23:59:59Z"}',
+    ]
+
+    def test_matches_decoding_every_line(
+        self,
+        jsonl_file: Path,
+        apply_mock_patches: dict,
+    ):
+        """The scan finds exactly the entities that decoding every line would."""
+        jsonl_file.write_text("\n".join(self.LINES) + "\n")
+        handler = MemoryMcpHandler()
+
+        expected = [entity for _, entity in handler._iter_lines()
+                    if entity is not None and handler._is_stale(entity, self.CUTOFF)]
+        stale_items = handler.get_stale_items(self.CUTOFF)
+
+        assert stale_items == expected
+        assert [e["name"] for e in stale_items] == [
+            "stale", "stale_same_second", "stale_offset", "stale_date_only", "stale_escaped",
+            "stale_nested_valid", "stale_numeric", "stale_compact",
+        ]
+
+    def test_cleanup_keeps_bytes_unchanged(
+        self,
+        jsonl_file: Path,
+        apply_mock_patches: dict,
+        monkeypatch,
+    ):
+        """Kept lines are copied byte for byte (spacing, key order, line endings, a missing final newline)."""
+        kept = (
+            b'{ "created_at" : "2024-02-01T00:00:00Z" ,"name":"spaced"}\r\n'
+            b'\n'
+            b'{"name": "caf\xc3\xa9", "created_at": "2024-03-01T00:00:00Z"}\n'
+        )
+        stale = b'{"name": "stale", "created_at": "2024-01-01T00:00:00Z"}\r\n'
+        jsonl_file.write_bytes(stale + kept + stale.rstrip())
+        cutoff = self.CUTOFF
+        monkeypatch.setattr(MemoryMcpHandler, "get_cutoff", lambda self, retention: cutoff)
+
+        result = MemoryMcpHandler().cleanup("90d")
+
+        assert result["deleted"] == 2
+        assert jsonl_file.read_bytes() == kept
+
+    def test_file_written_while_mapping_read_instead(
+        self,
+        jsonl_file: Path,
+        apply_mock_patches: dict,
+        monkeypatch,
+    ):
+        """A file that changes while it's being mapped (Memory MCP saving it) is read into memory instead."""
+        jsonl_file.write_text(self.LINES[0] + "\n")
+        real_mmap = mmap.mmap
+
+        def mmap_during_save(*args, **kwargs):
+            mapped = real_mmap(*args, **kwargs)
+            with open(jsonl_file, "a") as f:
+                f.write(self.LINES[-1] + "\n")
+            return mapped
+
+        monkeypatch.setattr(mmap, "mmap", mmap_during_save)
+
+        # (the mapping would end before the appended line)
+        stale_items = MemoryMcpHandler().get_stale_items(self.CUTOFF)
+
+        assert [e["name"] for e in stale_items] == ["stale", "stale_compact"]
+
+
+class TestMemoryMcpCompaction:
+    """Tests for cleanup's compaction of the knowledge graph (memory_mcp.compact)."""
+
+    STALE = '{"type":"entity","name":"old","entityType":"concept","observations":["a"],"created_at":"2024-01-01T00:00:00Z"}'
+    DUPLICATED = (
+        '{"type":"entity","name":"new","entityType":"concept","observations":["b","c","b","café","c"],'
+        '"created_at":"2024-03-01T00:00:00Z"}'
+    )
+    TO_OLD = '{"type":"relation","from":"new","to":"old","relationType":"depends_on"}'
+    FROM_OLD = '{"type":"relation","from":"old","to":"new","relationType":"relates_to"}'
+    KEPT = '{"type":"relation","from":"new","to":"other","relationType":"relates_to"}'
+
+    @pytest.fixture
+    def graph_file(self, jsonl_file: Path, apply_mock_patches: dict, monkeypatch) -> Path:
+        # relations may come before the entities they name
+        jsonl_file.write_text("\n".join([self.TO_OLD, self.STALE, self.DUPLICATED, self.FROM_OLD, self.KEPT]) + "\n")
+        cutoff = datetime(2024, 2, 1, tzinfo=timezone.utc)
+        monkeypatch.setattr(MemoryMcpHandler, "get_cutoff", lambda self, retention: cutoff)
+        monkeypatch.setattr("operations.cleanup.handlers.memory_mcp.get_memory_mcp_compact", lambda: True)
+        return jsonl_file
+
+    def test_cascades_relations_and_dedupes_observations(self, graph_file: Path):
+        """Removed entities' relations go to trash with them; repeated observations are dropped."""
+        size = graph_file.stat().st_size
+
+        result = MemoryMcpHandler().cleanup("90d")
+
+        assert (result["deleted"], result["cascaded"], result["deduped"]) == (1, 2, 2)
+        deduped = self.DUPLICATED.replace('["b","c","b","café","c"]', '["b","c","café"]')
+        assert graph_file.read_text() == f"{deduped}\n{self.KEPT}\n"
+        assert result["bytes_reclaimed"] == size - graph_file.stat().st_size
+        # (the trash holds the original lines, in file order)
+        assert Path(result["trash_path"]).read_text() == f"{self.TO_OLD}\n{self.STALE}\n{self.FROM_OLD}\n"
+
+    def test_cascades_relations_of_id_only_entities(self, graph_file: Path):
+        """Relations naming a removed entity by its id (entities without a name) go to trash with it."""
+        stale_by_id = '{"type":"entity","id":"old-id","entityType":"concept","created_at":"2024-01-01T00:00:00Z"}'
+        to_id = '{"type":"relation","from":"new","to":"old-id","relationType":"depends_on"}'
+        graph_file.write_text("\n".join([to_id, stale_by_id, self.KEPT]) + "\n")
+
+        result = MemoryMcpHandler().cleanup("90d")
+
+        assert (result["deleted"], result["cascaded"]) == (1, 1)
+        assert graph_file.read_text() == f"{self.KEPT}\n"
+        assert Path(result["trash_path"]).read_text() == f"{to_id}\n{stale_by_id}\n"
+
+    def test_keeps_relations_of_keys_held_by_kept_entities(self, graph_file: Path):
+        """A relation naming a removed entity's id is kept if a kept entity has that key as its name."""
+        kept_x = '{"type":"entity","name":"X","entityType":"concept","created_at":"2024-03-01T00:00:00Z"}'
+        stale_x = '{"type":"entity","id":"X","entityType":"concept","created_at":"2024-01-01T00:00:00Z"}'
+        kept_y = '{"type":"entity","name":"Y","entityType":"concept","created_at":"2024-03-01T00:00:00Z"}'
+        y_to_x = '{"type":"relation","from":"Y","to":"X","relationType":"depends_on"}'
+        graph_file.write_text("\n".join([kept_x, stale_x, kept_y, y_to_x]) + "\n")
+
+        result = MemoryMcpHandler().cleanup("90d")
+
+        assert (result["deleted"], result["cascaded"]) == (1, 0)
+        assert graph_file.read_text() == "\n".join([kept_x, kept_y, y_to_x]) + "\n"
+
+    def test_dry_run_reports_compaction(self, graph_file: Path):
+        original = graph_file.read_text()
+
+        result = MemoryMcpHandler().cleanup("90d", dry_run=True)
+
+        assert (result["would_delete"], result["would_cascade"], result["would_dedupe"]) == (1, 2, 2)
+        assert [item["name"] for item in result["items"]] == ["old"]
+        assert graph_file.read_text() == original
+
+    def test_disabled(self, graph_file: Path, monkeypatch):
+        """With memory_mcp.compact off, only stale lines are removed."""
+        monkeypatch.setattr("operations.cleanup.handlers.memory_mcp.get_memory_mcp_compact", lambda: False)
+
+        result = MemoryMcpHandler().cleanup("90d")
+
+        assert result["deleted"] == 1
+        assert "cascaded" not in result
+        assert graph_file.read_text() == "\n".join([self.TO_OLD, self.DUPLICATED, self.FROM_OLD, self.KEPT]) + "\n"
@@ -1,14 +1,28 @@
 """Tests for QdrantHandler (REST API cleanup)."""
+import errno
 import json
+import time
 import pytest
+from email.message import Message
 from datetime import datetime
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 from urllib.error import HTTPError, URLError
 
 
+from operations.testing.qdrant_stub import QdrantStubServer
 from operations.cleanup.handlers import CleanupError
-from operations.cleanup.handlers.qdrant import QdrantHandler
-from operations.cleanup.tests import NonJsonHttpResponse, create_mock_http_endpoint
+from operations.cleanup.handlers.qdrant import CREATED_AT_FIELD, QdrantHandler
+from operations.cleanup.trash import get_trash_dir
+from operations.cleanup.tests import (
+    NonJsonHttpResponse,
+    create_mock_http_endpoint,
+    patch_connection_pool,
+)
+
+
+# import location of the connection pool used by QdrantHandler for all HTTP requests
+QDRANT_POOL = "operations.cleanup.handlers.qdrant.HTTPConnectionPool"
 
 
 # Define response maps to stub Qdrant HTTP API endpoints called via these tests
@@ -18,15 +32,21 @@ def _collection_exists_response():
 
 
 def _scroll_response(points: list, next_offset=None):
-    """Response map for scroll endpoint."""
+    """Response map for scroll endpoint (and for retrieving the same points' full payloads by ID)."""
     return {
         ("POST", "/points/scroll"): {
             "status": "ok",
             "result": {"points": points, "next_page_offset": next_offset},
-        }
+        },
+        **_retrieve_response(points),
     }
 
 
+def _retrieve_response(points: list):
+    """Response map for point retrieval endpoint."""
+    return {("POST", "/coding-memory/points"): {"status": "ok", "result": points}}
+
+
 def _delete_response(status="ok"):
     """Response map for delete endpoint."""
     return {("POST", "/points/delete"): {"status": status}}
@@ -54,7 +74,7 @@ class TestQdrantGetExpiredItems:
             ]),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
 
@@ -87,6 +107,14 @@ class TestQdrantGetExpiredItems:
 
             if "collections/coding-memory" in url and method == "GET":
                 mock_resp.read.return_value = json.dumps({"status": "ok"}).encode()
+            elif url.endswith("/points"):
+                # retrieve full payloads for the requested stale IDs
+                ids = json.loads(req.data)["ids"]
+                response = {
+                    "status": "ok",
+                    "result": [{"id": i, "payload": {"metadata": {"created_at": old_ts}}} for i in ids],
+                }
+                mock_resp.read.return_value = json.dumps(response).encode()
             elif "/points/scroll" in url:
                 call_count[0] += 1
                 if call_count[0] == 1:
@@ -119,7 +147,7 @@ class TestQdrantGetExpiredItems:
 
             return mock_resp
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=paginated_urlopen):
+        with patch_connection_pool(QDRANT_POOL, paginated_urlopen):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
 
@@ -140,7 +168,7 @@ class TestQdrantGetExpiredItems:
             ]),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
 
@@ -156,7 +184,7 @@ class TestQdrantGetExpiredItems:
             ("GET", "/collections/coding-memory"): {"status": "error", "message": "Not found"},
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
 
@@ -187,7 +215,7 @@ class TestQdrantGetExpiredItems:
             mock_resp.read.return_value = b'{}'
             return mock_resp
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=error_urlopen):
+        with patch_connection_pool(QDRANT_POOL, error_urlopen):
             handler = QdrantHandler()
             with pytest.raises(CleanupError, match="Qdrant HTTP 500"):
                 handler.get_stale_items(cutoff_datetime)
@@ -203,7 +231,7 @@ class TestQdrantGetExpiredItems:
             **_scroll_response([]),  # empty points list
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
 
@@ -218,7 +246,7 @@ class TestQdrantGetExpiredItems:
         def unreachable_urlopen(req, timeout=None):
             raise URLError("Connection refused")
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=unreachable_urlopen):
+        with patch_connection_pool(QDRANT_POOL, unreachable_urlopen):
             handler = QdrantHandler()
             with pytest.raises(CleanupError, match="Qdrant unavailable"):
                 handler.get_stale_items(cutoff_datetime)
@@ -229,8 +257,8 @@ class TestQdrantGetExpiredItems:
         cutoff_datetime: datetime,
     ):
         """JSONDecodeError (malformed response) raises CleanupError."""
-        with patch("operations.cleanup.handlers.qdrant.urlopen",
-                   side_effect=create_mock_http_endpoint({
+        with patch_connection_pool(QDRANT_POOL,
+                   create_mock_http_endpoint({
                        ("GET", "/collections/coding-memory"): NonJsonHttpResponse(b"not valid json {")
                    })):
             handler = QdrantHandler()
@@ -253,7 +281,7 @@ class TestQdrantGetExpiredItems:
             ]),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
 
@@ -279,7 +307,7 @@ class TestQdrantGetExpiredItems:
             ]),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
 
@@ -306,7 +334,7 @@ class TestQdrantGetExpiredItems:
             ]),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
 
@@ -335,7 +363,7 @@ class TestQdrantGetExpiredItems:
             ]),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
 
@@ -345,6 +373,299 @@ class TestQdrantGetExpiredItems:
         assert 3 in ids  # valid point found
 
 
+class TestQdrantServerSideFilter:
+    """Tests for the created_at range filter and payload index used by get_stale_items()."""
+
+    @staticmethod
+    def _recording_endpoint(responses_map: dict, requests: list):
+        """Wraps a mock endpoint to record each request as (method, url, JSON body)."""
+        endpoint = create_mock_http_endpoint(responses_map)
+
+        def recording_endpoint(req, timeout=None):
+            body = json.loads(req.data) if req.data else None
+            requests.append((req.get_method(), req.full_url, body))
+            return endpoint(req, timeout)
+
+        return recording_endpoint
+
+    def test_scroll_sends_created_at_range_filter(
+        self,
+        apply_mock_patches: dict,
+        cutoff_datetime: datetime,
+    ):
+        """Scroll requests filter on metadata.created_at < cutoff server-side."""
+        requests: list = []
+        responses_map = {**_collection_exists_response(), **_scroll_response([])}
+
+        with patch_connection_pool(QDRANT_POOL,
+                   self._recording_endpoint(responses_map, requests)):
+            QdrantHandler().get_stale_items(cutoff_datetime)
+
+        scroll_bodies = [body for method, url, body in requests if url.endswith("/points/scroll")]
+        assert len(scroll_bodies) == 1
+
+        conditions = scroll_bodies[0]["filter"]["should"]
+        assert {"key": "metadata.created_at", "range": {"lt": "2024-01-15T12:00:00.000000Z"}} in conditions
+
+    def test_creates_missing_datetime_index(
+        self,
+        apply_mock_patches: dict,
+        cutoff_datetime: datetime,
+    ):
+        """A datetime payload index is created on metadata.created_at when the collection lacks one."""
+        requests: list = []
+        responses_map = {
+            **_collection_exists_response(),
+            ("PUT", "/collections/coding-memory/index"): {"status": "ok"},
+            **_scroll_response([]),
+        }
+
+        with patch_connection_pool(QDRANT_POOL,
+                   self._recording_endpoint(responses_map, requests)):
+            QdrantHandler().get_stale_items(cutoff_datetime)
+
+        index_requests = [body for method, url, body in requests if method == "PUT"]
+        assert index_requests == [{"field_name": "metadata.created_at", "field_schema": "datetime"}]
+
+    def test_dry_run_creates_no_index(
+        self,
+        apply_mock_patches: dict,
+        cutoff_datetime: datetime,
+        monkeypatch,
+    ):
+        """Dry runs leave a collection lacking a created_at index as it is."""
+        requests: list = []
+        responses_map = {**_collection_exists_response(), **_scroll_response([])}
+        monkeypatch.setattr(QdrantHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+
+        with patch_connection_pool(QDRANT_POOL,
+                   self._recording_endpoint(responses_map, requests)):
+            QdrantHandler().cleanup(retention="180d", dry_run=True)
+
+        assert not [request for request in requests if request[0] == "PUT"]
+
+    def test_existing_index_not_recreated(
+        self,
+        apply_mock_patches: dict,
+        cutoff_datetime: datetime,
+    ):
+        """No index request is sent when the collection already has a datetime index on created_at."""
+        requests: list = []
+        responses_map = {
+            ("GET", "/collections/coding-memory"): {
+                "status": "ok",
+                "result": {"payload_schema": {"metadata.created_at": {"data_type": "datetime"}}},
+            },
+            **_scroll_response([]),
+        }
+
+        with patch_connection_pool(QDRANT_POOL,
+                   self._recording_endpoint(responses_map, requests)):
+            QdrantHandler().get_stale_items(cutoff_datetime)
+
+        assert not [request for request in requests if request[0] == "PUT"]
+
+    def test_legacy_date_strings_checked_client_side(
+        self,
+        apply_mock_patches: dict,
+        cutoff_datetime: datetime,
+    ):
+        """Legacy YYYY-MM-DD timestamps returned by the filter are compared against the cutoff client-side."""
+        responses_map = {
+            **_collection_exists_response(),
+            **_scroll_response([
+                {"id": 1, "payload": {"metadata": {"created_at": "2024-01-01"}}},
+                {"id": 2, "payload": {"metadata": {"created_at": "2024-02-01"}}},
+            ]),
+        }
+
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
+            items = QdrantHandler().get_stale_items(cutoff_datetime)
+
+        assert [item["id"] for item in items] == [1]
+
+    def test_falls_back_when_filter_rejected(
+        self,
+        apply_mock_patches: dict,
+        cutoff_datetime: datetime,
+        stale_datetime: datetime,
+    ):
+        """Servers rejecting the datetime range filter (HTTP 400) are scrolled unfiltered instead."""
+        old_ts = stale_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        scroll_bodies: list = []
+
+        def old_server_urlopen(req, timeout=None):
+            if req.full_url.endswith("/points/scroll"):
+                body = json.loads(req.data)
+                scroll_bodies.append(body)
+                if "filter" in body:
+                    raise HTTPError(req.full_url, 400, "Bad Request", {}, None)
+            return create_mock_http_endpoint({
+                **_collection_exists_response(),
+                **_scroll_response([{"id": 1, "payload": {"metadata": {"created_at": old_ts}}}]),
+            })(req, timeout)
+
+        with patch_connection_pool(QDRANT_POOL, old_server_urlopen):
+            items = QdrantHandler().get_stale_items(cutoff_datetime)
+
+        assert [item["id"] for item in items] == [1]
+        assert ["filter" in body for body in scroll_bodies] == [True, False]
+
+
+class TestQdrantConnectionReuse:
+    """Tests for QdrantHandler's per-run keep-alive connection pool and metadata cache (against a local server)."""
+
+    @pytest.fixture
+    def stub_server(self, apply_mock_patches: dict, stale_datetime: datetime, monkeypatch):
+        """Local Qdrant stand-in serving 5,000 stale points, with the handler pointed at it."""
+        old_ts = stale_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        points = [{"id": i, "payload": {"metadata": {"created_at": old_ts}}} for i in range(1, 5001)]
+
+        with QdrantStubServer(points) as server:
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_url", lambda: server.url)
+            yield server
+
+    def test_full_scroll_uses_one_connection(
+        self,
+        stub_server: QdrantStubServer,
+        cutoff_datetime: datetime,
+        record_property,
+    ):
+        """A full scroll sends every request over one connection; throughput is recorded as requests/sec."""
+        handler = QdrantHandler()
+
+        start = time.perf_counter()
+        items = handler.get_stale_items(cutoff_datetime)
+        elapsed = time.perf_counter() - start
+
+        assert len(items) == 5000
+        assert stub_server.connections == 1
+
+        record_property("qdrant_scroll_requests_per_sec", round(stub_server.requests / elapsed))
+
+    def test_collection_metadata_fetched_once_per_run(
+        self,
+        stub_server: QdrantStubServer,
+        cutoff_datetime: datetime,
+        monkeypatch,
+    ):
+        """Collection metadata is looked up once per run, then refetched on the next run."""
+        monkeypatch.setattr(QdrantHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+        monkeypatch.setattr("operations.cleanup.handlers.base.get_cleanup_batch_size", lambda: 1000)
+
+        handler = QdrantHandler()
+        lookups = []
+        original = handler._http_request
+
+        def counting_request(method, endpoint, data=None):
+            if method == "GET":
+                lookups.append(endpoint)
+            return original(method, endpoint, data)
+
+        monkeypatch.setattr(handler, "_http_request", counting_request)
+
+        handler.cleanup(retention="180d", dry_run=True)
+        assert len(lookups) == 1
+
+        handler.cleanup(retention="180d", dry_run=True)
+        assert len(lookups) == 2
+        assert handler._pool is None  # pooled connections are closed at the end of each run
+
+
+class TestQdrantTwoPhaseScan:
+    """Tests for scanning created_at only, then retrieving full payloads for stale points."""
+
+    @staticmethod
+    def _points(stale_datetime: datetime, valid_datetime: datetime, count: int) -> list[dict]:
+        """Points with alternating stale (odd IDs) and valid (even IDs) timestamps."""
+        old_ts = stale_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        new_ts = valid_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        return [
+            {
+                "id": i,
+                "payload": {"document": f"memory {i}", "metadata": {"created_at": old_ts if i % 2 else new_ts}},
+                "vector": [0.1, 0.2],
+            }
+            for i in range(1, count + 1)
+        ]
+
+    def test_payloads_retrieved_only_for_stale_points(
+        self,
+        apply_mock_patches: dict,
+        cutoff_datetime: datetime,
+        stale_datetime: datetime,
+        valid_datetime: datetime,
+        monkeypatch,
+    ):
+        """The scan requests only created_at; full payloads are then retrieved for stale IDs alone."""
+        monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_export_vectors", lambda: False)
+        with QdrantStubServer(self._points(stale_datetime, valid_datetime, 10)) as server:
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_url", lambda: server.url)
+            bodies: list = []
+            handler = QdrantHandler()
+            original = handler._http_request
+
+            def recording_request(method, endpoint, data=None):
+                bodies.append((endpoint, data))
+                return original(method, endpoint, data)
+
+            monkeypatch.setattr(handler, "_http_request", recording_request)
+            batches = list(handler.iter_stale_batches(cutoff_datetime, batch_size=2))
+
+        scroll_bodies = [data for endpoint, data in bodies if endpoint.endswith("/points/scroll")]
+        assert all(body["with_payload"] == ["metadata.created_at"] for body in scroll_bodies)
+
+        retrieved_ids = [data["ids"] for endpoint, data in bodies if endpoint.endswith("/points")]
+        assert retrieved_ids == [[1, 3], [5, 7], [9]]
+
+        items = [item for batch in batches for item in batch]
+        assert [item["payload"]["document"] for item in items] == [f"memory {i}" for i in (1, 3, 5, 7, 9)]
+        assert all("vector" not in item for item in items)
+
+    def test_vectors_exported_when_enabled(
+        self,
+        apply_mock_patches: dict,
+        cutoff_datetime: datetime,
+        stale_datetime: datetime,
+        valid_datetime: datetime,
+        monkeypatch,
+    ):
+        """Vectors are retrieved along with payloads when qdrant.export_vectors is set."""
+        monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_export_vectors", lambda: True)
+
+        with QdrantStubServer(self._points(stale_datetime, valid_datetime, 4)) as server:
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_url", lambda: server.url)
+            items = QdrantHandler().get_stale_items(cutoff_datetime)
+
+        assert [item["vector"] for item in items] == [[0.1, 0.2], [0.1, 0.2]]
+
+    def test_scan_page_size_grows(
+        self,
+        apply_mock_patches: dict,
+        cutoff_datetime: datetime,
+        stale_datetime: datetime,
+        valid_datetime: datetime,
+        monkeypatch,
+    ):
+        """Scroll pages grow from SCAN_PAGE_SIZE_MIN while Qdrant responds quickly."""
+        with QdrantStubServer(self._points(stale_datetime, valid_datetime, 2000)) as server:
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_url", lambda: server.url)
+            limits: list = []
+            handler = QdrantHandler()
+            original = handler._http_request
+
+            def recording_request(method, endpoint, data=None):
+                if endpoint.endswith("/points/scroll"):
+                    limits.append(data["limit"])
+                return original(method, endpoint, data)
+
+            monkeypatch.setattr(handler, "_http_request", recording_request)
+            items = handler.get_stale_items(cutoff_datetime)
+
+        assert len(items) == 1000
+        assert limits == [256, 512, 1024, 2048]
+
+
 class TestQdrantDeleteItems:
     """Tests for QdrantHandler.delete_items_from_storage()."""
 
@@ -368,7 +689,7 @@ class TestQdrantDeleteItems:
             **_delete_response("ok"),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = handler.get_stale_items(cutoff_datetime)
             deleted = handler.delete_items_from_storage(items)
@@ -394,7 +715,7 @@ class TestQdrantDeleteItems:
             **_delete_response("error"),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             items = [{"id": 1, "created_at": "2024-01-01", "payload": {}}]
             deleted = handler.delete_items_from_storage(items)
@@ -402,14 +723,156 @@ class TestQdrantDeleteItems:
         assert deleted == 0
 
 
+class TestQdrantChunkedDeletes:
+    """Tests for chunked, queued deletes (and the filter-based delete mode)."""
+
+    @pytest.fixture
+    def stub_server(self, apply_mock_patches: dict, stale_datetime: datetime, monkeypatch):
+        """Local Qdrant stand-in serving 10 stale points, with the handler pointed at it."""
+        old_ts = stale_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        points = [{"id": i, "payload": {"metadata": {"created_at": old_ts}}} for i in range(1, 11)]
+
+        with QdrantStubServer(points) as server:
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_url", lambda: server.url)
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_delete_chunk_size", lambda: 4)
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_delete_mode", lambda: "ids")
+            monkeypatch.setattr("operations.cleanup.handlers.base.get_cleanup_batch_size", lambda: 1000)
+            yield server
+
+    @staticmethod
+    def _record_deletes(handler: QdrantHandler, monkeypatch) -> list:
+        """Record the (endpoint, body) of each delete request the handler sends."""
+        deletes: list = []
+        original = handler._http_request
+
+        def recording_request(method, endpoint, data=None):
+            if "/points/delete" in endpoint:
+                deletes.append((endpoint, data))
+            return original(method, endpoint, data)
+
+        monkeypatch.setattr(handler, "_http_request", recording_request)
+        return deletes
+
+    def test_deletes_in_queued_chunks(
+        self,
+        stub_server: QdrantStubServer,
+        cutoff_datetime: datetime,
+        monkeypatch,
+    ):
+        """Deletes are split into chunks; only the last waits for Qdrant to apply them."""
+        monkeypatch.setattr(QdrantHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+        handler = QdrantHandler()
+        deletes = self._record_deletes(handler, monkeypatch)
+
+        result = handler.cleanup(retention="180d")
+
+        assert result["deleted"] == 10
+        assert stub_server.points == {}
+        assert [len(body["points"]) for _, body in deletes] == [4, 4, 2]
+        assert [endpoint.endswith("wait=true") for endpoint, _ in deletes] == [False, False, True]
+        assert [chunk["points"] for chunk in result["delete_chunks"]] == [4, 4, 2]
+
+    def test_filter_mode_limits_deletes_to_exported_ids(
+        self,
+        stub_server: QdrantStubServer,
+        cutoff_datetime: datetime,
+        monkeypatch,
+    ):
+        """Filter-based deletes combine the stale created_at filter with the chunk's exported IDs."""
+        monkeypatch.setattr(QdrantHandler, "get_cutoff", lambda self, _: cutoff_datetime)
+        monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_delete_mode", lambda: "filter")
+        handler = QdrantHandler()
+        deletes = self._record_deletes(handler, monkeypatch)
+
+        result = handler.cleanup(retention="180d")
+
+        assert result["deleted"] == 10
+        conditions = [body["filter"]["must"] for _, body in deletes]
+        assert [condition[0] for condition in conditions] == [
+            {"has_id": [1, 2, 3, 4]}, {"has_id": [5, 6, 7, 8]}, {"has_id": [9, 10]}
+        ]
+        assert all(condition[1] == handler._stale_filter(cutoff_datetime) for condition in conditions)
+
+    def test_deleted_count_reflects_remaining_points(
+        self,
+        apply_mock_patches: dict,
+        monkeypatch,
+    ):
+        """The reported count excludes points Qdrant still holds after the final delete."""
+        monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_delete_chunk_size", lambda: 256)
+        responses_map = {
+            **_delete_response("ok"),
+            ("POST", "/points/count"): {"status": "ok", "result": {"count": 1}},
+        }
+
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
+            items: list[dict] = [{"id": i, "created_at": "2024-01-01", "payload": {}} for i in (1, 2, 3)]
+            deleted = QdrantHandler().delete_items_from_storage(items)
+
+        assert deleted == 2
+
+    def test_failed_count_trusts_acknowledgements(
+        self,
+        apply_mock_patches: dict,
+    ):
+        """A count request that fails after the deletes doesn't fail them: acknowledged points count as deleted."""
+        responses_map = {
+            **_delete_response("ok"),
+            ("POST", "/points/count"): HTTPError("", 400, "Bad Request", Message(), None),
+        }
+
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
+            items: list[dict] = [{"id": i, "created_at": "2024-01-01", "payload": {}} for i in (1, 2, 3)]
+            deleted = QdrantHandler().delete_items_from_storage(items)
+
+        assert deleted == 3
+
+    def test_wipe_counts_remaining_points_in_chunks(
+        self,
+        stub_server: QdrantStubServer,
+        monkeypatch,
+    ):
+        """The post-delete count sends at most qdrant.delete_chunk_size ids per request."""
+        handler = QdrantHandler()
+        counts: list = []
+        original = handler._http_request
+
+        def recording_request(method, endpoint, data=None, timeout=None):
+            if endpoint.endswith("/points/count"):
+                counts.append(data["filter"]["must"][0]["has_id"])
+            return original(method, endpoint, data, timeout)
+
+        monkeypatch.setattr(handler, "_http_request", recording_request)
+        result = handler.wipe(backup=False)
+
+        assert result["wiped"] == 10
+        assert [len(ids) for ids in counts] == [4, 4, 2]
+
+    def test_wipe_deletes_every_page(
+        self,
+        stub_server: QdrantStubServer,
+    ):
+        """Wipe removes points from all scroll pages, not just the last one."""
+        stub_server.points.update({
+            i: {"id": i, "payload": {"metadata": {"created_at": "2024-01-01"}}} for i in range(11, 251)
+        })
+
+        result = QdrantHandler().wipe(backup=False)
+
+        assert result["wiped"] == 250
+        assert stub_server.points == {}
+
+
 class TestQdrantWipe:
     """Tests for QdrantHandler.wipe()."""
 
     def test_wipe_deletes_all_points(
         self,
         apply_mock_patches: dict,
+        monkeypatch,
     ):
-        """Wipe removes all points from collection."""
+        """Wipe removes all points from collection (backed up as a JSON export)."""
+        monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_wipe_backup", lambda: "json")
         responses_map = {
             **_collection_exists_response(),
             **_scroll_response([
@@ -419,7 +882,7 @@ class TestQdrantWipe:
             **_delete_response("ok"),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             result = handler.wipe(backup=True)
 
@@ -435,7 +898,7 @@ class TestQdrantWipe:
             **_scroll_response([]),  # Empty
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             result = handler.wipe()
 
@@ -456,9 +919,202 @@ class TestQdrantWipe:
             **_delete_response("ok"),
         }
 
-        with patch("operations.cleanup.handlers.qdrant.urlopen", side_effect=create_mock_http_endpoint(responses_map)):
+        with patch_connection_pool(QDRANT_POOL, create_mock_http_endpoint(responses_map)):
             handler = QdrantHandler()
             result = handler.wipe(backup=False)
 
         assert result["wiped"] == 2
         assert "backup_path" not in result  # no backup was created
+
+
+class TestQdrantSnapshotBackups:
+    """Tests for snapshot-based wipe backups and restoring from them."""
+
+    @pytest.fixture
+    def stub_server(self, apply_mock_patches: dict, monkeypatch):
+        """Local Qdrant stand-in serving 5 points, with the handler pointed at it."""
+        points = [{"id": i, "payload": {"document": f"memory {i}"}} for i in range(1, 6)]
+
+        with QdrantStubServer(points) as server:
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_url", lambda: server.url)
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_wipe_backup", lambda: "snapshot")
+            yield server
+
+    def test_wipe_streams_snapshot_to_trash(
+        self,
+        stub_server: QdrantStubServer,
+        apply_mock_patches: dict,
+    ):
+        """Wipe saves a collection snapshot to trash, records it in the manifest, then deletes every point."""
+        original = json.dumps(list(stub_server.points.values())).encode()
+
+        result = QdrantHandler().wipe(backup=True)
+
+        snapshot_path = Path(result["backup_path"])
+        assert result["wiped"] == 5
+        assert stub_server.points == {}
+        assert snapshot_path.suffix == ".snapshot"
+        assert snapshot_path.read_bytes() == original
+        assert stub_server.snapshots == {}  # removed from Qdrant once downloaded
+
+        manifest = json.loads((snapshot_path.parent / ".manifest.json").read_text())
+        assert manifest[-1]["files"] == [str(snapshot_path)]
+        assert manifest[-1]["item_count"] == 5
+        assert manifest[-1]["snapshot"] == "coding-memory-1.snapshot"
+
+    def test_failed_snapshot_aborts_wipe(
+        self,
+        stub_server: QdrantStubServer,
+        monkeypatch,
+    ):
+        """Points are kept if the snapshot can't be downloaded."""
+        original = QdrantHandler._raw_request
+
+        def failing_download(self, method, endpoint, *args, **kwargs):
+            if method == "GET" and "/snapshots/" in endpoint:
+                raise CleanupError("Qdrant unavailable: connection reset")
+            return original(self, method, endpoint, *args, **kwargs)
+
+        monkeypatch.setattr(QdrantHandler, "_raw_request", failing_download)
+
+        result = QdrantHandler().wipe(backup=True)
+
+        assert "connection reset" in result["error"]
+        assert len(stub_server.points) == 5
+        assert stub_server.snapshots == {}
+        assert not list(get_trash_dir("qdrant").iterdir())
+
+    def test_failed_snapshot_write_reported_as_backup_failure(
+        self,
+        stub_server: QdrantStubServer,
+        monkeypatch,
+    ):
+        """A snapshot that can't be written to trash (e.g. a full disk) isn't reported as Qdrant being down."""
+        real_open = open
+
+        class FullDisk:
+            def __init__(self, path):
+                self._file = real_open(path, "wb")
+
+            def write(self, data):
+                raise OSError(errno.ENOSPC, "No space left on device")
+
+            def __getattr__(self, name):
+                return getattr(self._file, name)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                self._file.close()
+
+        monkeypatch.setattr(
+            "operations.cleanup.handlers.qdrant.open",
+            lambda path, mode="r": FullDisk(path) if mode == "wb" else real_open(path, mode),
+            raising=False,
+        )
+
+        result = QdrantHandler().wipe(backup=True)
+
+        assert result["error"].startswith("Failed to write Qdrant snapshot to trash")
+        assert "No space left" in result["error"]
+        assert len(stub_server.points) == 5
+        assert stub_server.snapshots == {}
+
+    def test_restore_latest_snapshot(
+        self,
+        stub_server: QdrantStubServer,
+    ):
+        """Restoring uploads the latest snapshot in trash, bringing the wiped points back."""
+        original = dict(stub_server.points)
+        QdrantHandler().wipe(backup=True)
+
+        result = QdrantHandler().restore_snapshot()
+
+        assert result["restored"].endswith(".snapshot")
+        assert stub_server.points == original
+
+    def test_restore_without_snapshot(
+        self,
+        stub_server: QdrantStubServer,
+    ):
+        """Restoring with no snapshot in trash reports an error."""
+        result = QdrantHandler().restore_snapshot()
+
+        assert "No snapshot found" in result["error"]
+
+
+class TestQdrantFastWipe:
+    """Tests for wiping by dropping and recreating the collection."""
+
+    @pytest.fixture
+    def stub_server(self, apply_mock_patches: dict, monkeypatch):
+        """Local Qdrant stand-in serving 5 points (with a payload index), with the handler pointed at it."""
+        points = [{"id": i, "payload": {"document": f"memory {i}"}} for i in range(1, 6)]
+
+        with QdrantStubServer(points) as server:
+            server.payload_schema[CREATED_AT_FIELD] = {"data_type": "datetime"}
+            monkeypatch.setattr("operations.cleanup.handlers.qdrant.get_qdrant_url", lambda: server.url)
+            yield server
+
+    def test_recreates_collection_with_same_config(
+        self,
+        stub_server: QdrantStubServer,
+    ):
+        """The collection is dropped and recreated with its captured config and payload indexes."""
+        result = QdrantHandler().wipe(backup=False, fast=True)
+
+        assert result["wiped"] == 5
+        assert stub_server.points == {}
+        assert stub_server.exists
+        assert stub_server.created_with == [{
+            "vectors": {"size": 384, "distance": "Cosine"},
+            "shard_number": 1,
+            "hnsw_config": {"m": 16, "ef_construct": 100},
+            "optimizers_config": {"deleted_threshold": 0.2},
+        }]
+        assert stub_server.payload_schema == {CREATED_AT_FIELD: {"data_type": "datetime"}}
+
+    def test_counts_points_exactly(
+        self,
+        stub_server: QdrantStubServer,
+        monkeypatch,
+    ):
+        """A collection whose (approximate) points_count is 0 or missing is still wiped if it holds points."""
+        handler = QdrantHandler()
+        get_collection_info = handler._get_collection_info
+
+        def without_points_count():
+            info = get_collection_info()
+            return info and {key: value for key, value in info.items() if key != "points_count"}
+
+        monkeypatch.setattr(handler, "_get_collection_info", without_points_count)
+        result = handler.wipe(backup=False, fast=True)
+
+        assert result["wiped"] == 5
+        assert stub_server.points == {}
+
+    def test_backs_up_snapshot_first(
+        self,
+        stub_server: QdrantStubServer,
+    ):
+        """A snapshot is saved to trash before the collection is dropped, and restores it."""
+        original = dict(stub_server.points)
+
+        result = QdrantHandler().wipe(backup=True, fast=True)
+        assert Path(result["backup_path"]).suffix == ".snapshot"
+
+        QdrantHandler().restore_snapshot(Path(result["backup_path"]))
+        assert stub_server.points == original
+
+    def test_not_dropped_without_vector_config(
+        self,
+        stub_server: QdrantStubServer,
+    ):
+        """A collection whose config can't be captured is left untouched."""
+        stub_server.config = {}
+
+        result = QdrantHandler().wipe(backup=False, fast=True)
+
+        assert "config" in result["error"]
+        assert len(stub_server.points) == 5
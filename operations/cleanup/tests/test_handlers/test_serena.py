@@ -1,10 +1,15 @@
 """Tests for SerenaHandler (filesystem cleanup)."""
+import json
 import os
 from datetime import datetime, timezone
 from pathlib import Path
 
+import pytest
 
+from operations.cleanup.handlers.base import CleanupError
 from operations.cleanup.handlers.serena import SerenaHandler
+from operations.cleanup.serena_inventory import MtimeTable, save_inventory
+from operations.cleanup.trash import get_trash_dir
 
 
 class TestSerenaFindSerenaDirs:
@@ -107,6 +112,148 @@ class TestSerenaFindSerenaDirs:
 
         assert dirs == []
 
+    def test_ignored_dirs_not_descended(
+        self,
+        serena_memories_root: Path,
+        apply_mock_patches: dict,
+        monkeypatch,
+    ):
+        """Directories matching serena.ignore are pruned, at any level."""
+        for ignored in ("project_0/node_modules/pkg", "project_1/cache-old", "build"):
+            (serena_memories_root / ignored / ".serena" / "memories").mkdir(parents=True)
+        monkeypatch.setattr(
+            "operations.cleanup.handlers.serena.get_serena_ignore",
+            lambda: ["node_modules", "cache-*", "build"]
+        )
+
+        dirs = SerenaHandler()._find_serena_dirs()
+
+        assert [d.parent.parent.name for d in dirs] == ["project_0", "project_1"]
+
+    def test_max_depth(
+        self,
+        serena_memories_root: Path,
+        apply_mock_patches: dict,
+        monkeypatch,
+    ):
+        """.serena directories deeper than serena.max_depth levels aren't found."""
+        shallow = serena_memories_root / "project_0" / "a" / ".serena" / "memories"
+        deep = serena_memories_root / "project_0" / "a" / "b" / ".serena" / "memories"
+        shallow.mkdir(parents=True)
+        deep.mkdir(parents=True)
+        monkeypatch.setattr("operations.cleanup.handlers.serena.get_serena_max_depth", lambda: 3)
+
+        dirs = SerenaHandler()._find_serena_dirs()
+
+        assert shallow in dirs
+        assert deep not in dirs
+        assert len(dirs) == 3
+
+    def test_memories_symlink_skipped(
+        self,
+        serena_memories_root: Path,
+        apply_mock_patches: dict,
+        tmp_path: Path,
+    ):
+        """A memories directory that is itself a symlink is skipped."""
+        serena_dir = serena_memories_root / "project_link" / ".serena"
+        serena_dir.mkdir(parents=True)
+        (serena_dir / "memories").symlink_to(tmp_path / "external" / ".serena" / "memories")
+
+        dirs = SerenaHandler()._find_serena_dirs()
+
+        assert "project_link" not in [d.parent.parent.name for d in dirs]
+
+
+class TestSerenaDirIndex:
+    """Tests for the persisted index of memories directories used by _find_serena_dirs()."""
+
+    @pytest.fixture
+    def scanned(self, serena_memories_root: Path, apply_mock_patches: dict, monkeypatch) -> list[Path]:
+        """Record the subtrees scanned for .serena directories (after a first, full scan)."""
+        SerenaHandler()._find_serena_dirs()
+
+        subtrees: list[Path] = []
+        original = SerenaHandler._scan_for_serena_dirs
+
+        def record(self, memories_root: Path, subtree: Path) -> list[Path]:
+            subtrees.append(subtree)
+            return original(self, memories_root, subtree)
+
+        monkeypatch.setattr(SerenaHandler, "_scan_for_serena_dirs", record)
+        return subtrees
+
+    def test_index_persisted(
+        self,
+        serena_memories_root: Path,
+        apply_mock_patches: dict,
+        serena_index_path: Path,
+    ):
+        """The first run scans the whole root and saves what it found."""
+        dirs = SerenaHandler()._find_serena_dirs()
+
+        index = json.loads(serena_index_path.read_text())
+        assert index["scan"]["root"] == str(serena_memories_root)
+        assert sorted(index["memories_dirs"]) == [str(d) for d in dirs]
+        assert sorted(index["children"]) == ["project_0", "project_1"]
+
+    def test_unchanged_root_not_rescanned(self, scanned: list[Path]):
+        """Later runs re-check known directories without scanning anything."""
+        dirs = SerenaHandler()._find_serena_dirs()
+
+        assert len(dirs) == 2
+        assert scanned == []
+
+    def test_new_project_scanned_incrementally(self, scanned: list[Path], serena_memories_root: Path):
+        """A new project is found by scanning only that project."""
+        new_memories = serena_memories_root / "project_new" / ".serena" / "memories"
+        new_memories.mkdir(parents=True)
+
+        dirs = SerenaHandler()._find_serena_dirs()
+
+        assert new_memories in dirs
+        assert scanned == [serena_memories_root / "project_new"]
+
+    def test_removed_memories_dir_dropped(self, scanned: list[Path], serena_memories_root: Path):
+        """Known directories that are gone are dropped from the results."""
+        (serena_memories_root / "project_0" / ".serena" / "memories").rename(serena_memories_root / "moved")
+
+        dirs = SerenaHandler()._find_serena_dirs()
+
+        assert [d.parent.parent.name for d in dirs] == ["project_1"]
+
+    @pytest.fixture
+    def nested_memories(self, serena_memories_root: Path, apply_mock_patches: dict) -> Path:
+        """A memories directory created (after a first scan) inside an existing subdirectory of a project."""
+        package_dir = serena_memories_root / "project_0" / "packages" / "app"
+        package_dir.mkdir(parents=True)
+        SerenaHandler()._find_serena_dirs()
+
+        nested_memories = package_dir / ".serena" / "memories"
+        nested_memories.mkdir(parents=True)
+        return nested_memories
+
+    def test_deep_changes_found_on_demand(self, nested_memories: Path, monkeypatch):
+        """Memories nested in an otherwise unchanged project are only found by a full rescan."""
+        monkeypatch.setattr("operations.cleanup.handlers.serena.get_serena_rescan_interval", lambda: "7d")
+        handler = SerenaHandler()
+
+        assert nested_memories not in handler._find_serena_dirs()
+        assert handler.rescan_index() == {"storage": "serena", "memories_dirs": 3}
+        assert nested_memories in handler._find_serena_dirs()
+
+    def test_full_rescan_after_interval(self, nested_memories: Path, monkeypatch):
+        """The whole root is rescanned once serena.rescan_interval has passed."""
+        monkeypatch.setattr("operations.cleanup.handlers.serena.get_serena_rescan_interval", lambda: "0h")
+
+        assert nested_memories in SerenaHandler()._find_serena_dirs()
+
+    def test_full_rescan_after_settings_change(self, nested_memories: Path, monkeypatch):
+        """Changing serena.ignore or serena.max_depth invalidates the index."""
+        monkeypatch.setattr("operations.cleanup.handlers.serena.get_serena_ignore", lambda: ["node_modules"])
+
+        assert nested_memories in SerenaHandler()._find_serena_dirs()
+
 
 class TestSerenaGetExpiredItems:
     """Tests for SerenaHandler.get_stale_items()."""
@@ -177,6 +324,31 @@ class TestSerenaGetExpiredItems:
         assert len(items) == 1
         assert items[0]["path"].suffix == ".md"
 
+    def test_uses_live_inventory(
+        self,
+        serena_memories_root: Path,
+        apply_mock_patches: dict,
+        monkeypatch,
+    ):
+        """While a watcher keeps the inventory, stale files are looked up in it (and re-checked)."""
+        handler = SerenaHandler()
+        memories_dir = serena_memories_root / "project_0" / ".serena" / "memories"
+        old_ns = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp() * 1e9)
+        table = MtimeTable()
+        for name in ("memory_0.md", "memory_1.md", "gone.md"):
+            table.set(str(memories_dir), name, old_ns, 1)
+        save_inventory(table, handler._scan_settings(serena_memories_root), os.getpid())
+        # in fact, only memory_0.md is stale (memory_1.md was modified since, and gone.md removed)
+        os.utime(memories_dir / "memory_0.md", ns=(old_ns, old_ns))
+
+        def no_scan(*args, **kwargs):
+            raise AssertionError("scanned despite a live inventory")
+
+        monkeypatch.setattr(SerenaHandler, "_find_serena_dirs", no_scan)
+        items = handler.get_stale_items(datetime(2024, 1, 15, tzinfo=timezone.utc))
+
+        assert [(item["path"], item["project"]) for item in items] == [(memories_dir / "memory_0.md", "project_0")]
+
     def test_project_name_extraction(
         self,
         serena_memories_root: Path,
@@ -236,8 +408,8 @@ class TestSerenaDeleteItems:
         # setup trash dir
         trash_dir = tmp_path / ".archives" / "trash"
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_dir
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_dir
         )
         monkeypatch.setattr(
             "operations.cleanup.handlers.serena.get_path",
@@ -324,3 +496,87 @@ class TestSerenaWipe:
 
         assert result["wiped"] == 0
         assert "no memory files found" in result["message"]
+
+    def test_fast_wipe_moves_whole_directories(
+        self,
+        serena_memories_root: Path,
+        apply_mock_patches: dict,
+    ):
+        """Fast wipe renames each memories directory into trash, leaving an empty one in its place."""
+        memories_dirs = sorted(serena_memories_root.rglob(".serena/memories"))
+
+        result = SerenaHandler().wipe(backup=True, fast=True)
+
+        assert result["wiped"] == 4
+        assert list(serena_memories_root.rglob("*.md")) == []
+        assert all(d.is_dir() for d in memories_dirs)
+        assert len(list(Path(result["backup_path"]).rglob("*.md"))) == 4
+
+    def test_fast_wipe_no_backup(
+        self,
+        serena_memories_root: Path,
+        apply_mock_patches: dict,
+    ):
+        """Fast wipe without backup removes the directories' contents."""
+        result = SerenaHandler().wipe(backup=False, fast=True)
+
+        assert result["wiped"] == 4
+        assert "backup_path" not in result
+        assert list(serena_memories_root.rglob("*.md")) == []
+        assert list(serena_memories_root.rglob(".memories-wiped")) == []
+
+
+class TestSerenaParallel:
+    """Tests for SerenaHandler with serena.jobs > 1 (projects scanned and trashed on a thread pool)."""
+
+    @pytest.fixture
+    def many_projects(self, serena_memories_root: Path, apply_mock_patches: dict, monkeypatch) -> Path:
+        """8 more projects (with 3 stale memories each), handled on 4 threads."""
+        old_time = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+        for i in range(2, 10):
+            memories_dir = serena_memories_root / f"project_{i}" / ".serena" / "memories"
+            memories_dir.mkdir(parents=True)
+            for j in range(3):
+                memory_file = memories_dir / f"memory_{j}.md"
+                memory_file.write_text(f"# Memory {j}")
+                os.utime(memory_file, (old_time, old_time))
+        monkeypatch.setattr("operations.cleanup.handlers.serena.get_serena_jobs", lambda: 4)
+        return serena_memories_root
+
+    def test_discovery_matches_serial(self, many_projects: Path, monkeypatch):
+        parallel = SerenaHandler()._find_serena_dirs(rescan=True)
+        monkeypatch.setattr("operations.cleanup.handlers.serena.get_serena_jobs", lambda: 1)
+
+        assert parallel == SerenaHandler()._find_serena_dirs(rescan=True)
+        assert len(parallel) == 10
+
+    def test_one_manifest_entry_in_item_order(self, many_projects: Path):
+        """Files of all projects are listed in a single manifest entry, in the order of the items."""
+        handler = SerenaHandler()
+        items = handler.get_stale_items(datetime(2024, 1, 15, tzinfo=timezone.utc))
+        assert len(items) == 24
+
+        trash_dir = Path(handler.export_items_to_trash(items, "90d"))
+
+        manifests = json.loads((trash_dir / ".manifest.json").read_text())
+        assert len(manifests) == 1
+        assert manifests[0]["item_count"] == 24
+        assert manifests[0]["files"] == [
+            str(trash_dir / item["project"] / item["path"].name) for item in items
+        ]
+        assert not any(item["path"].exists() for item in items)
+
+    def test_failed_moves_still_recorded(self, many_projects: Path):
+        """If some files can't be moved, those that were are still listed in the manifest."""
+        handler = SerenaHandler()
+        items = handler.get_stale_items(datetime(2024, 1, 15, tzinfo=timezone.utc))
+        items[5]["path"].unlink()
+
+        with pytest.raises(CleanupError):
+            handler.export_items_to_trash(items, "90d")
+
+        trash_dir = get_trash_dir("serena")
+        manifests = json.loads((trash_dir / ".manifest.json").read_text())
+        assert len(manifests) == 1
+        assert str(trash_dir / items[5]["project"] / items[5]["path"].name) not in manifests[0]["files"]
+        assert len(manifests[0]["files"]) == manifests[0]["item_count"] == 23
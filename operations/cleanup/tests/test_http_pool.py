@@ -0,0 +1,126 @@
+"""Tests for HTTPConnectionPool (keep-alive connections to local REST services)."""
+import io
+import json
+import socket
+import threading
+
+import pytest
+
+from operations.testing.qdrant_stub import QdrantStubServer
+from operations.cleanup.http_pool import HTTPConnectionPool
+
+
+def _points(count: int) -> list[dict]:
+    return [{"id": i, "payload": {"metadata": {"created_at": "2024-01-01T00:00:00.000Z"}}} for i in range(1, count + 1)]
+
+
+class TestHTTPConnectionPool:
+    """Tests for HTTPConnectionPool.request()."""
+
+    def test_reuses_one_connection(self):
+        """Sequential requests share a single keep-alive connection."""
+        with QdrantStubServer(_points(3)) as server:
+            pool = HTTPConnectionPool(server.url)
+            for _ in range(5):
+                status, _, body = pool.request("GET", "/collections/coding-memory")
+                assert status == 200
+                assert json.loads(body)["status"] == "ok"
+            pool.close()
+
+        assert pool.connections_opened == 1
+        assert server.connections == 1
+
+    def test_reconnects_after_server_drops_connection(self):
+        """Requests on a connection the server closed while idle are retried on a new one."""
+        with QdrantStubServer(_points(3), close_after=2) as server:
+            pool = HTTPConnectionPool(server.url)
+            statuses = [pool.request("GET", "/collections/coding-memory")[0] for _ in range(5)]
+            pool.close()
+
+        assert statuses == [200] * 5
+        assert server.requests == 5
+        assert pool.connections_opened == 3
+
+    @staticmethod
+    def _count_sends(pool: HTTPConnectionPool, monkeypatch) -> list[str]:
+        """Record the method of each request the pool sends (retries included)."""
+        sent: list[str] = []
+        send = pool._send
+
+        def counting_send(conn, method, *args):
+            sent.append(method)
+            return send(conn, method, *args)
+
+        monkeypatch.setattr(pool, "_send", counting_send)
+        return sent
+
+    def test_non_idempotent_request_sent_once_on_new_connection(self, monkeypatch):
+        """A POST isn't sent on an idle connection (which the server may have closed), so it's never resent."""
+        with QdrantStubServer(_points(3), close_after=1) as server:
+            pool = HTTPConnectionPool(server.url)
+            sent = self._count_sends(pool, monkeypatch)
+            pool.request("GET", "/collections/coding-memory")
+            status = pool.request("POST", "/collections/coding-memory/snapshots")[0]
+            pool.close()
+
+        assert status == 200
+        assert sent == ["GET", "POST"]
+        assert pool.connections_opened == 2
+
+    def test_idempotent_post_retried(self, monkeypatch):
+        """A POST marked idempotent may use an idle connection, and is resent if that was closed."""
+        with QdrantStubServer(_points(3), close_after=1) as server:
+            pool = HTTPConnectionPool(server.url)
+            sent = self._count_sends(pool, monkeypatch)
+            pool.request("GET", "/collections/coding-memory")
+            status = pool.request("POST", "/collections/coding-memory/points/count", b"{}", idempotent=True)[0]
+            pool.close()
+
+        assert status == 200
+        assert sent == ["GET", "POST", "POST"]
+        assert pool.connections_opened == 2
+
+    def test_streams_response_into_sink(self):
+        """A sink receives the response body, and the connection stays reusable afterwards."""
+        with QdrantStubServer(_points(3)) as server:
+            server.snapshots["s.snapshot"] = b"x" * 3_000_000
+            pool = HTTPConnectionPool(server.url)
+            sink = io.BytesIO()
+            status, _, body = pool.request("GET", "/collections/coding-memory/snapshots/s.snapshot", sink=sink)
+            next_status = pool.request("GET", "/collections/coding-memory")[0]
+            pool.close()
+
+        assert (status, body) == (200, b"")
+        assert sink.getvalue() == b"x" * 3_000_000
+        assert next_status == 200
+        assert pool.connections_opened == 1
+
+    def test_error_status_returned(self):
+        """HTTP error statuses are returned rather than raised."""
+        with QdrantStubServer([]) as server:
+            pool = HTTPConnectionPool(server.url)
+            status, _, _ = pool.request("GET", "/collections/missing")
+            pool.close()
+
+        assert status == 404
+
+    def test_request_timeout(self):
+        """A server that accepts but never answers raises once request_timeout elapses."""
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        accepted: list = []
+        threading.Thread(target=lambda: accepted.append(listener.accept()), daemon=True).start()
+
+        host, port = listener.getsockname()
+        pool = HTTPConnectionPool(f"http://{host}:{port}", connect_timeout=1, request_timeout=0.2)
+        try:
+            with pytest.raises(TimeoutError):
+                pool.request("GET", "/")
+        finally:
+            listener.close()
+
+    def test_unsupported_scheme(self):
+        """Non-HTTP URLs are rejected."""
+        with pytest.raises(ValueError, match="Unsupported URL scheme"):
+            HTTPConnectionPool("ftp://127.0.0.1:21")
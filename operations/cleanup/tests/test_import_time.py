@@ -0,0 +1,118 @@
+"""Import-time regression tests for the `sweep` entry point (operations.cleanup.core)."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+# generous upper bound on cumulative import time of operations.cleanup.core, in microseconds
+#   (stdlib-only imports take ~50ms on a dev box; eager config/handler loading blows past this)
+IMPORT_TIME_BUDGET_US = 250_000
+
+# modules that should only be imported once a handler/config rebuild actually needs them
+DEFERRED_MODULES = {
+    "sqlite3",
+    "urllib.request",
+    "yaml",
+    "operations.cleanup.handlers.claude_mem",
+    "operations.cleanup.handlers.qdrant",
+    "operations.cleanup.handlers.serena",
+    "operations.cleanup.handlers.memory_mcp",
+}
+
+
+def _run_python(args: list[str], cwd: Path) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter (with this repo importable) from cwd."""
+    result = subprocess.run(
+        [sys.executable, *args],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(REPO_ROOT)},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def _loaded_modules(code: str, cwd: Path) -> set[str]:
+    """Run code in a fresh interpreter, returning the names of all modules loaded afterwards.
+
+    (Needed alongside _import_times() since `-X importtime` doesn't log importlib.import_module().)
+    """
+    result = _run_python(["-c", f"{code}\nimport sys; print('\\n'.join(sys.modules))"], cwd)
+    return set(result.stdout.split())
+
+
+def _import_times(module: str, cwd: Path) -> dict[str, int]:
+    """Import module in a fresh interpreter with `-X importtime`, returning cumulative µs per module."""
+    result = _run_python(["-X", "importtime", "-c", f"import {module}"], cwd)
+
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture
+def sweep_import_times(tmp_path: Path) -> dict[str, int]:
+    """Import times for the `sweep` entry point, run outside any Bureau repo.
+
+    Since there are no config files under tmp_path, the import fails if it tries to load config.
+    """
+    return _import_times("operations.cleanup.core", tmp_path)
+
+
+class TestSweepImportTime:
+    """Tests for the cost of importing the `sweep` entry point."""
+
+    def test_does_not_load_config_at_import(self, tmp_path: Path, sweep_import_times: dict[str, int]):
+        """Importing core reads no config (and so writes no config snapshot)."""
+        assert "operations.cleanup.core" in sweep_import_times
+        assert not (tmp_path / ".archives").exists()
+
+    def test_defers_backend_imports(self, tmp_path: Path):
+        """Handler modules and their dependencies are not imported eagerly."""
+        loaded = _loaded_modules("import operations.cleanup.core", tmp_path)
+
+        assert "operations.cleanup.core" in loaded
+        assert DEFERRED_MODULES.isdisjoint(loaded)
+
+    def test_within_budget(self, sweep_import_times: dict[str, int]):
+        """Cumulative import time stays within budget."""
+        assert sweep_import_times["operations.cleanup.core"] < IMPORT_TIME_BUDGET_US
+
+
+class TestHandlerRegistry:
+    """Tests for on-demand handler loading."""
+
+    def test_loads_only_requested_handler(self, tmp_path: Path):
+        """Resolving one handler class imports only that handler's module."""
+        loaded = _loaded_modules(
+            "from operations.cleanup.handlers import get_handler_class\n"
+            "get_handler_class('serena')",
+            tmp_path,
+        )
+
+        assert "operations.cleanup.handlers.serena" in loaded
+        assert "operations.cleanup.handlers.qdrant" not in loaded
+        assert "sqlite3" not in loaded
+
+    def test_accepts_underscored_names(self):
+        """Storage names are accepted in either claude-mem or claude_mem form."""
+        from operations.cleanup.handlers import get_handler_class
+        from operations.cleanup.handlers.claude_mem import ClaudeMemHandler
+
+        assert get_handler_class("claude_mem") is ClaudeMemHandler
+        assert get_handler_class("claude-mem") is ClaudeMemHandler
+
+    def test_handlers_tuple_still_available(self):
+        """HANDLERS still lists every registered handler class, in registry order."""
+        from operations.cleanup.handlers import HANDLERS, HANDLER_REGISTRY
+
+        assert [h.name for h in HANDLERS] == list(HANDLER_REGISTRY)
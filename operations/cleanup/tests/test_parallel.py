@@ -0,0 +1,110 @@
+"""Tests for concurrent task execution with per-task deadlines."""
+import threading
+import time
+
+from operations.cleanup.parallel import run_with_deadlines, wait_for_abandoned
+
+
+class TestRunWithDeadlines:
+    """Tests for run_with_deadlines()."""
+
+    def test_preserves_task_order(self):
+        """Outcomes are returned in task order, regardless of completion order."""
+        def finish_after(seconds: float, value: str):
+            def task():
+                time.sleep(seconds)
+                return value
+            return task
+
+        outcomes = run_with_deadlines(
+            [("slow", finish_after(0.05, "a")), ("fast", finish_after(0, "b"))],
+            jobs=2,
+        )
+
+        assert [o.name for o in outcomes] == ["slow", "fast"]
+        assert [o.result for o in outcomes] == ["a", "b"]
+
+    def test_captures_errors(self):
+        """Exceptions raised by a task are reported on its outcome, not raised."""
+        def fail():
+            raise RuntimeError("boom")
+
+        outcomes = run_with_deadlines([("bad", fail), ("good", lambda: 1)], jobs=2)
+
+        assert isinstance(outcomes[0].error, RuntimeError)
+        assert outcomes[1].result == 1
+        assert outcomes[1].error is None
+
+    def test_hung_task_does_not_block_others(self):
+        """A task missing its deadline is abandoned while the others complete."""
+        release = threading.Event()
+
+        start = time.monotonic()
+        outcomes = run_with_deadlines(
+            [("hung", release.wait), ("ok", lambda: "done")],
+            jobs=1,
+            timeout=0.1,
+        )
+        elapsed = time.monotonic() - start
+        release.set()
+
+        assert outcomes[0].timed_out
+        assert outcomes[1].result == "done"
+        assert elapsed < 2
+
+    def test_limits_concurrency_to_jobs(self):
+        """No more than `jobs` tasks run at once."""
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def task():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+        run_with_deadlines([(str(i), task) for i in range(6)], jobs=2)
+
+        assert peak[0] == 2
+
+    def test_records_elapsed_time(self):
+        """Each outcome records how long its task ran for."""
+        outcomes = run_with_deadlines([("sleepy", lambda: time.sleep(0.05))])
+
+        assert outcomes[0].elapsed >= 0.05
+
+    def test_cancels_abandoned_tasks(self):
+        """on_timeout is called for each abandoned task, which is then tracked until it returns."""
+        cancel = threading.Event()
+
+        outcomes = run_with_deadlines(
+            [("hung", lambda: cancel.wait(5)), ("ok", lambda: "done")],
+            jobs=2,
+            timeout=0.1,
+            on_timeout=lambda index: cancel.set() if index == 0 else None,
+        )
+
+        assert outcomes[0].timed_out
+        assert wait_for_abandoned(outcomes, timeout=2) == []
+        assert outcomes[0].finished.is_set()
+        assert outcomes[1].finished.is_set()
+
+
+class TestWaitForAbandoned:
+    """Tests for wait_for_abandoned()."""
+
+    def test_reports_tasks_still_running(self):
+        """Timed-out tasks that don't stop in time are named, without waiting any longer."""
+        release = threading.Event()
+        outcomes = run_with_deadlines([("hung", release.wait), ("ok", lambda: 1)], jobs=2, timeout=0.1)
+
+        start = time.monotonic()
+        still_running = wait_for_abandoned(outcomes, timeout=0.1)
+        elapsed = time.monotonic() - start
+        release.set()
+
+        assert still_running == ["hung"]
+        assert elapsed < 1
@@ -0,0 +1,191 @@
+"""Tests for the Serena memory file inventory and the inotify watcher keeping it up to date."""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from operations.cleanup import serena_watch
+from operations.cleanup.handlers.serena import SerenaHandler
+from operations.cleanup.inotify import Inotify, WatchLimitError
+from operations.cleanup.serena_inventory import MtimeTable, load_live_inventory, save_inventory
+from operations.cleanup.serena_watch import SerenaWatcher
+
+
+class TestMtimeTable:
+    """Tests for MtimeTable."""
+
+    def test_older_than_sorted_by_mtime(self):
+        """Files older than the cutoff are returned oldest first."""
+        table = MtimeTable()
+        table.set("/p1/.serena/memories", "b.md", 300, 3)
+        table.set("/p1/.serena/memories", "a.md", 100, 1)
+        table.set("/p2/.serena/memories", "c.md", 200, 2)
+
+        assert list(table.older_than(300)) == [
+            ("/p1/.serena/memories/a.md", 100, 1),
+            ("/p2/.serena/memories/c.md", 200, 2),
+        ]
+
+    def test_updates_and_removals(self):
+        """Re-recorded files move in mtime order; discarded files and directories are forgotten."""
+        table = MtimeTable()
+        table.set("/p1/.serena/memories", "a.md", 100, 1)
+        table.set("/p1/.serena/memories", "b.md", 150, 1)
+        table.set("/p2/.serena/memories", "c.md", 200, 2)
+
+        assert table.set("/p1/.serena/memories", "a.md", 500, 1)
+        assert not table.set("/p1/.serena/memories", "a.md", 500, 1)
+        assert table.discard("/p1/.serena/memories", "b.md")
+        assert not table.discard("/p1/.serena/memories", "b.md")
+        assert [path for path, _, _ in table.older_than(1000)] == [
+            "/p2/.serena/memories/c.md", "/p1/.serena/memories/a.md",
+        ]
+
+        assert table.discard_dir("/p1/.serena/memories")
+        assert len(table) == 1
+        assert not table.replace_dir("/p2/.serena/memories", {"c.md": (200, 2)})
+
+    def test_json_round_trip(self):
+        """The persisted form restores the same table."""
+        table = MtimeTable()
+        table.set("/p1/.serena/memories", "a.md", 100, 1)
+        table.set("/p2/.serena/memories", "c.md", 50, 2)
+
+        restored = MtimeTable.from_json(table.to_json())
+
+        assert list(restored.older_than(1000)) == list(table.older_than(1000))
+
+
+class TestLiveInventory:
+    """Tests for load_live_inventory()."""
+
+    SETTINGS = {"root": "/workspace", "ignore": [], "max_depth": 8}
+
+    def test_loaded_while_watcher_runs(self):
+        table = MtimeTable()
+        table.set("/workspace/p/.serena/memories", "a.md", 100, 1)
+        save_inventory(table, self.SETTINGS, os.getpid())
+
+        inventory = load_live_inventory(self.SETTINGS)
+
+        assert inventory is not None
+        assert len(inventory) == 1
+
+    def test_stopped_watcher(self):
+        """Inventories left by a watcher that stopped are ignored."""
+        save_inventory(MtimeTable(), self.SETTINGS, None)
+
+        assert load_live_inventory(self.SETTINGS) is None
+
+    def test_other_scan_settings(self):
+        """Inventories built with other settings (e.g. another memories root) are ignored."""
+        save_inventory(MtimeTable(), self.SETTINGS, os.getpid())
+
+        assert load_live_inventory({**self.SETTINGS, "root": "/elsewhere"}) is None
+
+    def test_missing(self):
+        assert load_live_inventory(self.SETTINGS) is None
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+class TestSerenaWatcher:
+    """Tests for SerenaWatcher (using real inotify watches)."""
+
+    @pytest.fixture
+    def start_watcher(self, serena_memories_root: Path, apply_mock_patches: dict, monkeypatch):
+        """Start a watcher on a background thread (stopped at teardown)."""
+        monkeypatch.setattr(serena_watch, "_READ_TIMEOUT", 0.05)
+        monkeypatch.setattr(serena_watch, "get_serena_watch_poll_interval", lambda: 0.2)
+        stop = threading.Event()
+        threads = []
+
+        def start() -> SerenaWatcher:
+            watcher = SerenaWatcher()
+            thread = threading.Thread(target=watcher.run, args=(stop,), daemon=True)
+            thread.start()
+            threads.append(thread)
+            assert _wait_for(lambda: len(watcher.table) == 4)
+            return watcher
+
+        yield start
+
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+    def _live_paths(self) -> set[str]:
+        settings = SerenaHandler()._scan_settings(SerenaHandler()._get_memories_root())
+        inventory = load_live_inventory(settings)
+        return set() if inventory is None else {path for path, _, _ in inventory.older_than(2**63)}
+
+    def test_tracks_memory_files(self, start_watcher, serena_memories_root: Path):
+        """Created, modified and deleted memory files are reflected in the inventory."""
+        watcher = start_watcher()
+        assert sorted(watcher.watched) == [
+            str(serena_memories_root / f"project_{i}" / ".serena" / "memories") for i in range(2)
+        ]
+
+        memories_dir = serena_memories_root / "project_0" / ".serena" / "memories"
+        new_file = memories_dir / "new.md"
+        new_file.write_text("New memory")
+        (memories_dir / "notes.txt").write_text("Not a memory")
+        (memories_dir / "memory_0.md").unlink()
+        os.utime(memories_dir / "memory_1.md", (0, 0))
+
+        assert _wait_for(lambda: str(new_file) in self._live_paths()
+                         and str(memories_dir / "memory_0.md") not in self._live_paths())
+        assert _wait_for(lambda: [path for path, _, _ in watcher.table.older_than(1)]
+                         == [str(memories_dir / "memory_1.md")])
+        assert len(watcher.table) == 4
+
+    def test_replaced_memories_dir_rewatched(self, start_watcher, serena_memories_root: Path):
+        """A memories directory moved away (as by a fast wipe) and recreated is watched again."""
+        watcher = start_watcher()
+        memories_dir = serena_memories_root / "project_0" / ".serena" / "memories"
+
+        memories_dir.rename(serena_memories_root / "wiped")
+        memories_dir.mkdir()
+        assert _wait_for(lambda: len(watcher.table) == 2 and str(memories_dir) in watcher.watched)
+
+        (memories_dir / "fresh.md").write_text("Fresh memory")
+        assert _wait_for(lambda: len(watcher.table) == 3)
+
+    def test_watch_limit_falls_back_to_polling(self, start_watcher, serena_memories_root: Path, monkeypatch):
+        """Directories that can't be watched are rescanned every poll instead."""
+        def add_watch(self, path, mask):
+            raise WatchLimitError(28, "inotify watch limit reached", path)
+
+        monkeypatch.setattr(Inotify, "add_watch", add_watch)
+        watcher = start_watcher()
+        assert watcher.watched == []
+        assert len(watcher.polled) == 2
+
+        (serena_memories_root / "project_1" / ".serena" / "memories" / "polled.md").write_text("Polled memory")
+        assert _wait_for(lambda: len(watcher.table) == 5)
+
+    def test_inventory_not_live_once_stopped(self, serena_memories_root: Path, apply_mock_patches: dict,
+                                             monkeypatch):
+        monkeypatch.setattr(serena_watch, "_READ_TIMEOUT", 0.05)
+        stop = threading.Event()
+        watcher = SerenaWatcher()
+        thread = threading.Thread(target=watcher.run, args=(stop,), daemon=True)
+        thread.start()
+        assert _wait_for(lambda: len(self._live_paths()) == 4)
+
+        stop.set()
+        thread.join(timeout=5)
+
+        assert self._live_paths() == set()
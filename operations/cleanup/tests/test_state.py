@@ -22,8 +22,8 @@ class TestLoadState:
     ):
         """Returns empty dict when state file doesn't exist."""
         monkeypatch.setattr(
-            "operations.cleanup.state.STATE_PATH",
-            tmp_path / "nonexistent.json"
+            "operations.cleanup.state.get_state_path",
+            lambda: tmp_path / "nonexistent.json"
         )
 
         state = load_state()
@@ -40,8 +40,8 @@ class TestLoadState:
             "last_trash_empty": "2024-01-14T10:00:00+00:00",
         }))
         monkeypatch.setattr(
-            "operations.cleanup.state.STATE_PATH",
-            state_file
+            "operations.cleanup.state.get_state_path",
+            lambda: state_file
         )
 
         state = load_state()
@@ -57,8 +57,8 @@ class TestLoadState:
         """Returns empty dict when JSON is corrupt."""
         state_file.write_text("not valid json {{{")
         monkeypatch.setattr(
-            "operations.cleanup.state.STATE_PATH",
-            state_file
+            "operations.cleanup.state.get_state_path",
+            lambda: state_file
         )
 
         state = load_state()
@@ -74,8 +74,8 @@ class TestLoadState:
         bad_path = tmp_path / "state.json"
         bad_path.mkdir()
         monkeypatch.setattr(
-            "operations.cleanup.state.STATE_PATH",
-            bad_path
+            "operations.cleanup.state.get_state_path",
+            lambda: bad_path
         )
 
         state = load_state()
@@ -94,8 +94,8 @@ class TestSaveState:
         archives_dir = tmp_path / ".archives"
         state_path = archives_dir / "state.json"
 
-        monkeypatch.setattr("operations.cleanup.state.ARCHIVES_DIR", archives_dir)
-        monkeypatch.setattr("operations.cleanup.state.STATE_PATH", state_path)
+        monkeypatch.setattr("operations.cleanup.state.get_archives_dir", lambda: archives_dir)
+        monkeypatch.setattr("operations.cleanup.state.get_state_path", lambda: state_path)
 
         save_state({"last_cleanup_run": "2024-01-15T12:00:00+00:00"})
 
@@ -114,8 +114,8 @@ class TestSaveState:
             "last_cleanup_run": "old_value",
         }))
 
-        monkeypatch.setattr("operations.cleanup.state.ARCHIVES_DIR", archives_dir)
-        monkeypatch.setattr("operations.cleanup.state.STATE_PATH", state_path)
+        monkeypatch.setattr("operations.cleanup.state.get_archives_dir", lambda: archives_dir)
+        monkeypatch.setattr("operations.cleanup.state.get_state_path", lambda: state_path)
 
         save_state({"last_cleanup_run": "new_value"})
 
@@ -133,8 +133,8 @@ class TestSaveState:
         """Writes valid, formatted JSON."""
         state_path = archives_dir / "state.json"
 
-        monkeypatch.setattr("operations.cleanup.state.ARCHIVES_DIR", archives_dir)
-        monkeypatch.setattr("operations.cleanup.state.STATE_PATH", state_path)
+        monkeypatch.setattr("operations.cleanup.state.get_archives_dir", lambda: archives_dir)
+        monkeypatch.setattr("operations.cleanup.state.get_state_path", lambda: state_path)
 
         save_state({
             "last_cleanup_run": "2024-01-15T12:00:00+00:00",
@@ -1,11 +1,15 @@
 """Tests for trash management (soft-delete with grace period)."""
 import json
 import os
+import sqlite3
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import pytest
 
 from operations.cleanup.trash import (
+    TrashWriter,
+    archive_timestamp,
     empty_expired_trash,
     empty_all_trash,
     generate_trash_filename,
@@ -26,8 +30,8 @@ class TestGetTrashDir:
         """Creates trash directory if it doesn't exist."""
         trash_base = tmp_path / ".archives" / "trash"
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         result = get_trash_dir("claude_mem")
@@ -43,8 +47,8 @@ class TestGetTrashDir:
     ):
         """Returns existing directory without error."""
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_dir
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_dir
         )
 
         backend_dir = trash_dir / "qdrant"
@@ -180,6 +184,67 @@ class TestWriteManifest:
         assert data[0]["source"] == "backend"
 
 
+class TestTrashWriter:
+    """Tests for TrashWriter."""
+
+    def test_writes_batches_as_jsonl(
+        self,
+        trash_dir: Path,
+        monkeypatch,
+    ):
+        """Batches are appended as JSON lines; the file is named by final count and recorded in the manifest."""
+        monkeypatch.setattr("operations.cleanup.trash.get_base_trash_dir", lambda: trash_dir)
+
+        with TrashWriter("claude-mem", "30d", "7d") as writer:
+            writer.write([{"id": 1}, {"id": 2}])
+            writer.write([{"id": 3}])
+
+        trash_path = writer.close()
+
+        assert trash_path.name.endswith("_3-items.jsonl")
+        assert [json.loads(line)["id"] for line in trash_path.read_text().splitlines()] == [1, 2, 3]
+        assert not list(trash_path.parent.glob("*.partial"))
+
+        with open(trash_path.parent / ".manifest.json") as f:
+            manifest = json.load(f)
+
+        assert len(manifest) == 1
+        assert manifest[0]["item_count"] == 3
+        assert manifest[0]["files"] == [str(trash_path)]
+
+    def test_no_items_writes_nothing(
+        self,
+        trash_dir: Path,
+        monkeypatch,
+    ):
+        """Closing without writing any items creates neither a trash file nor a manifest entry."""
+        monkeypatch.setattr("operations.cleanup.trash.get_base_trash_dir", lambda: trash_dir)
+
+        with TrashWriter("claude-mem", "30d") as writer:
+            writer.write([])
+
+        backend_dir = trash_dir / "claude-mem"
+        assert writer.close() == backend_dir
+        assert list(backend_dir.iterdir()) == []
+
+    def test_finalizes_on_error(
+        self,
+        trash_dir: Path,
+        monkeypatch,
+    ):
+        """Items written before an error are still finalized and recorded in the manifest."""
+        monkeypatch.setattr("operations.cleanup.trash.get_base_trash_dir", lambda: trash_dir)
+
+        with pytest.raises(RuntimeError):
+            with TrashWriter("qdrant", "180d") as writer:
+                writer.write([{"id": "a"}])
+                raise RuntimeError("storage failure mid-run")
+
+        backend_dir = trash_dir / "qdrant"
+        assert len(list(backend_dir.glob("*_1-items.jsonl"))) == 1
+        assert (backend_dir / ".manifest.json").exists()
+
+
 class TestMoveToTrash:
     """Tests for move_to_trash()."""
 
@@ -192,8 +257,8 @@ class TestMoveToTrash:
         trash_base = tmp_path / ".archives" / "trash"
         trash_base.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # create source file
@@ -216,8 +281,8 @@ class TestMoveToTrash:
         trash_base = tmp_path / ".archives" / "trash"
         trash_base.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # create source file
@@ -244,8 +309,8 @@ class TestEmptyExpiredTrash:
         storage_dir = trash_base / "backend"
         storage_dir.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # create old file
@@ -277,8 +342,8 @@ class TestEmptyExpiredTrash:
         storage_dir = trash_base / "backend"
         storage_dir.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # create new file
@@ -307,8 +372,8 @@ class TestEmptyExpiredTrash:
     ):
         """Returns 0 when trash directory doesn't exist."""
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            tmp_path / "nonexistent"
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: tmp_path / "nonexistent"
         )
 
         removed = empty_expired_trash("30d")
@@ -324,8 +389,8 @@ class TestEmptyExpiredTrash:
         storage_dir = trash_base / "backend"
         storage_dir.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # write corrupt manifest
@@ -348,8 +413,8 @@ class TestEmptyExpiredTrash:
         storage_dir = trash_base / "backend"
         storage_dir.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # create manifest referencing non-existent file
@@ -376,8 +441,8 @@ class TestEmptyExpiredTrash:
         storage_dir = trash_base / "backend"
         storage_dir.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # create file with old mtime
@@ -412,8 +477,8 @@ class TestEmptyExpiredTrash:
         storage_dir = trash_base / "backend"
         storage_dir.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # create old file
@@ -445,8 +510,8 @@ class TestEmptyExpiredTrash:
         storage_dir = trash_base / "backend"
         storage_dir.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # create files
@@ -496,8 +561,8 @@ class TestEmptyExpiredTrash:
         storage_dir = trash_base / "backend"
         storage_dir.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         old_file = storage_dir / "old.json"
@@ -518,6 +583,50 @@ class TestEmptyExpiredTrash:
         assert removed == 1
 
 
+    def test_expires_archive_rows(
+        self,
+        tmp_path: Path,
+        monkeypatch,
+    ):
+        """Rows in an archive database expire individually, by when each was trashed."""
+        trash_base = tmp_path / ".archives" / "trash"
+        storage_dir = trash_base / "backend"
+        storage_dir.mkdir(parents=True)
+        monkeypatch.setattr(
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
+        )
+
+        now = datetime.now(timezone.utc)
+        archive_path = storage_dir / "archive.db"
+        conn = sqlite3.connect(archive_path)
+        conn.execute("CREATE TABLE rows (id TEXT, _trashed_at TEXT)")
+        conn.executemany("INSERT INTO rows VALUES (?, ?)", [
+            ("old", archive_timestamp(now - timedelta(days=60))),
+            ("new", archive_timestamp(now - timedelta(days=1))),
+        ])
+        conn.commit()
+        conn.close()
+
+        # archive entries list no files: the archive itself must survive the mtime fallback
+        os.utime(archive_path, (0, 0))
+        manifest = [
+            {"trashed_at": (now - timedelta(days=60)).isoformat(), "item_count": 1, "files": [],
+             "archive": str(archive_path)},
+            {"trashed_at": (now - timedelta(days=1)).isoformat(), "item_count": 1, "files": [],
+             "archive": str(archive_path)},
+        ]
+        (storage_dir / ".manifest.json").write_text(json.dumps(manifest))
+
+        removed = empty_expired_trash("30d")
+
+        assert removed == 1
+        conn = sqlite3.connect(archive_path)
+        assert conn.execute("SELECT id FROM rows").fetchall() == [("new",)]
+        conn.close()
+        assert len(json.loads((storage_dir / ".manifest.json").read_text())) == 1
+
+
 class TestEmptyAllTrash:
     """Tests for empty_all_trash()."""
 
@@ -531,8 +640,8 @@ class TestEmptyAllTrash:
         storage_dir = trash_base / "backend"
         storage_dir.mkdir(parents=True)
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            trash_base
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: trash_base
         )
 
         # create multiple files
@@ -552,8 +661,8 @@ class TestEmptyAllTrash:
     ):
         """Returns appropriate message when trash doesn't exist."""
         monkeypatch.setattr(
-            "operations.cleanup.trash.BASE_TRASH_DIR",
-            tmp_path / "nonexistent"
+            "operations.cleanup.trash.get_base_trash_dir",
+            lambda: tmp_path / "nonexistent"
         )
 
         result = empty_all_trash()
@@ -1,14 +1,19 @@
 """Trash management for Bureau cleanup."""
 import json
+import os
 import shutil
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from types import TracebackType
+from typing import Any, Iterable, Optional, TextIO
 
 from ..config_loader import parse_duration, get_trash_dir as get_base_trash_dir
 from .state import now_as_iso
 
-BASE_TRASH_DIR = get_base_trash_dir()
+# SQLite database of trashed rows kept in a backend's trash directory by handlers in archive mode:
+#   each table mirrors a source table, plus a column recording when each row was trashed
+ARCHIVE_DB_NAME = "archive.db"
+ARCHIVE_TRASHED_AT_COLUMN = "_trashed_at"
 
 
 def get_trash_dir(backend_name: str) -> Path:
@@ -16,7 +21,7 @@ def get_trash_dir(backend_name: str) -> Path:
         Find trash directory for a specific memory backend.
         Trash directories are defined per backend: .archives/trash/<backend-name>
     """
-    trash_path = BASE_TRASH_DIR / backend_name
+    trash_path = get_base_trash_dir() / backend_name
     trash_path.mkdir(parents=True, exist_ok=True)
     return trash_path
 
@@ -29,8 +34,9 @@ def generate_trash_filename(item_count: int, extension: str = "json") -> str:
 
 def write_manifest(trash_path: Path, storage_name: str, item_count: int,
                    retention: str, grace_period: str = "30d",
-                   files: list[Path] | None = None) -> None:
-    """Write manifest file for trashed items."""
+                   files: list[Path] | None = None,
+                   details: dict[str, Any] | None = None) -> None:
+    """Write manifest file for trashed items (with any backend-specific details merged into its entry)."""
     now = now_as_iso()
     grace_delta = parse_duration(grace_period)
     purge_after = datetime.now(timezone.utc) + grace_delta
@@ -42,6 +48,7 @@ def write_manifest(trash_path: Path, storage_name: str, item_count: int,
         "original_retention": retention,
         "auto_purge_after": purge_after.isoformat() + "Z",
         "files": [str(f) for f in files] if files else [],
+        **(details or {}),
     }
 
     manifest_path = trash_path / ".manifest.json"
@@ -63,6 +70,130 @@ def write_manifest(trash_path: Path, storage_name: str, item_count: int,
         json.dump(existing, f, indent=2)
 
 
+class TrashWriter:
+    """Incrementally writes one trash file (JSONL, one item per line) for a backend.
+
+    Items are written as each batch is exported, so memory use stays proportional to the
+    batch rather than the whole stale set.
+
+    On close (including when leaving a `with` block due to an error, since earlier batches
+    may already have been deleted from storage), the file is renamed to carry its final
+    item count and recorded in the backend's manifest.
+    """
+
+    def __init__(self, storage_name: str, retention: str, grace_period: str = "30d"):
+        self.storage_name = storage_name
+        self.retention = retention
+        self.grace_period = grace_period
+        self.item_count = 0
+        self.trash_dir = get_trash_dir(storage_name)
+        self._path: Path | None = None
+        self._file: TextIO | None = None
+        self._closed_path: Path | None = None
+
+    def write(self, items: Iterable[Any]) -> None:
+        """Append items to the trash file (opened on first write), one JSON document per line."""
+        self.write_json_lines(json.dumps(item, default=str) for item in items)
+
+    def write_json_lines(self, lines: Iterable[str]) -> None:
+        """Append already-serialized JSON documents to the trash file (opened on first write), one per line.
+
+        Lets handlers that can produce JSON themselves (e.g. SQL-side) skip building Python objects.
+        """
+        for line in lines:
+            if self._file is None:
+                # final item count isn't known yet: name the file once it's closed
+                self._path = self.trash_dir / f"{generate_trash_filename(0, 'jsonl')}.partial"
+                self._file = open(self._path, "w")
+
+            self._file.write(line + "\n")
+            self.item_count += 1
+
+        # hand each batch to the OS before the caller deletes it from storage
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> Path:
+        """Finalize the trash file and record it in the manifest, returning the trash path.
+
+        Returns the trash file if any items were written, otherwise the trash directory.
+        """
+        if self._closed_path is not None:
+            return self._closed_path
+
+        if self._file is None or self._path is None:
+            self._closed_path = self.trash_dir
+            return self._closed_path
+
+        self._file.close()
+        final_path = self._path.with_name(
+            self._path.name.replace("_0-items.jsonl.partial", f"_{self.item_count}-items.jsonl")
+        )
+        os.replace(self._path, final_path)
+
+        write_manifest(self.trash_dir, self.storage_name, self.item_count,
+                       self.retention, self.grace_period, files=[final_path])
+
+        self._closed_path = final_path
+        return self._closed_path
+
+    def __enter__(self) -> "TrashWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def archive_timestamp(dt: datetime) -> str:
+    """Format a UTC datetime as stored in archive databases' trashed-at column (sortable as text)."""
+    return dt.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def expire_archive_rows(archive_path: Path, cutoff: datetime) -> int:
+    """Delete rows trashed before cutoff from an archive database, returning the count removed.
+
+    Each table's expiry is a single ranged DELETE on its indexed trashed-at column; the freed
+    pages are then handed back to the OS (archives are created in incremental auto-vacuum mode).
+    """
+    # imported here so commands that never touch an archive don't pay for loading sqlite3
+    import sqlite3
+
+    conn = sqlite3.connect(archive_path)
+    removed = 0
+    try:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        for table in tables:
+            cursor = conn.execute(
+                f'DELETE FROM "{table}" WHERE {ARCHIVE_TRASHED_AT_COLUMN} < ?', (archive_timestamp(cutoff),)
+            )
+            removed += cursor.rowcount
+        conn.commit()
+
+        if removed:
+            # the pragma frees one page per step, so its (empty) result must be fetched
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+    finally:
+        conn.close()
+    return removed
+
+
+def link_into_trash(source_path: Path, trash_path: Path) -> None:
+    """Back up a file that is about to be replaced (not modified in place) into the trash.
+
+    Hard-links it when the trash is on the same filesystem, so no data is copied; otherwise
+    falls back to a copy.
+    """
+    try:
+        os.link(source_path, trash_path)
+    except OSError:
+        shutil.copy2(source_path, trash_path)
+
+
 def move_to_trash(source_path: Path, 
                   storage_name: str,
                   project_name: Optional[str] = None  # for memories from Serena
@@ -84,7 +215,8 @@ def move_to_trash(source_path: Path,
 def empty_expired_trash(grace_period: str) -> int:
     """Remove items in the trash that are older than the grace period, 
         returning the count of items removed."""
-    if not BASE_TRASH_DIR.exists():
+    base_trash_dir = get_base_trash_dir()
+    if not base_trash_dir.exists():
         return 0
 
     grace_delta = parse_duration(grace_period)
@@ -93,7 +225,7 @@ def empty_expired_trash(grace_period: str) -> int:
     # delete everything moved to trash before this date
     cutoff = datetime.now(timezone.utc) - grace_delta
 
-    for storage_dir in BASE_TRASH_DIR.iterdir():
+    for storage_dir in base_trash_dir.iterdir():
         if not storage_dir.is_dir():
             continue
 
@@ -110,6 +242,15 @@ def empty_expired_trash(grace_period: str) -> int:
             continue
 
         remaining = []
+        # archived rows expire individually (by when each was trashed), rather than per manifest entry
+        archive_path = storage_dir / ARCHIVE_DB_NAME
+        if archive_path.exists():
+            import sqlite3
+            try:
+                removed_count += expire_archive_rows(archive_path, cutoff)
+            except sqlite3.Error:
+                pass  # e.g. locked by a running cleanup: expired on a later run
+
         for entry in manifests:
             # check each trash entry for expiration
             trashed_at = entry.get("trashed_at", "")
@@ -145,9 +286,10 @@ def empty_expired_trash(grace_period: str) -> int:
                 
                 # if files list is absent, fall back to deleting all non-manifest 
                 #   files whose last edited time is older than the cutoff
-                if not files:
+                #   (except for archive entries, whose rows were expired above)
+                if not files and "archive" not in entry:
                     for candidate in storage_dir.rglob("*"):
-                        if candidate.name == ".manifest.json":
+                        if candidate.name == ".manifest.json" or candidate.name.startswith(ARCHIVE_DB_NAME):
                             continue
                         try:
                             if candidate.stat().st_mtime < cutoff.timestamp() and candidate.is_file():
@@ -172,12 +314,13 @@ def empty_expired_trash(grace_period: str) -> int:
 
 def empty_all_trash() -> dict:
     """Immediately empty *all* trash, overriding the default grace period."""
-    if not BASE_TRASH_DIR.exists():
+    base_trash_dir = get_base_trash_dir()
+    if not base_trash_dir.exists():
         return {"emptied": 0, "message": "Trash directory does not exist"}
 
     # count items to be permanently deleted (excluding directories & manifest files)
     count = 0
-    for storage_dir in BASE_TRASH_DIR.iterdir():
+    for storage_dir in base_trash_dir.iterdir():
         if storage_dir.is_dir():
             for item in storage_dir.rglob("*"):
                 if item.is_file() and item.name != ".manifest.json":
@@ -10,7 +10,15 @@ Usage:
     get-config path_to.qdrant_url                # Output: http://127.0.0.1:8780
     get-config --check agent claude    # Exit 0 if enabled, 1 if not
     get-config --list agents           # List all enabled agents
+    get-config --export                # Shell block for `eval` with every key (see below)
+    get-config --export port_for agents  # Same, limited to the given keys/subtrees
+
+`--export` resolves the merged config once and prints a `declare -gA BUREAU_CONFIG=(...)`
+block keyed by dot-path (e.g. `${BUREAU_CONFIG[port_for.qdrant_db]}`), plus derived
+`agent_enabled.<name>` booleans, so shell scripts can `eval` it once instead of spawning
+a `get-config` process per key.
 """
+import shlex
 import sys
 from typing import Any, Mapping
 
@@ -54,14 +62,77 @@ def format_value(value: Any) -> str:
         return str(value)
 
 
+def flatten_config(data: Mapping[str, Any], prefix: str = "") -> dict[str, str]:
+    """Flatten a nested config dict into dot-path keys mapped to shell-formatted values.
+
+    Args:
+        data: (Sub)tree of the config to flatten.
+        prefix: Dot-path of `data` within the full config ("" for the root).
+
+    Returns:
+        Dict mapping each leaf's dot-path to its `format_value()` output.
+    """
+    flat: dict[str, str] = {}
+
+    for key, value in data.items():
+        key_path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten_config(value, key_path))
+        else:
+            flat[key_path] = format_value(value)
+
+    return flat
+
+
+def format_shell_export(config: Mapping[str, Any], key_paths: list[str] | None = None) -> str:
+    """Render config values as a `declare -gA BUREAU_CONFIG=(...)` block for `eval`.
+
+    Args:
+        config: Merged configuration.
+        key_paths: Dot-paths to include (leaves or subtrees); all keys if None/empty.
+            Missing keys are omitted, so readers fall back to an empty value.
+
+    Returns:
+        Bash source declaring the BUREAU_CONFIG associative array.
+    """
+    if key_paths:
+        flat: dict[str, str] = {}
+        for key_path in key_paths:
+            value = get_nested_value(config, key_path)
+            if isinstance(value, dict):
+                flat.update(flatten_config(value, key_path))
+            elif value is not None:
+                flat[key_path] = format_value(value)
+    else:
+        flat = flatten_config(config)
+
+    # derived booleans (mirrors `--check agent <name>`)
+    for agent in config.get("agents") or []:
+        flat[f"agent_enabled.{str(agent).lower()}"] = "true"
+
+    # -g so the array stays global when eval'd inside a shell function
+    lines = ["declare -gA BUREAU_CONFIG=("]
+    lines.extend(f"  [{shlex.quote(k)}]={shlex.quote(v)}" for k, v in flat.items())
+    lines.append(")")
+    return "\n".join(lines)
+
+
 def main() -> int:
     """Main entrypoint for get-config CLI."""
     args = sys.argv[1:]
 
     if not args:
-        print("Usage: get-config <key.path> | --check agent <name> | --list agents", file=sys.stderr)
+        print(
+            "Usage: get-config <key.path> | --check agent <name> | --list agents | --export [key.path ...]",
+            file=sys.stderr,
+        )
         return 1
 
+    if args[0] == "--export":
+        # emit all requested keys (or the whole config) as one block for the caller to `eval`
+        print(format_shell_export(get_config(), args[1:]))
+        return 0
+
     if args[0] == "--check":
         # check if requested setting is enabled in the config 
         # (only supports checking if an agent is enabled for now)
@@ -10,15 +10,20 @@
 
 2. Loads configuration
 
+3. Persists the merged config (plus its validation result) to a compiled snapshot at
+   `.archives/config.cache`, so later processes skip YAML parsing and validation for as
+   long as the config files and env overrides are unchanged
+
 """
+import hashlib
+import marshal
 import os
 import re
+import stat
 from datetime import timedelta
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, TypedDict, cast
-
-import yaml
+from typing import Any, NotRequired, TypedDict, cast
 
 
 # TypedDict schemas corresponding to nested YAML config sections
@@ -35,6 +40,9 @@ class TrashConfig(TypedDict):
 
 class CleanupConfig(TypedDict):
     min_interval: str
+    jobs: NotRequired[int]
+    handler_timeout: NotRequired[int]
+    batch_size: NotRequired[int]
 
 
 class StartupTimeoutForConfig(TypedDict):
@@ -67,6 +75,34 @@ class PathToConfig(TypedDict, total=False):
 class QdrantConfig(TypedDict, total=False):
     collection: str
     embedding_provider: str
+    connect_timeout: int
+    request_timeout: int
+    export_vectors: bool
+    delete_chunk_size: int
+    delete_mode: str
+    wipe_backup: str
+
+
+class SerenaConfig(TypedDict, total=False):
+    rescan_interval: str
+    ignore: list[str]
+    max_depth: int
+    watch_poll_interval: int
+    jobs: int
+
+
+class ClaudeMemConfig(TypedDict, total=False):
+    delete_chunk_size: int
+    busy_timeout: int
+    vacuum_threshold: float
+    incremental_vacuum: bool
+    trash_format: str
+    compress_wipe_backup: bool
+    create_indexes: bool
+
+
+class MemoryMcpConfig(TypedDict, total=False):
+    compact: bool
 
 
 class EndpointForConfig(TypedDict):
@@ -80,16 +116,21 @@ class Config(TypedDict, total=False):
     retention_period_for: RetentionPeriodForConfig
     trash: TrashConfig
     cleanup: CleanupConfig
+    serena: SerenaConfig
     startup_timeout_for: StartupTimeoutForConfig
     port_for: PortForConfig
     path_to: PathToConfig
     qdrant: QdrantConfig
+    claude_mem: ClaudeMemConfig
+    memory_mcp: MemoryMcpConfig
     endpoint_for: EndpointForConfig
 
 
 def find_repo_root(start_path: Path | None = None) -> Path:
     """Find the repository root by looking for directives.yml or .git directory.
 
+    Results are memoized per process (keyed by start directory; reset via clear_config_cache()).
+
     Args:
         start_path: Starting directory for search. Defaults to cwd.
 
@@ -102,33 +143,115 @@ def find_repo_root(start_path: Path | None = None) -> Path:
     if start_path is None:
         start_path = Path.cwd()
 
-    current = start_path.resolve()
+    repo_root = _find_repo_root_from(os.path.abspath(start_path))
+    if repo_root is None:
+        raise FileNotFoundError(
+            f"Could not find repository root (directives.yml or .git) starting from {start_path}"
+        )
+    return repo_root
 
-    while current != current.parent:
-        if (current / "directives.yml").exists() or (current / ".git").exists():
-            return current
-        current = current.parent
 
-    # Check root directory
-    if (current / "directives.yml").exists() or (current / ".git").exists():
-        return current
+# files/directories marking a repo root
+_REPO_ROOT_MARKERS = frozenset({"directives.yml", ".git"})
 
-    raise FileNotFoundError(
-        f"Could not find repository root (directives.yml or .git) starting from {start_path}"
-    )
 
+@lru_cache(maxsize=8)
+def _find_repo_root_from(start_dir: str) -> Path | None:
+    """Walk up from start_dir to the first directory containing directives.yml or .git."""
+    current = os.path.realpath(start_dir)
 
-def get_main_repo_root() -> Path:
-    """Get the main repository root (not worktree root).
+    while True:
+        # one os.scandir() per level, stopping at the first marker, rather than a stat per marker
+        #   (entry names come from the directory listing itself; nothing is stat'ed)
+        try:
+            with os.scandir(current) as entries:
+                if any(entry.name in _REPO_ROOT_MARKERS for entry in entries):
+                    return Path(current)
+        except OSError:
+            # unreadable directory: keep walking up
+            pass
 
-    Uses `git rev-parse --git-common-dir` which returns:
-      - Main repo: `.git` (relative)
-      - Worktree: `/path/to/main/.git` (absolute path to main repo's .git)
+        parent = os.path.dirname(current)
+        if parent == current:
+            # checked the filesystem root
+            return None
+        current = parent
+
+
+def _read_gitdir_file(dot_git_file: Path) -> Path | None:
+    """Resolve the `gitdir: <path>` pointer stored in a worktree's `.git` file."""
+    try:
+        content = dot_git_file.read_text().strip()
+    except OSError:
+        return None
+
+    if not content.startswith("gitdir:"):
+        return None
+
+    # relative pointers are relative to the directory containing the .git file
+    return (dot_git_file.parent / content[len("gitdir:"):].strip()).resolve()
 
-    The parent of the git directory is the main repo root.
+
+def _resolve_git_common_dir(start_dir: Path) -> Path | None:
+    """Find the git common dir (main repo's `.git`) by reading git's metadata files directly.
+
+    Handles the standard layouts:
+      - Main repo: `<root>/.git` directory
+      - Linked worktree: `.git` file containing `gitdir: <main>/.git/worktrees/<name>`,
+        whose `commondir` file points (usually `../..`) back to `<main>/.git`
 
     Returns:
-        Path to main repository root.
+        Path to the git common dir, or None for layouts this doesn't handle (GIT_DIR overrides,
+        submodules, separate git dirs, ...), in which case callers should defer to the git CLI.
+    """
+    if "GIT_DIR" in os.environ or "GIT_COMMON_DIR" in os.environ:
+        return None
+
+    current = start_dir
+    while True:
+        dot_git = current / ".git"
+
+        # a single stat per level, telling a main repo's .git directory from a worktree's .git file
+        try:
+            mode = dot_git.stat().st_mode
+        except OSError:
+            mode = 0
+
+        if stat.S_ISDIR(mode):
+            git_dir = dot_git
+            break
+        if stat.S_ISREG(mode):
+            gitdir = _read_gitdir_file(dot_git)
+            if gitdir is None or not gitdir.is_dir():
+                return None
+            git_dir = gitdir
+            break
+
+        if current == current.parent:
+            return None
+        current = current.parent
+
+    commondir_file = git_dir / "commondir"
+    if commondir_file.is_file():
+        try:
+            common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+        except OSError:
+            return None
+    else:
+        common_dir = git_dir
+
+    # anything not shaped like `<root>/.git` (e.g. submodules under .git/modules/) is exotic
+    if common_dir.name != ".git" or not common_dir.is_dir():
+        return None
+    return common_dir
+
+
+def _git_common_dir_via_cli(cwd: Path) -> Path:
+    """Find the git common dir using `git rev-parse --git-common-dir`.
+
+    Returns:
+      - Main repo: `.git` (relative, resolved from cwd)
+      - Worktree: `/path/to/main/.git` (absolute path to main repo's .git)
 
     Raises:
         FileNotFoundError: If not in a git repository.
@@ -141,22 +264,49 @@ def get_main_repo_root() -> Path:
             capture_output=True,
             text=True,
             check=True,
+            cwd=cwd,
         )
-        git_common_dir = Path(result.stdout.strip())
-
-        # If relative path (like `.git`), resolve from cwd
-        if not git_common_dir.is_absolute():
-            git_common_dir = (Path.cwd() / git_common_dir).resolve()
-        else:
-            git_common_dir = git_common_dir.resolve()
-
-        # Parent of .git is the repo root
-        return git_common_dir.parent
     except subprocess.CalledProcessError as e:
         raise FileNotFoundError(
             f"Not in a git repository: {e.stderr.strip()}"
         ) from e
 
+    git_common_dir = Path(result.stdout.strip())
+
+    # If relative path (like `.git`), resolve from cwd
+    if not git_common_dir.is_absolute():
+        git_common_dir = cwd / git_common_dir
+    return git_common_dir.resolve()
+
+
+@lru_cache(maxsize=8)
+def _main_repo_root_from(cwd: Path) -> Path:
+    """Memoized main repo root lookup for a given working directory."""
+    git_common_dir = _resolve_git_common_dir(cwd)
+    if git_common_dir is None:
+        git_common_dir = _git_common_dir_via_cli(cwd)
+
+    # Parent of .git is the repo root
+    return git_common_dir.parent
+
+
+def get_main_repo_root() -> Path:
+    """Get the main repository root (not worktree root).
+
+    Reads `.git`, the worktree's gitdir pointer and its `commondir` file directly (no
+    subprocess), falling back to `git rev-parse --git-common-dir` only for layouts that
+    can't be resolved that way. Results are memoized per process.
+
+    The parent of the git common directory is the main repo root.
+
+    Returns:
+        Path to main repository root.
+
+    Raises:
+        FileNotFoundError: If not in a git repository.
+    """
+    return _main_repo_root_from(Path.cwd().resolve())
+
 
 def deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
     """Deep merge two dicts, with the `override` dict taking precedence.
@@ -187,66 +337,54 @@ def expand_path(path_str: str) -> Path:
 
 def _load_yaml_file(path: Path) -> dict[str, Any]:
     """Load YAML file if it exists, otherwise return empty dict."""
+    # imported lazily: processes served from the config snapshot never need PyYAML
+    import yaml
+
     if path.exists():
         with open(path) as f:
             return yaml.safe_load(f) or {}
     return {}
 
 
-@lru_cache(maxsize=1)  # cache most recent returned config (clear using clear_config_cache())
-def get_config() -> Config:
-    """Load and merge configs, following this resolution order:
-
-    1. charter.yml (base defaults, required)
-    2. directives.yml (team config, if exists)
-    3. local.yml (local overrides, if exists)
-    4. Environment variables (highest priority)
-    
-    For testing: 
-    1. monkeypatch find_repo_root() to return the temp testing directory path
-    2. call clear_config_cache() to clear cache
-    3. call get_config() to do a fresh config read, retrieving the test-oriented config
+# Config files merged in precedence order (later overrides earlier)
+CONFIG_FILENAMES = ("charter.yml", "directives.yml", "local.yml")
 
-        monkeypatch.setattr("operations.config_loader.find_repo_root", lambda: tmp_path)
-        clear_config_cache()
-        config = get_config()
+# Env vars overriding path_to.<key>
+PATH_ENV_OVERRIDES = {
+    "serena_memories_root": "BUREAU_WORKSPACE",
+}
 
-    Settings specified at paths LATER in the list OVERRIDE IDENTICAL SETTINGS at paths EARLIER in the list.
-    > e.g. `mcp.auto_approve: yes` in local.yml overrides `mcp.auto_approve: no` in directives.yml
+# Env vars overriding path_to.storage_for.<key>
+STORAGE_ENV_OVERRIDES = {
+    "memory_mcp": "MEMORY_MCP_STORAGE_PATH",
+    "claude_mem": "CLAUDE_MEM_STORAGE_PATH",
+    "qdrant": "QDRANT_STORAGE_PATH",
+}
 
-    Returns:
-        Merged configuration dictionary.
+# Compiled config snapshot (relative to repo root); bump the format to invalidate old snapshots
+CONFIG_SNAPSHOT_PATH = Path(".archives") / "config.cache"
+_CONFIG_SNAPSHOT_FORMAT = 1
 
-    Raises:
-        FileNotFoundError: If repo root cannot be found.
-    """
-    repo_root = find_repo_root()
 
+def _build_config(repo_root: Path) -> dict[str, Any]:
+    """Merge config files found in repo_root and apply env overrides and derived defaults."""
     config: dict[str, Any] = {}
 
     # Load configs in precedence order (later overrides earlier)
-    for filename in ["charter.yml", "directives.yml", "local.yml"]:
+    for filename in CONFIG_FILENAMES:
         config = deep_merge(config, _load_yaml_file(repo_root / filename))
 
     # Apply environment variable overrides for path_to
     path_to = config.get("path_to", {})
-    path_env_overrides = {
-        "serena_memories_root": "BUREAU_WORKSPACE",
-    }
 
-    for path_key, env_var in path_env_overrides.items():
+    for path_key, env_var in PATH_ENV_OVERRIDES.items():
         if env_val := os.environ.get(env_var):
             path_to[path_key] = env_val
 
     # Apply environment variable overrides for path_to.storage_for
     storage_for = path_to.get("storage_for", {})
-    storage_env_overrides = {
-        "memory_mcp": "MEMORY_MCP_STORAGE_PATH",
-        "claude_mem": "CLAUDE_MEM_STORAGE_PATH",
-        "qdrant": "QDRANT_STORAGE_PATH",
-    }
 
-    for storage_key, env_var in storage_env_overrides.items():
+    for storage_key, env_var in STORAGE_ENV_OVERRIDES.items():
         if env_val := os.environ.get(env_var):
             storage_for[storage_key] = env_val
 
@@ -280,12 +418,141 @@ def get_config() -> Config:
         qdrant_cfg["embedding_provider"] = "fastembed"
     config["qdrant"] = qdrant_cfg
 
-    return config  # type: ignore[return-value]
+    return config
+
+
+def _config_snapshot_key(repo_root: Path) -> dict[str, Any]:
+    """Build the key a compiled snapshot must match to be reused.
+
+    Covers every input of _build_config() and full_validate(): each config file's
+    (mtime, size, content hash), the env overrides, and the loader/validator sources.
+    """
+    files: dict[str, tuple[int, int, str] | None] = {}
+    for filename in CONFIG_FILENAMES:
+        path = repo_root / filename
+        try:
+            stat = path.stat()
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            files[filename] = None
+            continue
+        files[filename] = (stat.st_mtime_ns, stat.st_size, digest)
+
+    env_vars = (*PATH_ENV_OVERRIDES.values(), *STORAGE_ENV_OVERRIDES.values())
+    code_dir = Path(__file__).parent
+
+    return {
+        "format": _CONFIG_SNAPSHOT_FORMAT,
+        "repo_root": str(repo_root),
+        "files": files,
+        "env": {var: os.environ.get(var) for var in env_vars},
+        "code": [
+            (code_dir / module).stat().st_mtime_ns
+            for module in ("config_loader.py", "validate_config.py")
+        ],
+    }
+
+
+def _read_config_snapshot(path: Path, key: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the snapshot stored at path if it matches key, else None."""
+    try:
+        with open(path, "rb") as f:
+            snapshot = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("key") != key:
+        return None
+    return snapshot
+
+
+def _write_config_snapshot(path: Path, snapshot: dict[str, Any]) -> None:
+    """Atomically write snapshot to path; failures are ignored (the snapshot is only a cache)."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            marshal.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError):
+        tmp_path.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)  # cache most recent loaded config (clear using clear_config_cache())
+def _load_config() -> tuple[Config, list[str]]:
+    """Load the merged config and its validation errors, reusing the on-disk snapshot if fresh."""
+    # imported here to avoid a circular import (validate_config imports this module in main())
+    from .validate_config import full_validate
+
+    repo_root = find_repo_root()
+    snapshot_path = repo_root / CONFIG_SNAPSHOT_PATH
+    key = _config_snapshot_key(repo_root)
+
+    snapshot = _read_config_snapshot(snapshot_path, key)
+    if snapshot is not None:
+        return snapshot["config"], snapshot["validation_errors"]
+
+    config = _build_config(repo_root)
+    validation_errors = full_validate(config)
+
+    _write_config_snapshot(snapshot_path, {
+        "key": key,
+        "config": config,
+        "validation_errors": validation_errors,
+    })
+
+    return cast(Config, config), validation_errors
+
+
+def get_config() -> Config:
+    """Load and merge configs, following this resolution order:
+
+    1. charter.yml (base defaults, required)
+    2. directives.yml (team config, if exists)
+    3. local.yml (local overrides, if exists)
+    4. Environment variables (highest priority)
+
+    The result is cached in-process and persisted to `.archives/config.cache`, which is
+    reused by later processes until any config file or env override changes.
+    
+    For testing: 
+    1. monkeypatch find_repo_root() to return the temp testing directory path
+    2. call clear_config_cache() to clear cache
+    3. call get_config() to do a fresh config read, retrieving the test-oriented config
+
+        monkeypatch.setattr("operations.config_loader.find_repo_root", lambda: tmp_path)
+        clear_config_cache()
+        config = get_config()
+
+    Settings specified at paths LATER in the list OVERRIDE IDENTICAL SETTINGS at paths EARLIER in the list.
+    > e.g. `mcp.auto_approve: yes` in local.yml overrides `mcp.auto_approve: no` in directives.yml
+
+    Returns:
+        Merged configuration dictionary.
+
+    Raises:
+        FileNotFoundError: If repo root cannot be found.
+    """
+    return _load_config()[0]
+
+
+def get_config_errors() -> list[str]:
+    """Get full_validate() errors for the merged config (stored alongside it in the snapshot).
+
+    Returns:
+        List of error messages (empty list = valid).
+
+    Raises:
+        FileNotFoundError: If repo root cannot be found.
+    """
+    return _load_config()[1]
 
 
 def clear_config_cache() -> None:
-    """Clear the cached config (for testing)."""
-    get_config.cache_clear()
+    """Clear the cached config and repo root lookups (for testing)."""
+    _load_config.cache_clear()
+    _find_repo_root_from.cache_clear()
+    _main_repo_root_from.cache_clear()
 
 
 # Convenience accessors
@@ -334,6 +601,54 @@ def get_cleanup_interval() -> str:
     return config.get("cleanup", {}).get("min_interval", "24h")
 
 
+def get_cleanup_jobs() -> int:
+    """Get number of memory backends to clean concurrently."""
+    config = get_config()
+    return int(config.get("cleanup", {}).get("jobs", 1))
+
+
+def get_cleanup_handler_timeout() -> int:
+    """Get max seconds each memory backend's cleanup/wipe may run for."""
+    config = get_config()
+    return int(config.get("cleanup", {}).get("handler_timeout", 600))
+
+
+def get_serena_rescan_interval() -> str:
+    """Get how often the whole Serena memories root is rescanned for memories directories."""
+    config = get_config()
+    return config.get("serena", {}).get("rescan_interval", "7d")
+
+
+def get_serena_ignore() -> list[str]:
+    """Get glob patterns of directory names not descended into when scanning for Serena memories."""
+    config = get_config()
+    return list(config.get("serena", {}).get("ignore", ["node_modules", ".git", ".venv", "target", "build"]))
+
+
+def get_serena_max_depth() -> int:
+    """Get the deepest level below the Serena memories root at which .serena directories are found."""
+    config = get_config()
+    return int(config.get("serena", {}).get("max_depth", 8))
+
+
+def get_serena_jobs() -> int:
+    """Get number of threads scanning Serena projects and moving their memories to trash."""
+    config = get_config()
+    return int(config.get("serena", {}).get("jobs", 1))
+
+
+def get_serena_watch_poll_interval() -> int:
+    """Get seconds between `sweep --watch`'s checks for new (or unwatchable) Serena memories directories."""
+    config = get_config()
+    return int(config.get("serena", {}).get("watch_poll_interval", 300))
+
+
+def get_cleanup_batch_size() -> int:
+    """Get max number of stale items each handler exports/deletes per batch."""
+    config = get_config()
+    return int(config.get("cleanup", {}).get("batch_size", 1000))
+
+
 def get_path(path_name: str) -> Path:
     """Get a configured file path, expanded.
 
@@ -386,6 +701,16 @@ def get_trash_dir() -> Path:
     return get_archives_dir() / "trash"
 
 
+def get_serena_index_path() -> Path:
+    """Get path of the persisted index of Serena memories directories."""
+    return get_archives_dir() / "serena-index.json"
+
+
+def get_serena_inventory_path() -> Path:
+    """Get path of the Serena memory file inventory kept by `sweep --watch`."""
+    return get_archives_dir() / "serena-inventory.json"
+
+
 def get_qdrant_url() -> str:
     """Get Qdrant server URL."""
     config = get_config()
@@ -398,6 +723,90 @@ def get_qdrant_collection() -> str:
     return config.get("qdrant", {}).get("collection", "coding-memory")
 
 
+def get_qdrant_connect_timeout() -> int:
+    """Get max seconds to wait when opening a connection to the Qdrant server."""
+    config = get_config()
+    return int(config.get("qdrant", {}).get("connect_timeout", 5))
+
+
+def get_qdrant_request_timeout() -> int:
+    """Get max seconds to wait for the Qdrant server to answer a request."""
+    config = get_config()
+    return int(config.get("qdrant", {}).get("request_timeout", 30))
+
+
+def get_qdrant_export_vectors() -> bool:
+    """Get whether stale Qdrant points' vectors are exported to trash along with their payloads."""
+    config = get_config()
+    return bool(config.get("qdrant", {}).get("export_vectors", False))
+
+
+def get_qdrant_delete_chunk_size() -> int:
+    """Get max number of points removed by each Qdrant delete request."""
+    config = get_config()
+    return int(config.get("qdrant", {}).get("delete_chunk_size", 256))
+
+
+def get_qdrant_delete_mode() -> str:
+    """Get how stale Qdrant points are deleted: "ids" (by point ID) or "filter" (by created_at filter)."""
+    config = get_config()
+    return config.get("qdrant", {}).get("delete_mode", "ids")
+
+
+def get_qdrant_wipe_backup() -> str:
+    """Get how Qdrant is backed up before a wipe: "snapshot" (collection snapshot) or "json" (point export)."""
+    config = get_config()
+    return config.get("qdrant", {}).get("wipe_backup", "snapshot")
+
+
+def get_claude_mem_delete_chunk_size() -> int:
+    """Get max number of claude-mem rows removed per delete transaction."""
+    config = get_config()
+    return int(config.get("claude_mem", {}).get("delete_chunk_size", 500))
+
+
+def get_claude_mem_busy_timeout() -> int:
+    """Get max seconds to wait for a lock on the claude-mem database."""
+    config = get_config()
+    return int(config.get("claude_mem", {}).get("busy_timeout", 5))
+
+
+def get_claude_mem_vacuum_threshold() -> float:
+    """Get the fraction of free pages past which cleanup reclaims claude-mem database space."""
+    config = get_config()
+    return float(config.get("claude_mem", {}).get("vacuum_threshold", 0.25))
+
+
+def get_claude_mem_incremental_vacuum() -> bool:
+    """Get whether to switch the claude-mem database to incremental auto-vacuum."""
+    config = get_config()
+    return bool(config.get("claude_mem", {}).get("incremental_vacuum", False))
+
+
+def get_claude_mem_trash_format() -> str:
+    """Get how stale claude-mem rows are trashed: "jsonl" (a file per run) or "archive" (an archive database)."""
+    config = get_config()
+    return config.get("claude_mem", {}).get("trash_format", "jsonl")
+
+
+def get_claude_mem_compress_wipe_backup() -> bool:
+    """Get whether claude-mem wipe backups are gzip-compressed."""
+    config = get_config()
+    return bool(config.get("claude_mem", {}).get("compress_wipe_backup", False))
+
+
+def get_claude_mem_create_indexes() -> bool:
+    """Get whether cleanup may add a (created_at, id) index to claude-mem tables lacking one."""
+    config = get_config()
+    return bool(config.get("claude_mem", {}).get("create_indexes", False))
+
+
+def get_memory_mcp_compact() -> bool:
+    """Get whether Memory MCP cleanup also cascades removed entities' relations and dedupes observations."""
+    config = get_config()
+    return bool(config.get("memory_mcp", {}).get("compact", True))
+
+
 # Duration parsing (moved from cleanup/config.py)
 def parse_duration(duration_str: str) -> timedelta:
     """Parse duration string like '30d', '2w', '3m', '1y', '24h' to timedelta.
@@ -0,0 +1 @@
+"""Test support shared by the test suites and benchmarks (e.g. local stand-ins for backend servers)."""
@@ -0,0 +1,227 @@
+"""Local stand-in Qdrant server, for benchmarks and tests exercising real HTTP connections."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class QdrantStubServer:
+    """Minimal in-memory imitation of the Qdrant REST endpoints used by QdrantHandler.
+
+    Serves one collection of points over HTTP/1.1 keep-alive on 127.0.0.1 (random port), and
+    counts the requests and TCP connections it receives. Filters are ignored apart from `has_id`
+    conditions: scrolls return every point, which QdrantHandler then checks client-side.
+
+    Snapshots are JSON dumps of the points (rather than Qdrant's tar archives), which uploading
+    to /snapshots/upload restores.
+
+    Usage:
+        with QdrantStubServer(points) as server:
+            ...  # point the handler at server.url
+    """
+
+    def __init__(self, points: list[dict[str, Any]], collection: str = "coding-memory",
+                 close_after: int | None = None):
+        """
+        Args:
+            points: Points to serve, as {"id": ..., "payload": {...}} dicts.
+            collection: Name of the served collection (other collections return 404).
+            close_after: If set, the server silently drops each connection after this many
+                requests, as servers do with idle keep-alive connections (to exercise reconnects).
+        """
+        self.points = {point["id"]: point for point in points}
+        self.collection = collection
+        self.close_after = close_after
+        self.snapshots: dict[str, bytes] = {}
+        self.config: dict[str, Any] = {
+            "params": {"vectors": {"size": 384, "distance": "Cosine"}, "shard_number": 1},
+            "hnsw_config": {"m": 16, "ef_construct": 100},
+            "optimizer_config": {"deleted_threshold": 0.2, "max_optimization_threads": None},
+            "quantization_config": None,
+        }
+        self.payload_schema: dict[str, Any] = {}
+        self.exists = True
+        # request bodies of each PUT /collections/{name} (i.e. collection creation)
+        self.created_with: list[dict[str, Any]] = []
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self) -> "QdrantStubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _route(self, method: str, path: str, raw_body: bytes,
+               content_type: str) -> tuple[int, dict[str, Any] | bytes]:
+        prefix = f"/collections/{self.collection}"
+        path = path.split("?", 1)[0]
+        if not path.startswith(prefix):
+            return 404, {"status": {"error": "Not found"}}
+
+        endpoint = path[len(prefix):]
+        if endpoint.startswith("/snapshots"):
+            return self._route_snapshots(method, endpoint, raw_body, content_type)
+
+        body = json.loads(raw_body) if raw_body else {}
+        if method == "PUT" and endpoint == "":
+            self.created_with.append(body)
+            self.exists = True
+            return 200, {"status": "ok", "result": True}
+
+        if not self.exists:
+            return 404, {"status": {"error": "Not found: Collection doesn't exist"}}
+
+        if method == "GET" and endpoint == "":
+            return 200, {"status": "ok", "result": {
+                "points_count": len(self.points), "config": self.config, "payload_schema": self.payload_schema,
+            }}
+
+        if method == "DELETE" and endpoint == "":
+            self.exists = False
+            self.points = {}
+            self.payload_schema = {}
+            return 200, {"status": "ok", "result": True}
+
+        if method == "PUT" and endpoint == "/index":
+            schema = body["field_schema"]
+            self.payload_schema[body["field_name"]] = (
+                {"data_type": schema} if isinstance(schema, str) else {"data_type": schema["type"], "params": schema}
+            )
+            return 200, {"status": "ok", "result": {"status": "completed"}}
+
+        if method == "POST" and endpoint == "/points/scroll":
+            ids = sorted(self.points)
+            limit = body.get("limit", 10)
+            offset = body.get("offset")
+            start = ids.index(offset) if offset in self.points else 0
+            page = [self._select(self.points[point_id], body) for point_id in ids[start:start + limit]]
+            next_offset = ids[start + limit] if start + limit < len(ids) else None
+            return 200, {"status": "ok", "result": {"points": page, "next_page_offset": next_offset}}
+
+        if method == "POST" and endpoint == "/points":
+            found = [self._select(self.points[i], body) for i in body.get("ids", []) if i in self.points]
+            return 200, {"status": "ok", "result": found}
+
+        if method == "POST" and endpoint == "/points/delete":
+            ids = body["points"] if "points" in body else self._filter_ids(body["filter"])
+            for point_id in ids:
+                self.points.pop(point_id, None)
+            return 200, {"status": "ok", "result": {"status": "completed"}}
+
+        if method == "POST" and endpoint == "/points/count":
+            return 200, {"status": "ok", "result": {"count": len(self._filter_ids(body.get("filter") or {}))}}
+
+        return 404, {"status": {"error": "Not found"}}
+
+    def _route_snapshots(self, method: str, endpoint: str, raw_body: bytes,
+                         content_type: str) -> tuple[int, dict[str, Any] | bytes]:
+        if method == "POST" and endpoint == "/snapshots":
+            name = f"{self.collection}-{len(self.snapshots) + 1}.snapshot"
+            self.snapshots[name] = json.dumps(list(self.points.values())).encode()
+            return 200, {"status": "ok", "result": {"name": name, "size": len(self.snapshots[name])}}
+
+        if method == "POST" and endpoint == "/snapshots/upload":
+            boundary = content_type.split("boundary=", 1)[1].encode()
+            part = raw_body.split(b"--" + boundary)[1]
+            data = part.split(b"\r\n\r\n", 1)[1].removesuffix(b"\r\n")
+            self.points = {point["id"]: point for point in json.loads(data)}
+            self.exists = True
+            return 200, {"status": "ok", "result": True}
+
+        name = endpoint.removeprefix("/snapshots/")
+        if name not in self.snapshots:
+            return 404, {"status": {"error": "Snapshot not found"}}
+        if method == "GET":
+            return 200, self.snapshots[name]
+        if method == "DELETE":
+            del self.snapshots[name]
+            return 200, {"status": "ok", "result": True}
+        return 404, {"status": {"error": "Not found"}}
+
+    def _filter_ids(self, query_filter: dict[str, Any]) -> list[Any]:
+        """IDs of stored points matching a filter's `has_id` conditions (other conditions are ignored)."""
+        ids = list(self.points)
+        for condition in query_filter.get("must", []):
+            if "has_id" in condition:
+                ids = [point_id for point_id in ids if point_id in condition["has_id"]]
+        return ids
+
+    @staticmethod
+    def _select(point: dict[str, Any], body: dict[str, Any]) -> dict[str, Any]:
+        """Apply a request's with_payload (True/False or a list of dotted field paths) and with_vector."""
+        with_payload = body.get("with_payload", True)
+        payload = point.get("payload") or {}
+        selected: dict[str, Any] = {"id": point["id"]}
+
+        if with_payload is True:
+            selected["payload"] = payload
+        elif isinstance(with_payload, list):
+            selected["payload"] = {}
+            for field in with_payload:
+                source, target = payload, selected["payload"]
+                *parents, leaf = field.split(".")
+                for key in parents:
+                    source = source.get(key) or {}
+                    target = target.setdefault(key, {})
+                if leaf in source:
+                    target[leaf] = source[leaf]
+
+        if body.get("with_vector"):
+            selected["vector"] = point.get("vector")
+        return selected
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep connections alive between requests
+            disable_nagle_algorithm = True  # headers and body are written separately
+
+            def setup(self) -> None:
+                super().setup()
+                self.requests_on_connection = 0
+                with stub._lock:
+                    stub.connections += 1
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw_body = self.rfile.read(length) if length else b""
+
+                with stub._lock:
+                    stub.requests += 1
+                    status, response = stub._route(self.command, self.path, raw_body,
+                                                   self.headers.get("Content-Type", ""))
+
+                if isinstance(response, bytes):
+                    data, content_type = response, "application/octet-stream"
+                else:
+                    data, content_type = json.dumps(response).encode(), "application/json"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+                self.requests_on_connection += 1
+                if stub.close_after is not None and self.requests_on_connection >= stub.close_after:
+                    # drop the connection without a "Connection: close" header
+                    self.close_connection = True
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # keep test output quiet
+
+        return Handler
@@ -191,6 +191,115 @@ def validate_durations(config: Mapping[str, Any]) -> list[str]:
         config.get("trash", {}), "trash",
         "grace_period"
     ))
+    errors.extend(_check_durations(
+        config.get("serena", {}), "serena",
+        "rescan_interval"
+    ))
+
+    return errors
+
+
+def validate_optional_positive_ints(config: Mapping[str, Any]) -> list[str]:
+    """Validate optional integer settings are positive ints when present.
+
+    Args:
+        config: Configuration dictionary.
+
+    Returns:
+        List of error messages for invalid values.
+    """
+    errors = []
+
+    optional_keys = {
+        "cleanup": ("jobs", "handler_timeout", "batch_size"),
+        "qdrant": ("connect_timeout", "request_timeout", "delete_chunk_size"),
+        "claude_mem": ("delete_chunk_size", "busy_timeout"),
+        "serena": ("max_depth", "watch_poll_interval", "jobs"),
+    }
+    for section_name, keys in optional_keys.items():
+        section = config.get(section_name, {})
+        for key in keys:
+            if key not in section:
+                continue
+            value = section[key]
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                errors.append(f"{section_name}.{key}: Expected a positive int, got {value!r}")
+
+    return errors
+
+
+def validate_optional_fractions(config: Mapping[str, Any]) -> list[str]:
+    """Validate optional ratio settings are numbers between 0 and 1 when present.
+
+    Args:
+        config: Configuration dictionary.
+
+    Returns:
+        List of error messages for invalid values.
+    """
+    errors = []
+
+    optional_keys = {
+        "claude_mem": ("vacuum_threshold",),
+    }
+    for section_name, keys in optional_keys.items():
+        section = config.get(section_name, {})
+        for key in keys:
+            if key not in section:
+                continue
+            value = section[key]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 1:
+                errors.append(f"{section_name}.{key}: Expected a number between 0 and 1, got {value!r}")
+
+    return errors
+
+
+def validate_optional_choices(config: Mapping[str, Any]) -> list[str]:
+    """Validate optional settings restricted to a fixed set of values when present.
+
+    Args:
+        config: Configuration dictionary.
+
+    Returns:
+        List of error messages for invalid values.
+    """
+    errors = []
+
+    optional_choices = {
+        ("qdrant", "delete_mode"): ("ids", "filter"),
+        ("qdrant", "wipe_backup"): ("snapshot", "json"),
+        ("claude_mem", "trash_format"): ("jsonl", "archive"),
+    }
+    for (section_name, key), choices in optional_choices.items():
+        section = config.get(section_name, {})
+        if key in section and section[key] not in choices:
+            errors.append(f"{section_name}.{key}: Expected one of {', '.join(choices)}, got {section[key]!r}")
+
+    return errors
+
+
+def validate_optional_string_lists(config: Mapping[str, Any]) -> list[str]:
+    """Validate optional list settings are lists of non-empty strings when present.
+
+    Args:
+        config: Configuration dictionary.
+
+    Returns:
+        List of error messages for invalid values.
+    """
+    errors = []
+
+    optional_keys = {
+        "serena": ("ignore",),
+    }
+    for section_name, keys in optional_keys.items():
+        section = config.get(section_name, {})
+        for key in keys:
+            if key not in section:
+                continue
+            value = section[key]
+            if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+                errors.append(f"{section_name}.{key}: Expected a list of non-empty strings, got {value!r}")
 
     return errors
 
@@ -209,6 +318,10 @@ def full_validate(config: Mapping[str, Any]) -> list[str]:
     # Only check duration formats if structure is valid
     if not errors:
         errors.extend(validate_durations(config))
+        errors.extend(validate_optional_positive_ints(config))
+        errors.extend(validate_optional_fractions(config))
+        errors.extend(validate_optional_choices(config))
+        errors.extend(validate_optional_string_lists(config))
 
     return errors
 
@@ -219,16 +332,15 @@ def main() -> int:
     Returns:
         0 if valid, 1 if invalid.
     """
-    from .config_loader import get_config
+    from .config_loader import get_config_errors
 
     try:
-        config = get_config()
+        # validated when the merged config is built (and cached with it in the config snapshot)
+        errors = get_config_errors()
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
-    errors = full_validate(config)
-
     if errors:
         print("Configuration validation failed:", file=sys.stderr)
         for error in errors:
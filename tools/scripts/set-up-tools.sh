@@ -22,10 +22,23 @@ set -e  # exit on error
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
 
-# Helper to read from merged config (merge order: charter.yml → directives.yml → local.yml → env)
+# Load merged config once (merge order: charter.yml → directives.yml → local.yml → env)
+#   into the BUREAU_CONFIG associative array, instead of spawning get-config per key
+# > Exits if the config can't be read: every setup step below depends on it
+# > Only stdout is eval'd: stderr (e.g. uv build output) is kept aside for the error message
+config_errors="$(mktemp)"
+if ! config_export="$(cd "$REPO_ROOT" && uv run get-config --export 2>"$config_errors")"; then
+    echo "[ERROR] Could not load config (uv run get-config --export failed): $(cat "$config_errors")" >&2
+    rm -f "$config_errors"
+    exit 1
+fi
+rm -f "$config_errors"
+eval "$config_export"
+
+# Helper to read from the loaded config (empty if key is not set)
 cfg() {
     local key="$1"
-    (cd "$REPO_ROOT" && uv run get-config "$key" 2>/dev/null) || true
+    echo "${BUREAU_CONFIG[$key]:-}"
 }
 
 # Setting MCP source clone paths